@@ -0,0 +1,125 @@
+"""
+Per-call overhead of AnthropicLLMClient against a local HTTP stand-in.
+
+Compares building a fresh Anthropic SDK client (and connection pool) for every
+completion, which is what complete() used to do, with the pooled client that
+keeps one keep-alive pool for its lifetime. No network access or API key is
+needed.
+
+    python benchmarks/bench_anthropic_client.py [--calls N]
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from anthropic import Anthropic
+
+from quantcli.llm.anthropic_client import AnthropicLLMClient
+from quantcli.llm.llm_client import Message
+
+_RESPONSE = json.dumps(
+    {
+        "id": "msg_bench",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-haiku-4-5",
+        "content": [{"type": "text", "text": '"tool_name": "total_return"}'}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 1, "output_tokens": 1},
+    }
+).encode("utf-8")
+
+_MESSAGES: list[Message] = [
+    {"role": "system", "content": "Return JSON."},
+    {"role": "user", "content": "total return AAPL 10 days"},
+    {"role": "assistant", "content": "{"},
+]
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def _fresh_client_call(base_url: str) -> Callable[[], None]:
+    def call() -> None:
+        client = Anthropic(api_key="bench", base_url=base_url, max_retries=0)
+        client.messages.create(
+            model="claude-haiku-4-5",
+            max_tokens=256,
+            system="Return JSON.",
+            messages=[
+                {"role": "user", "content": "total return AAPL 10 days"},
+                {"role": "assistant", "content": "{"},
+            ],
+        )
+
+    return call
+
+
+def _time_calls(call: Callable[[], None], n: int) -> list[float]:
+    call()  # warm-up
+    samples: list[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    print(
+        f"{label:<22} median {statistics.median(samples):7.3f} ms  "
+        f"mean {statistics.fmean(samples):7.3f} ms  n={len(samples)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="AnthropicLLMClient per-call overhead benchmark"
+    )
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        fresh = _time_calls(_fresh_client_call(base_url), args.calls)
+        with AnthropicLLMClient(api_key="bench", base_url=base_url) as llm:
+
+            def pooled_call() -> None:
+                llm.complete(_MESSAGES)
+
+            pooled = _time_calls(pooled_call, args.calls)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    _report("fresh client per call", fresh)
+    _report("pooled client", pooled)
+    saved = statistics.median(fresh) - statistics.median(pooled)
+    print(f"per-call overhead saved: {saved:.3f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare two benchmarks/suite.py result files and flag regressions.
+
+A case regresses when its per-call time grew by more than --threshold
+(relative) and by more than --min-delta-us (absolute, so sub-microsecond noise
+on tiny cases is not reported). The fastest round is compared by default, as
+the estimate least disturbed by other load; --stat median_us compares medians.
+Exits 1 if any case regressed.
+
+    python benchmarks/compare.py benchmarks/baseline.json results.json
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_us / self.baseline_us if self.baseline_us else 1.0
+
+    def regressed(self, threshold: float, min_delta_us: float) -> bool:
+        return (
+            self.ratio > 1.0 + threshold
+            and self.current_us - self.baseline_us > min_delta_us
+        )
+
+
+def _load(path: str) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        report: dict[str, Any] = json.load(fh)
+    if report.get("schema") != 1:
+        raise SystemExit(f"{path}: unsupported result schema {report.get('schema')}")
+    return report
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], stat: str = "min_us"
+) -> tuple[list[Comparison], list[str], list[str]]:
+    """(cases in both, cases only in the baseline, cases only in current)."""
+    base = baseline["results"]
+    cur = current["results"]
+    both = [
+        Comparison(name, base[name][stat], cur[name][stat])
+        for name in sorted(base.keys() & cur.keys())
+    ]
+    return both, sorted(base.keys() - cur.keys()), sorted(cur.keys() - base.keys())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta-us", type=float, default=1.0)
+    parser.add_argument("--stat", choices=("min_us", "median_us"), default="min_us")
+    args = parser.parse_args()
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    if baseline["environment"] != current["environment"]:
+        print("note: results come from different environments", file=sys.stderr)
+
+    both, removed, added = compare(baseline, current, args.stat)
+    regressions = 0
+    print(f"{'case':<48} {'baseline us':>12} {'current us':>12} {'ratio':>7}")
+    for c in both:
+        flag = ""
+        if c.regressed(args.threshold, args.min_delta_us):
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{c.name:<48} {c.baseline_us:>12.2f} {c.current_us:>12.2f} "
+            f"{c.ratio:>6.2f}x{flag}"
+        )
+    for name in removed:
+        print(f"{name:<48} missing from current results")
+    for name in added:
+        print(f"{name:<48} new (no baseline)")
+
+    print(f"\n{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+"""
+Offline benchmark suite for the deterministic core of quantcli.
+
+Covers every metric kernel at 10 / 1k / 5k / 1M points, decode_llm_output on
+valid and malformed payloads, FakePriceProvider fetches (fixed fixtures and
+synthetic universes), and full run_query calls with FakeLLMClient. Each case
+is timed in rounds of enough calls to last at least --min-round-ms; the median
+and fastest per-call times are written as JSON for benchmarks/compare.py.
+
+    python benchmarks/suite.py [--out results.json] [--quick] [-k SUBSTRING]
+"""
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.fake_price_provider import FakePriceProvider, FixtureName
+from quantcli.data.synthetic import synthetic_tickers
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.orchestrator import run_query
+from quantcli.router.decode import decode_llm_output
+from quantcli.schemas.params import Params
+from quantcli.tools.registry import TOOL_REGISTRY
+from quantcli.validate_intent import requires_window
+
+SCHEMA_VERSION = 1
+KERNEL_SIZES = (10, 1_000, 5_000, 1_000_000)
+QUICK_KERNEL_SIZES = (10, 1_000, 5_000)
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str  # "<group>/<subject>/<variant>", stable across runs
+    fn: Callable[[], object]
+
+
+def _prices(n: int) -> NDArray[np.float64]:
+    rng = np.random.default_rng(n)
+    return np.asarray(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n))))
+
+
+def _intent_payload(tool: str, n_days: int, window: int | None = None) -> str:
+    intent: dict[str, Any] = {
+        "tickers": ["AAPL"],
+        "time_range": {"n_days": n_days},
+        "tool": tool,
+    }
+    if window is not None:
+        intent["params"] = {"window": window}
+    return json.dumps({"type": "intent", "intent": intent})
+
+
+def kernel_cases(sizes: tuple[int, ...]) -> Iterator[Case]:
+    for n in sizes:
+        prices = _prices(n)
+        windowed = Params(window=min(n - 1, 252))
+        for tool, kernel in TOOL_REGISTRY.items():
+            params = windowed if requires_window(tool) else Params()
+            yield Case(
+                f"kernel/{tool.value}/n={n}",
+                functools.partial(kernel, prices, params),
+            )
+
+
+def decode_cases() -> Iterator[Case]:
+    payloads = {
+        "valid_intent": _intent_payload("sharpe_ratio", 60, window=20),
+        "valid_refusal": json.dumps(
+            {"type": "refusal", "refusal": {"reason": "AMBIGUOUS"}}
+        ),
+        "not_json": '{"type": "intent", "intent": {"tickers": ["AAPL"',
+        "bad_wrapper": json.dumps({"type": "intent", "intent": {}, "extra": 1}),
+        "bad_intent": json.dumps(
+            {"type": "intent", "intent": {"tickers": [], "tool": "unknown"}}
+        ),
+    }
+    for variant, raw in payloads.items():
+        yield Case(f"decode/{variant}", functools.partial(decode_llm_output, raw))
+
+
+def provider_cases() -> Iterator[Case]:
+    fixtures: tuple[FixtureName, ...] = (
+        "monotonic_up",
+        "drawdown",
+        "gbm",
+        "jump_diffusion",
+        "regime_switching",
+        "gapped",
+    )
+    for fixture in fixtures:
+        provider = FakePriceProvider(fixture=fixture)
+        for n_days in (252, 5_000):
+            yield Case(
+                f"provider/{fixture}/n_days={n_days}",
+                functools.partial(provider.get_adjusted_close, "AAPL", n_days),
+            )
+    provider = FakePriceProvider()
+    tickers = [f"T{i:03d}" for i in range(100)]
+    yield Case(
+        "provider/many/tickers=100",
+        functools.partial(provider.get_adjusted_close_many, tickers, 252),
+    )
+    provider = FakePriceProvider("gbm")
+    universe = synthetic_tickers(1_000)
+    yield Case(
+        "provider/many_gbm/tickers=1000",
+        functools.partial(provider.get_adjusted_close_many, universe, 252),
+    )
+
+
+def pipeline_cases() -> Iterator[Case]:
+    responses = {
+        "total_return": _intent_payload("total_return", 10),
+        "sharpe_ratio": _intent_payload("sharpe_ratio", 252, window=60),
+        "llm_refusal": json.dumps(
+            {"type": "refusal", "refusal": {"reason": "AMBIGUOUS"}}
+        ),
+    }
+    for variant, response in responses.items():
+        llm = FakeLLMClient(response)
+        provider = FakePriceProvider()
+        yield Case(
+            f"run_query/{variant}",
+            functools.partial(run_query, "bench query", llm, provider, "bench"),
+        )
+
+
+def all_cases(quick: bool = False) -> list[Case]:
+    return [
+        *kernel_cases(QUICK_KERNEL_SIZES if quick else KERNEL_SIZES),
+        *decode_cases(),
+        *provider_cases(),
+        *pipeline_cases(),
+    ]
+
+
+def measure(
+    fn: Callable[[], object], rounds: int, min_round_s: float
+) -> dict[str, Any]:
+    """Per-call median/min over `rounds` rounds of `loops` calls each."""
+    fn()  # warm-up (and fail fast on a broken case)
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_round_s:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_round_s / elapsed) + 1)
+
+    samples = [elapsed / loops]
+    for _ in range(rounds - 1):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - t0) / loops)
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run(cases: list[Case], rounds: int, min_round_s: float) -> dict[str, Any]:
+    results: dict[str, dict[str, Any]] = {}
+    for case in cases:
+        results[case.name] = measure(case.fn, rounds, min_round_s)
+        print(
+            f"{case.name:<48} median {results[case.name]['median_us']:>12.2f} us",
+            file=sys.stderr,
+        )
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="quantcli benchmark suite")
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    parser.add_argument("--quick", action="store_true", help="skip 1M-point kernels")
+    parser.add_argument("-k", dest="select", help="only cases containing SUBSTRING")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-round-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    cases = [
+        c for c in all_cases(args.quick) if not args.select or args.select in c.name
+    ]
+    report = run(cases, max(args.rounds, 1), args.min_round_ms / 1000)
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            fh.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
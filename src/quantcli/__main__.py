@@ -1,4 +1,4 @@
-from quantcli.cli import main
+from quantcli.daemon import main
 
 if __name__ == "__main__":
     raise SystemExit(main())
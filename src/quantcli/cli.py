@@ -1,48 +1,187 @@
 import argparse
-from collections.abc import Callable, Sequence
+import contextlib
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, TextIO
 
-from quantcli.data.price_provider import PriceProvider
-from quantcli.data.yfinance_price_provider import YFinancePriceProvider
 from quantcli.llm.llm_client import LLMClient
 from quantcli.observability.debug import (
     init_logging_from_env,
     log_event,
     new_correlation_id,
 )
-from quantcli.orchestrator import run_query
-from quantcli.refusals import make_refusal
-from quantcli.runtime import ConfigError, anthropic_client_from_env
-from quantcli.schemas.refusal import Refusal
-from quantcli.schemas.result import Result
+from quantcli.observability.profiling import profiled
+from quantcli.observability.spans import init_latency_report_from_env, span
+from quantcli.runtime import (
+    ConfigError,
+    anthropic_client_from_env,
+    fast_path_from_env,
+    intent_cache_from_env,
+    price_provider_from_env,
+    result_cache_from_env,
+    speculative_prefetch_from_env,
+)
+
+# numpy, pydantic and the orchestrator load once a query is actually answered,
+# never for --help or argument errors (see the import budget test)
+if TYPE_CHECKING:
+    from quantcli.data.price_provider import PriceProvider
+    from quantcli.schemas.refusal import Refusal
+    from quantcli.schemas.result import Result
+
+    BatchFn = Callable[
+        [Iterable[str], LLMClient, PriceProvider, argparse.Namespace],
+        Iterator[tuple[str, Result | Refusal]],
+    ]
+
+
+def _positive_int(raw: str) -> int:
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
 
 
 def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="quantcli")
-    p.add_argument("query", nargs="+", help="Natural language query")
+    p.add_argument("query", nargs="*", help="Natural language query")
+    batch = p.add_argument_group("batch mode")
+    batch.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read one query per line from FILE ('-' for stdin) and write one "
+        "JSON result per line, in input order",
+    )
+    batch.add_argument("--route-workers", type=_positive_int, default=4)
+    batch.add_argument("--fetch-workers", type=_positive_int, default=4)
+    batch.add_argument("--compute-workers", type=_positive_int, default=1)
+    batch.add_argument("--queue-size", type=_positive_int, default=16)
+    batch.add_argument(
+        "--coalesce-fetches",
+        action="store_true",
+        help="Route every query first, then fetch each ticker once at its "
+        "longest requested range",
+    )
     return p
 
 
+def _read_queries(fh: TextIO) -> Iterator[str]:
+    for line in fh:
+        query = line.strip()
+        if query:
+            yield query
+
+
+class _QueryFeed:
+    """
+    Batch input with a single owner: the pipeline's feed thread pulls queries
+    through __next__ while the error path may close the feed and count what
+    is left, so one lock serializes every read of the line generator and
+    `read` counts exactly the queries handed out.
+    """
+
+    def __init__(self, fh: TextIO) -> None:
+        self._queries = _read_queries(fh)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.read = 0
+
+    def __iter__(self) -> "_QueryFeed":
+        return self
+
+    def __next__(self) -> str:
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            query = next(self._queries)
+            self.read += 1
+            return query
+
+    def close(self) -> int:
+        """Stop handing out queries; return how many were never read."""
+        with self._lock:
+            self._closed = True
+            unread = 0
+            with contextlib.suppress(Exception):
+                for _ in self._queries:
+                    unread += 1
+            return unread
+
+
+def _run_query_from_env(
+    user_query: str, llm_client: LLMClient, price_provider: "PriceProvider", cid: str
+) -> "Result | Refusal":
+    from quantcli.orchestrator import run_query
+
+    return run_query(
+        user_query,
+        llm_client,
+        price_provider,
+        cid,
+        intent_cache=intent_cache_from_env(llm_client),
+        fast_path=fast_path_from_env(),
+        speculative_prefetch=speculative_prefetch_from_env(),
+    )
+
+
+def _run_batch_from_env(
+    queries: Iterable[str],
+    llm_client: LLMClient,
+    price_provider: "PriceProvider",
+    args: argparse.Namespace,
+) -> "Iterator[tuple[str, Result | Refusal]]":
+    from quantcli.orchestrator import run_batch
+
+    return run_batch(
+        queries,
+        llm_client,
+        price_provider,
+        route_workers=args.route_workers,
+        fetch_workers=args.fetch_workers,
+        compute_workers=args.compute_workers,
+        queue_size=args.queue_size,
+        intent_cache=intent_cache_from_env(llm_client),
+        fast_path=fast_path_from_env(),
+        result_cache=result_cache_from_env(),
+        coalesce_fetches=args.coalesce_fetches,
+    )
+
+
 def cli(
     argv: Sequence[str] | None,
     *,
     llm_factory: Callable[[], LLMClient] = anthropic_client_from_env,
-    provider_factory: Callable[[], PriceProvider] = YFinancePriceProvider,
-    run_query_fn: Callable[
-        [str, LLMClient, PriceProvider, str], Result | Refusal
-    ] = run_query,
+    provider_factory: "Callable[[], PriceProvider]" = price_provider_from_env,
+    run_query_fn: "Callable[[str, LLMClient, PriceProvider, str], Result | Refusal]" = (
+        _run_query_from_env
+    ),
+    run_batch_fn: "BatchFn" = _run_batch_from_env,
 ) -> int:
     init_logging_from_env()
+    init_latency_report_from_env()
 
     parser = _build_parser()
     args = parser.parse_args(argv)
+    if args.batch is not None and args.query:
+        parser.error("pass either a query or --batch, not both")
+    if args.batch is None and not args.query:
+        parser.error("a query (or --batch FILE) is required")
     query = " ".join(args.query)
 
     cid = new_correlation_id()
-    log_event("invocation_start", cid, query_len=len(query))
+    log_event(
+        "invocation_start", cid, query_len=len(query), batch=args.batch is not None
+    )
 
     try:
         llm_client = llm_factory()
     except ConfigError as e:
+        from quantcli.refusals import make_refusal
+
         refusal = make_refusal(
             reason=str(e),
             clarifying_question="Set ANTHROPIC_API_KEY.",
@@ -51,25 +190,112 @@ def cli(
         print(refusal.model_dump_json())
         return 2
 
+    if args.batch is not None:
+        with profiled(cid, threads=True):
+            return _batch(args, llm_client, provider_factory, run_batch_fn, cid)
+
+    stdout, exit_code = answer_query(
+        query, llm_client, provider_factory, run_query_fn, cid
+    )
+    print(stdout)
+    return exit_code
+
+
+def answer_query(
+    query: str,
+    llm_client: LLMClient,
+    provider_factory: "Callable[[], PriceProvider]",
+    run_query_fn: "Callable[[str, LLMClient, PriceProvider, str], Result | Refusal]",
+    cid: str,
+) -> tuple[str, int]:
+    """The JSON stdout line and exit code for one query (shared with the daemon)."""
+    from quantcli.refusals import make_refusal
+    from quantcli.schemas.refusal import Refusal
+
+    with profiled(cid):
+        try:
+            with span("query", cid):
+                yfinance_provider = provider_factory()
+                out = run_query_fn(query, llm_client, yfinance_provider, cid)
+        except Exception:
+            out = make_refusal(
+                reason="Unexpected internal error.",
+                clarifying_question=None,
+            )
+        with span("serialize", cid):
+            stdout = out.model_dump_json()
+    if isinstance(out, Refusal):
+        log_event("invocation_end", cid, outcome="refusal")
+        return stdout, 2
+    log_event("invocation_end", cid, outcome="result")
+    return stdout, 0
+
+
+def _batch(
+    args: argparse.Namespace,
+    llm_client: LLMClient,
+    provider_factory: "Callable[[], PriceProvider]",
+    run_batch_fn: "BatchFn",
+    cid: str,
+) -> int:
+    from quantcli.refusals import make_refusal
+
+    if args.batch == "-":
+        return _write_batch(
+            sys.stdin, llm_client, provider_factory, run_batch_fn, args, cid
+        )
     try:
-        yfinance_provider = provider_factory()
-        out = run_query_fn(query, llm_client, yfinance_provider, cid)
-        print(out.model_dump_json())
-        if isinstance(out, Refusal):
-            log_event("invocation_end", cid, outcome="refusal")
-            return 2
-        else:
-            log_event("invocation_end", cid, outcome="result")
-            return 0
+        fh = open(args.batch, encoding="utf-8")  # noqa: SIM115
+    except OSError:
+        refusal = make_refusal(reason="Unable to read the batch file.")
+        print(refusal.model_dump_json())
+        log_event("invocation_end", cid, outcome="refusal")
+        return 2
+    with fh:
+        return _write_batch(fh, llm_client, provider_factory, run_batch_fn, args, cid)
+
+
+def _write_batch(
+    fh: TextIO,
+    llm_client: LLMClient,
+    provider_factory: "Callable[[], PriceProvider]",
+    run_batch_fn: "BatchFn",
+    args: argparse.Namespace,
+    cid: str,
+) -> int:
+    from quantcli.refusals import make_refusal
+    from quantcli.schemas.refusal import Refusal
+
+    counts = {"result": 0, "refusal": 0}
+    feed = _QueryFeed(fh)
+    try:
+        provider = provider_factory()
+        outcomes = run_batch_fn(feed, llm_client, provider, args)
+        for query_cid, out in outcomes:
+            outcome = "refusal" if isinstance(out, Refusal) else "result"
+            counts[outcome] += 1
+            log_event("batch_query_end", cid, query_cid=query_cid, outcome=outcome)
+            print(out.model_dump_json(), flush=True)
     except Exception:
+        # keep one output line per input query: refuse every query not read
+        # yet, and every query read but not answered (closing first, so the
+        # count cannot move under us)
+        unread = feed.close()
+        pending = feed.read - counts["result"] - counts["refusal"] + unread
         refusal = make_refusal(
             reason="Unexpected internal error.",
             clarifying_question=None,
         )
-        print(refusal.model_dump_json())
-        log_event("invocation_end", cid, outcome="refusal")
+        for _ in range(pending):
+            print(refusal.model_dump_json())
+        counts["refusal"] += pending
+        log_event("invocation_end", cid, outcome="refusal", **counts)
         return 2
 
+    outcome = "refusal" if counts["refusal"] else "result"
+    log_event("invocation_end", cid, outcome=outcome, **counts)
+    return 2 if counts["refusal"] else 0
+
 
 def main(argv: Sequence[str] | None = None) -> int:
     return cli(argv)
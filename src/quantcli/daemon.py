@@ -0,0 +1,118 @@
+# Console entry point and thin client for `quantcli serve`.
+# Standard library only: forwarding a query to a running daemon must not pay
+# for numpy, pydantic or the SDKs. The in-process path imports them lazily.
+
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+DAEMON_ENV = "QUANTCLI_DAEMON"
+DAEMON_SOCKET_ENV = "QUANTCLI_DAEMON_SOCKET"
+PROTOCOL_VERSION = 2
+CONNECT_TIMEOUT_S = 0.2
+# the Anthropic client's 30s LLM timeout plus a margin for the price fetch; a
+# daemon that has not answered by then is treated as gone
+REPLY_TIMEOUT_S = 45.0
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+# variables that shape an answer; the daemon only serves clients whose values
+# match its own (the daemon's own socket settings are excluded)
+_ENV_PREFIXES = ("QUANTCLI_", "ANTHROPIC_")
+_CLIENT_ONLY_ENV = frozenset({DAEMON_ENV, DAEMON_SOCKET_ENV})
+
+
+def default_socket_path() -> Path:
+    override = os.getenv(DAEMON_SOCKET_ENV, "").strip()
+    if override:
+        return Path(override)
+    runtime = os.getenv("XDG_RUNTIME_DIR", "").strip()
+    if runtime:
+        return Path(runtime) / "quantcli" / "daemon.sock"
+    base = os.getenv("XDG_CACHE_HOME", "").strip()
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "quantcli" / "daemon.sock"
+
+
+def env_fingerprint(environ: Mapping[str, str] | None = None) -> str:
+    """
+    Hash of the QUANTCLI_* / ANTHROPIC_* environment. The daemon answers with
+    the environment it was started with, so a client whose settings differ
+    (another API key, model, cache or debug setting) runs in-process instead.
+    Only the hash crosses the socket, never the values.
+    """
+    env = os.environ if environ is None else environ
+    relevant = sorted(
+        (k, v)
+        for k, v in env.items()
+        if k.startswith(_ENV_PREFIXES) and k not in _CLIENT_ONLY_ENV
+    )
+    return hashlib.sha256(json.dumps(relevant).encode("utf-8")).hexdigest()
+
+
+def _forwardable(argv: Sequence[str]) -> bool:
+    # plain queries only; flags (--batch, --help, ...) run in-process
+    return bool(argv) and not any(a.startswith("-") for a in argv)
+
+
+def forward(
+    argv: Sequence[str],
+    socket_path: Path | None = None,
+    reply_timeout_s: float = REPLY_TIMEOUT_S,
+) -> tuple[str, int] | None:
+    """
+    Send a plain query to a running daemon and return its (stdout, exit code),
+    or None so the caller runs the query in-process: when no daemon answers
+    within reply_timeout_s, or it declines because its environment differs.
+    """
+    if not _forwardable(argv) or not hasattr(socket, "AF_UNIX"):
+        return None
+    if os.getenv(DAEMON_ENV, "").strip() == "0":
+        return None
+
+    path = socket_path if socket_path is not None else default_socket_path()
+    request = json.dumps(
+        {"version": PROTOCOL_VERSION, "argv": list(argv), "env": env_fingerprint()}
+    )
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT_S)
+            sock.connect(str(path))
+            sock.settimeout(reply_timeout_s)  # routing may wait on the LLM
+            sock.sendall(request.encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                raw = f.readline(MAX_MESSAGE_BYTES)
+        reply = json.loads(raw)
+        stdout, exit_code = reply["stdout"], reply["exit_code"]
+    except (OSError, ValueError, KeyError, TypeError):
+        # no daemon, a stale socket, a daemon that went away or wedged
+        # mid-request, or one that declined: queries are read-only, so running
+        # them locally is always safe
+        return None
+    if not isinstance(stdout, str) or not isinstance(exit_code, int):
+        return None
+    return stdout, exit_code
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+
+    if args[:1] == ["serve"]:
+        from quantcli.daemon_server import serve_main
+
+        return serve_main(args[1:])
+
+    forwarded = forward(args)
+    if forwarded is not None:
+        stdout, exit_code = forwarded
+        with contextlib.suppress(BrokenPipeError):
+            print(stdout)
+        return exit_code
+
+    from quantcli.cli import main as cli_main
+
+    return cli_main(args)
@@ -0,0 +1,206 @@
+import argparse
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from quantcli.cli import answer_query
+from quantcli.daemon import (
+    MAX_MESSAGE_BYTES,
+    PROTOCOL_VERSION,
+    default_socket_path,
+    env_fingerprint,
+)
+from quantcli.data.price_provider import PriceProvider
+from quantcli.llm.llm_client import LLMClient
+from quantcli.observability.debug import (
+    init_logging_from_env,
+    log_event,
+    new_correlation_id,
+)
+from quantcli.observability.spans import init_latency_report_from_env
+from quantcli.orchestrator import run_query
+from quantcli.refusals import make_refusal
+from quantcli.runtime import (
+    ConfigError,
+    anthropic_client_from_env,
+    fast_path_from_env,
+    intent_cache_from_env,
+    price_provider_from_env,
+    result_cache_from_env,
+    speculative_prefetch_from_env,
+)
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+
+RunQueryFn = Callable[[str, LLMClient, PriceProvider, str], Result | Refusal]
+
+
+class QueryServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Answers forwarded queries over a Unix domain socket with one warm LLM
+    client and price provider shared by every request. Each request is one
+    JSON line ({"version", "argv", "env"}) and gets one JSON line back
+    ({"stdout", "exit_code"}): exactly what the in-process CLI would print and
+    return. A request whose env fingerprint differs from the daemon's gets
+    {"declined": "env_mismatch"} and the client runs the query itself.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        llm_client: LLMClient,
+        price_provider: PriceProvider,
+        run_query_fn: RunQueryFn,
+    ) -> None:
+        self.llm_client = llm_client
+        self.price_provider = price_provider
+        self.run_query_fn = run_query_fn
+        self.socket_path = socket_path
+        self.env_fingerprint = env_fingerprint()
+        _claim_socket_path(socket_path)
+        super().__init__(str(socket_path), _QueryHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.socket_path)
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    server: QueryServer
+
+    def handle(self) -> None:
+        cid = new_correlation_id()
+        request = _parse_request(self.rfile.readline(MAX_MESSAGE_BYTES))
+        if request is None:
+            log_event("daemon_bad_request", cid)
+            refusal = make_refusal(reason="Unexpected internal error.")
+            self._reply(refusal.model_dump_json(), 2)
+            return
+        argv, env = request
+        if env != self.server.env_fingerprint:
+            log_event("daemon_env_mismatch", cid)
+            self._send({"declined": "env_mismatch"})
+            return
+
+        query = " ".join(argv)
+        log_event("invocation_start", cid, query_len=len(query), daemon=True)
+        stdout, exit_code = answer_query(
+            query,
+            self.server.llm_client,
+            lambda: self.server.price_provider,
+            self.server.run_query_fn,
+            cid,
+        )
+        self._reply(stdout, exit_code)
+
+    def _reply(self, stdout: str, exit_code: int) -> None:
+        self._send({"stdout": stdout, "exit_code": exit_code})
+
+    def _send(self, reply: dict[str, Any]) -> None:
+        payload = json.dumps(reply)
+        with contextlib.suppress(OSError):
+            self.wfile.write(payload.encode("utf-8") + b"\n")
+
+
+def _parse_request(raw: bytes) -> tuple[list[str], str] | None:
+    try:
+        request: Any = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(request, dict) or request.get("version") != PROTOCOL_VERSION:
+        return None
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not argv:
+        return None
+    if not all(isinstance(a, str) for a in argv):
+        return None
+    env = request.get("env")
+    if not isinstance(env, str):
+        return None
+    return argv, env
+
+
+def _claim_socket_path(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            # stale socket left behind by a daemon that did not shut down
+            os.unlink(path)
+            return
+    raise RuntimeError(f"a quantcli daemon is already listening on {path}")
+
+
+def serve_main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(prog="quantcli serve")
+    parser.add_argument("--socket", type=Path, default=None)
+    args = parser.parse_args(argv)
+    socket_path: Path = args.socket or default_socket_path()
+
+    init_logging_from_env()
+    init_latency_report_from_env()
+    try:
+        llm_client = anthropic_client_from_env()
+    except ConfigError as e:
+        print(f"quantcli serve: {e}", file=sys.stderr)
+        return 2
+    price_provider = price_provider_from_env()
+    intent_cache = intent_cache_from_env(llm_client)
+    fast_path = fast_path_from_env()
+    speculative_prefetch = speculative_prefetch_from_env()
+    result_cache = result_cache_from_env()
+
+    def run_warm_query(
+        query: str, llm: LLMClient, provider: PriceProvider, cid: str
+    ) -> Result | Refusal:
+        # the in-memory intent and result LRUs stay warm across requests
+        return run_query(
+            query,
+            llm,
+            provider,
+            cid,
+            intent_cache=intent_cache,
+            fast_path=fast_path,
+            speculative_prefetch=speculative_prefetch,
+            result_cache=result_cache,
+        )
+
+    # the yfinance provider imports these lazily; pay for them once, up front
+    import pandas  # noqa: F401
+    import yfinance  # noqa: F401
+
+    try:
+        server = QueryServer(socket_path, llm_client, price_provider, run_warm_query)
+    except (OSError, RuntimeError) as e:
+        print(f"quantcli serve: {e}", file=sys.stderr)
+        return 2
+
+    def _stop(signum: int, frame: object) -> None:
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    log_event("daemon_start", new_correlation_id(), socket=str(socket_path))
+    print(f"quantcli serve: listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        llm_client.close()
+    return 0
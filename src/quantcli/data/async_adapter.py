@@ -0,0 +1,30 @@
+import asyncio
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.price_provider import AsyncPriceProvider, PriceProvider
+
+
+class ThreadedAsyncPriceProvider(AsyncPriceProvider):
+    """
+    AsyncPriceProvider over a blocking PriceProvider.
+
+    Each fetch runs in a worker thread (asyncio.to_thread), and at most
+    max_concurrency of them are in flight at once per wrapped backend.
+    """
+
+    def __init__(self, provider: PriceProvider, max_concurrency: int = 8) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._provider = provider
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def name(self) -> str:
+        return self._provider.name()
+
+    async def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        async with self._semaphore:
+            return await asyncio.to_thread(
+                self._provider.get_adjusted_close, ticker=ticker, n_days=n_days
+            )
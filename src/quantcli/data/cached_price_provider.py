@@ -0,0 +1,328 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.price_provider import (
+    BulkPrices,
+    PriceProvider,
+    PriceProviderError,
+    assemble_bulk,
+    fetch_many,
+    is_tail_consistent,
+)
+
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+_ITEM_BYTES = 8  # little-endian float64
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _entry_key(ticker: str, n_days: int) -> str:
+    return f"{ticker}|{n_days}"
+
+
+def _entry_filename(ticker: str, n_days: int) -> str:
+    # readable prefix plus a digest so e.g. "^GSPC" and "_GSPC" never collide
+    digest = hashlib.sha1(_entry_key(ticker, n_days).encode("utf-8")).hexdigest()[:8]
+    return f"{_UNSAFE_CHARS.sub('_', ticker)}_{n_days}_{digest}.f64"
+
+
+def _business_days_between(start_ts: float, end_ts: float) -> int:
+    start = np.datetime64(int(start_ts), "s").astype("datetime64[D]")
+    end = np.datetime64(int(end_ts), "s").astype("datetime64[D]")
+    return max(int(np.busday_count(start, end)), 0)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    file: str
+    offset: int  # leading dead elements in the file, already slid out
+    count: int
+    fetched_at: float
+
+    @classmethod
+    def parse(cls, raw: Any) -> "_Entry | None":
+        try:
+            return cls(
+                file=str(raw["file"]),
+                offset=int(raw.get("offset", 0)),
+                count=int(raw["count"]),
+                fetched_at=float(raw["fetched_at"]),
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+
+@dataclass
+class CachedPriceProvider(PriceProvider):
+    """
+    Read-through on-disk cache in front of any PriceProvider.
+
+    - One raw little-endian float64 file per (ticker, n_days), plus an
+      index.json holding fetch timestamps and sizes
+    - Entries older than ttl_s are refreshed from the inner provider
+    - When the cache exceeds max_bytes, oldest-fetched entries are evicted
+    - Warm hits touch only numpy and the filesystem (never the inner provider)
+    - Cache I/O problems never fail a fetch; they degrade to a miss
+
+    Delta refresh: a stale entry asks the inner provider only for the bars
+    missing since it was fetched (plus overlap_bars of overlap) and slides them
+    onto the cached file in place. The newest cached bar is treated as
+    provisional (it may have been an intraday price) and is replaced. The
+    overlap bars before it must match the fresh data within adjust_rtol and
+    align at exactly one position. Otherwise the adjusted history changed
+    (split, dividend), alignment is ambiguous or the delta fetch fails, and
+    the entry is refetched in full.
+    """
+
+    inner: PriceProvider
+    cache_dir: str | os.PathLike[str]
+    ttl_s: float = 900.0
+    max_bytes: int = 64 * 1024 * 1024
+    delta_refresh: bool = True
+    overlap_bars: int = 2
+    adjust_rtol: float = 1e-9
+    clock: Callable[[], float] = time.time
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.ttl_s < 0:
+            raise ValueError("ttl_s must be >= 0")
+        if self.max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        if self.overlap_bars < 1:
+            raise ValueError("overlap_bars must be >= 1")
+        self._dir = Path(self.cache_dir)
+
+    @property
+    def tail_consistent(self) -> bool:
+        return is_tail_consistent(self.inner)
+
+    def name(self) -> str:
+        return self.inner.name()
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        hit = self._lookup(self._load_index(), ticker, n_days)
+        if hit is not None:
+            entry, cached = hit
+            if self.clock() - entry.fetched_at <= self.ttl_s:
+                return cached
+            if self.delta_refresh:
+                refreshed = self._refresh_tail(ticker, n_days, entry, cached)
+                if refreshed is not None:
+                    return refreshed
+
+        prices = self.inner.get_adjusted_close(ticker=ticker, n_days=n_days)
+        self._write(ticker, n_days, prices)
+        return prices
+
+    def get_adjusted_close_many(
+        self, tickers: Sequence[str], n_days: int
+    ) -> BulkPrices:
+        """Fresh hits come from disk; everything else is one bulk inner fetch."""
+        index = self._load_index()
+        now = self.clock()
+        series: dict[str, NDArray[np.float64]] = {}
+        misses: list[str] = []
+        for t in dict.fromkeys(tickers):
+            hit = self._lookup(index, t, n_days)
+            if hit is not None and now - hit[0].fetched_at <= self.ttl_s:
+                series[t] = hit[1]
+            else:
+                misses.append(t)
+
+        failures: dict[str, str] = {}
+        if misses:
+            fetched = fetch_many(self.inner, misses, n_days)
+            failures.update(fetched.failures)
+            for t in misses:
+                if t in fetched.failures:
+                    continue
+                row = np.array(fetched.row(t), dtype=np.float64)
+                self._write(t, n_days, row)
+                series[t] = row
+        return assemble_bulk(tickers, series, failures)
+
+    def _index_path(self) -> Path:
+        return self._dir / INDEX_FILENAME
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path(), encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict) or raw.get("version") != INDEX_VERSION:
+            return {}
+        entries = raw.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def _store_index(self, entries: dict[str, dict[str, Any]]) -> None:
+        payload = {"version": INDEX_VERSION, "entries": entries}
+        fd, tmp = tempfile.mkstemp(dir=self._dir, prefix=".index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self._index_path())
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    def _lookup(
+        self, index: dict[str, dict[str, Any]], ticker: str, n_days: int
+    ) -> tuple[_Entry, NDArray[np.float64]] | None:
+        entry = _Entry.parse(index.get(_entry_key(ticker, n_days)))
+        if entry is None:
+            return None
+        cached = self._read(entry)
+        return (entry, cached) if cached is not None else None
+
+    def _read(self, entry: _Entry) -> NDArray[np.float64] | None:
+        try:
+            arr = np.fromfile(
+                self._dir / entry.file,
+                dtype="<f8",
+                count=entry.count,
+                offset=entry.offset * _ITEM_BYTES,
+            )
+        except (OSError, ValueError):
+            return None
+        if arr.size != entry.count:
+            return None
+        return arr.astype(np.float64, copy=False)
+
+    def _record(
+        self,
+        ticker: str,
+        n_days: int,
+        filename: str,
+        offset: int,
+        count: int,
+    ) -> None:
+        entries = self._load_index()
+        entries[_entry_key(ticker, n_days)] = {
+            "ticker": ticker,
+            "n_days": n_days,
+            "file": filename,
+            "offset": offset,
+            "count": count,
+            "bytes": (offset + count) * _ITEM_BYTES,
+            "fetched_at": self.clock(),
+        }
+        self._evict(entries)
+        self._store_index(entries)
+
+    def _write(self, ticker: str, n_days: int, prices: NDArray[np.float64]) -> None:
+        data = np.ascontiguousarray(prices, dtype="<f8")
+        if data.nbytes > self.max_bytes:
+            return
+
+        filename = _entry_filename(ticker, n_days)
+        try:
+            with self._lock:
+                self._dir.mkdir(parents=True, exist_ok=True)
+                tmp = self._dir / f".{filename}.tmp"
+                data.tofile(tmp)
+                os.replace(tmp, self._dir / filename)
+                self._record(ticker, n_days, filename, 0, int(data.size))
+        except OSError:
+            # fail closed: the fetched prices are still returned to the caller
+            pass
+
+    def _refresh_tail(
+        self,
+        ticker: str,
+        n_days: int,
+        entry: _Entry,
+        cached: NDArray[np.float64],
+    ) -> NDArray[np.float64] | None:
+        overlap = self.overlap_bars
+        if cached.size < overlap + 2:
+            return None
+
+        # new bars since the fetch, the provisional last bar, the overlap bars,
+        # and one bar of slack for a session that closed after the fetch
+        missing = _business_days_between(entry.fetched_at, self.clock())
+        delta_days = missing + overlap + 2
+        if delta_days >= n_days:
+            return None
+
+        try:
+            delta = self.inner.get_adjusted_close(ticker=ticker, n_days=delta_days)
+        except PriceProviderError:
+            # a short window the provider cannot serve (no sessions in it,
+            # transient error): the full refetch decides
+            return None
+        anchor = cached[-(overlap + 1) : -1]
+        matches = [
+            end
+            for end in range(overlap, delta.size)
+            if np.allclose(
+                delta[end - overlap : end], anchor, rtol=self.adjust_rtol, atol=0.0
+            )
+        ]
+        if len(matches) != 1:
+            return None
+
+        # replaces the provisional last bar and appends what is new
+        tail = np.ascontiguousarray(delta[matches[0] :], dtype="<f8")
+        appended = tail.size - 1
+        refreshed: NDArray[np.float64] = np.concatenate((cached[:-1], tail))[appended:]
+
+        try:
+            with self._lock:
+                path = self._dir / entry.file
+                offset = entry.offset + appended
+                if offset > entry.count:
+                    # dead prefix outgrew the live series: compact
+                    tmp = self._dir / f".{entry.file}.tmp"
+                    np.ascontiguousarray(refreshed, dtype="<f8").tofile(tmp)
+                    os.replace(tmp, path)
+                    offset = 0
+                else:
+                    with open(path, "r+b") as f:
+                        f.seek((entry.offset + entry.count - 1) * _ITEM_BYTES)
+                        f.write(tail.tobytes())
+                self._record(ticker, n_days, entry.file, offset, entry.count)
+        except OSError:
+            pass
+
+        return refreshed
+
+    def _evict(self, entries: dict[str, dict[str, Any]]) -> None:
+        def _bytes(e: dict[str, Any]) -> int:
+            try:
+                return int(e.get("bytes", 0))
+            except (TypeError, ValueError):
+                return 0
+
+        def _fetched_at(e: dict[str, Any]) -> float:
+            try:
+                return float(e.get("fetched_at", 0.0))
+            except (TypeError, ValueError):
+                return 0.0
+
+        total = sum(_bytes(e) for e in entries.values())
+        for key in sorted(entries, key=lambda k: _fetched_at(entries[k])):
+            if total <= self.max_bytes:
+                break
+            evicted = entries.pop(key)
+            total -= _bytes(evicted)
+            with contextlib.suppress(OSError):
+                os.unlink(self._dir / str(evicted.get("file", "")))
@@ -1,26 +1,64 @@
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
-from typing import Literal
+from typing import Literal, cast
 
 import numpy as np
 from numpy.typing import NDArray
 
-from quantcli.data.price_provider import PriceProvider, PriceProviderError
+from quantcli.data.price_provider import (
+    BulkPrices,
+    PriceProvider,
+    PriceProviderError,
+)
+from quantcli.data.synthetic import (
+    DEFAULT_HISTORY_DAYS,
+    GENERATORS,
+    SyntheticModel,
+    SyntheticUniverse,
+)
 
-FixtureName = Literal["monotonic_up", "drawdown", "short_1", "invalid_non_positive"]
+_FAILURE = "Injected provider failure for testing."
+
+FixtureName = Literal[
+    "monotonic_up",
+    "drawdown",
+    "short_1",
+    "invalid_non_positive",
+    "gbm",
+    "jump_diffusion",
+    "regime_switching",
+    "gapped",
+]
 
 
 @dataclass
 class FakePriceProvider(PriceProvider):
+    """
+    Deterministic offline prices. The small named fixtures ignore the ticker;
+    the synthetic fixtures (gbm, jump_diffusion, regime_switching, gapped)
+    give every ticker its own seeded path, from `universe` when one is passed
+    (e.g. a memory-mapped SyntheticUniverse.load()).
+    """
+
     fixture: FixtureName = "monotonic_up"
     fail: bool = False
     calls: int = 0
+    seed: int = 0
+    history_days: int = DEFAULT_HISTORY_DAYS
+    universe: SyntheticUniverse | None = field(default=None, repr=False)
     _fixtures: dict[str, Callable[[str, int], NDArray[np.float64]]] = field(
         init=False,
         repr=False,
     )
 
     def __post_init__(self) -> None:
+        if self.fixture in GENERATORS:
+            if self.universe is None:
+                self.universe = SyntheticUniverse(
+                    cast(SyntheticModel, self.fixture), self.seed, self.history_days
+                )
+            elif self.universe.model != self.fixture:
+                raise ValueError("universe model does not match the fixture")
         object.__setattr__(
             self,
             "_fixtures",
@@ -32,6 +70,12 @@ class FakePriceProvider(PriceProvider):
             },
         )
 
+    @property
+    def tail_consistent(self) -> bool:
+        # synthetic ranges are tails of one history; the small named fixtures
+        # are rebuilt for each n_days
+        return self.universe is not None
+
     def name(self) -> str:
         return "FakePriceProvider"
 
@@ -40,13 +84,47 @@ class FakePriceProvider(PriceProvider):
         if n_days < 0:
             raise ValueError("n_days must be >= 0")
         if self.fail:
-            raise PriceProviderError("Injected provider failure for testing.")
+            raise PriceProviderError(_FAILURE)
+        if self.universe is not None:
+            return self.universe.prices(ticker, n_days)
         arr = self._fixtures[self.fixture](ticker, n_days)
         return np.array(arr, dtype=np.float64)
 
+    def get_adjusted_close_many(
+        self, tickers: Sequence[str], n_days: int
+    ) -> BulkPrices:
+        # one upstream call for the whole batch, built as one matrix: the
+        # fixtures ignore the ticker, so their row is broadcast; synthetic rows
+        # come from SyntheticUniverse.prices_many
+        self.calls += 1
+        if n_days < 0:
+            raise ValueError("n_days must be >= 0")
+        if self.universe is not None:
+            unique = list(dict.fromkeys(tickers))
+            matrix, unique_lengths = self.universe.prices_many(unique, n_days)
+            pos = {t: i for i, t in enumerate(unique)}
+            take = np.array([pos[t] for t in tickers], dtype=np.int64)
+            prices, lengths = matrix[take], unique_lengths[take]
+        else:
+            row = np.asarray(self._fixtures[self.fixture]("", n_days), dtype=np.float64)
+            prices = np.tile(row, (len(tickers), 1))
+            lengths = np.full(len(tickers), row.size, dtype=np.int64)
+
+        # failed rows are masked out in place, the layout a partial fetch has
+        failed = np.full(len(tickers), self.fail)
+        prices[failed] = np.nan
+        lengths[failed] = 0
+        return BulkPrices(
+            tickers=list(tickers),
+            prices=prices,
+            lengths=lengths,
+            failures={
+                t: _FAILURE for t, bad in zip(tickers, failed, strict=True) if bad
+            },
+        )
+
     def _monotonic_up(self, ticker: str, n_days: int) -> NDArray[np.float64]:
-        base = 100.0
-        return np.array([base + float(i) for i in range(n_days)], dtype=np.float64)
+        return 100.0 + np.arange(n_days, dtype=np.float64)
 
     def _drawdown(self, ticker: str, n_days: int) -> NDArray[np.float64]:
         if n_days == 0:
@@ -58,20 +136,17 @@ class FakePriceProvider(PriceProvider):
         trough = 80.0
         peak_idx = n_days // 2
 
-        out: list[float] = []
-        for i in range(n_days):
-            # n_days >= 2 here, so denominators are safe
-            if i <= peak_idx:
-                val = 100.0 + (peak - 100.0) * (i / peak_idx)
-            else:
-                val = peak + (trough - peak) * (
-                    (i - peak_idx) / (n_days - 1 - peak_idx)
-                )
-            out.append(float(val))
-        return np.array(out, dtype=np.float64)
+        # linear rise to the peak, then linear fall to the trough on the last day
+        # (n_days >= 2 here, so denominators are safe)
+        i = np.arange(n_days)
+        rise = 100.0 + (peak - 100.0) * (i[: peak_idx + 1] / peak_idx)
+        fall = peak + (trough - peak) * (
+            (i[peak_idx + 1 :] - peak_idx) / (n_days - 1 - peak_idx)
+        )
+        return np.concatenate([rise, fall])
 
     def _short_2(self, ticker: str, n_days: int) -> NDArray[np.float64]:
         return np.array([100.0, 101.0], dtype=np.float64)
 
     def _invalid_non_positive(self, ticker: str, n_days: int) -> NDArray[np.float64]:
-        return np.array([0.0 for _ in range(n_days)], dtype=np.float64)
+        return np.zeros(n_days, dtype=np.float64)
@@ -1,13 +1,124 @@
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Protocol
 
 import numpy as np
 from numpy.typing import NDArray
 
+DEFAULT_BULK_MAX_WORKERS = 8
+
 
 class PriceProviderError(RuntimeError):
     pass
 
 
+@dataclass(frozen=True)
+class BulkPrices:
+    """
+    Adjusted close prices for several tickers, in the layout the batched metric
+    kernels take:
+    - prices: (n_tickers, max_len) float64, rows in request order, oldest->newest
+    - rows are right-aligned; row i's series is prices[i, -lengths[i]:] and the
+      leading padding is NaN
+    - failures: ticker -> reason for tickers that could not be fetched
+      (their length is 0)
+    """
+
+    tickers: list[str]
+    prices: NDArray[np.float64]
+    lengths: NDArray[np.int64]
+    failures: dict[str, str]
+
+    def row(self, ticker: str) -> NDArray[np.float64]:
+        i = self.tickers.index(ticker)
+        n = int(self.lengths[i])
+        return self.prices[i, self.prices.shape[1] - n :]
+
+
+def assemble_bulk(
+    tickers: Sequence[str],
+    series: Mapping[str, NDArray[np.float64]],
+    failures: Mapping[str, str],
+) -> BulkPrices:
+    lengths = np.array(
+        [series[t].size if t in series else 0 for t in tickers], dtype=np.int64
+    )
+    width = int(lengths.max()) if lengths.size else 0
+    prices = np.full((len(tickers), width), np.nan, dtype=np.float64)
+    for i, t in enumerate(tickers):
+        n = int(lengths[i])
+        if n:
+            prices[i, width - n :] = series[t]
+    return BulkPrices(
+        tickers=list(tickers),
+        prices=prices,
+        lengths=lengths,
+        failures=dict(failures),
+    )
+
+
+def fetch_many_concurrently(
+    provider: "PriceProvider",
+    tickers: Sequence[str],
+    n_days: int,
+    max_workers: int = DEFAULT_BULK_MAX_WORKERS,
+) -> BulkPrices:
+    """
+    Fallback bulk fetch for providers that only implement get_adjusted_close:
+    one single-ticker call per distinct ticker on a bounded thread pool. Any
+    exception from a single-ticker call becomes that ticker's failure, so one
+    bad ticker never fails the batch.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+
+    unique = list(dict.fromkeys(tickers))
+    series: dict[str, NDArray[np.float64]] = {}
+    failures: dict[str, str] = {}
+    if unique:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+            futures = {
+                t: pool.submit(provider.get_adjusted_close, ticker=t, n_days=n_days)
+                for t in unique
+            }
+            for t, fut in futures.items():
+                try:
+                    series[t] = np.asarray(fut.result(), dtype=np.float64)
+                except PriceProviderError as e:
+                    failures[t] = str(e)
+                except Exception as e:
+                    failures[t] = f"unexpected provider error: {type(e).__name__}"
+    return assemble_bulk(tickers, series, failures)
+
+
+def fetch_many(
+    provider: "PriceProvider", tickers: Sequence[str], n_days: int
+) -> BulkPrices:
+    """
+    Bulk fetch through the provider's own get_adjusted_close_many when it has
+    one. Providers that satisfy PriceProvider structurally, without subclassing
+    it, never inherit the protocol default, so they get the thread-pool
+    fallback here instead.
+    """
+    bulk = getattr(provider, "get_adjusted_close_many", None)
+    if bulk is None:
+        return fetch_many_concurrently(provider, tickers, n_days)
+    fetched: BulkPrices = bulk(tickers, n_days)
+    return fetched
+
+
+def is_tail_consistent(provider: object) -> bool:
+    """
+    Whether a provider's n_days fetch is always the last n_days bars of any
+    longer fetch of the same ticker, so a shorter range can be read as a tail
+    of a longer one. Providers opt in with a truthy `tail_consistent`
+    attribute; yfinance does not (its period is a calendar span, not a bar
+    count).
+    """
+    return bool(getattr(provider, "tail_consistent", False))
+
+
 class PriceProvider(Protocol):
     def get_adjusted_close(
         self,
@@ -19,6 +130,31 @@ class PriceProvider(Protocol):
         """
         ...
 
+    def get_adjusted_close_many(
+        self,
+        tickers: Sequence[str],
+        n_days: int,  # trading days
+    ) -> BulkPrices:
+        """Return adjusted close prices for several tickers as one aligned matrix.
+        Per-ticker failures are reported in BulkPrices.failures, not raised.
+        Providers without a native bulk path inherit the thread-pool fallback.
+        """
+        return fetch_many_concurrently(self, tickers, n_days)
+
+    def name(self) -> str:
+        """Return a human-readable provider name."""
+        ...
+
+
+class AsyncPriceProvider(Protocol):
+    async def get_adjusted_close(
+        self,
+        ticker: str,
+        n_days: int,  # trading days
+    ) -> NDArray[np.float64]:
+        """Async counterpart of PriceProvider.get_adjusted_close."""
+        ...
+
     def name(self) -> str:
         """Return a human-readable provider name."""
         ...
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.price_provider import (
+    AsyncPriceProvider,
+    BulkPrices,
+    PriceProvider,
+    fetch_many,
+    is_tail_consistent,
+)
+
+_Key = tuple[str, int]
+
+
+class SingleFlightPriceProvider(PriceProvider):
+    """
+    PriceProvider that coalesces concurrent identical fetches across threads.
+
+    The first caller for a (ticker, n_days) key fetches from the inner
+    provider; callers arriving while that fetch is in flight wait for it and
+    share its result (each gets its own copy) or its exception. Nothing is
+    kept once the fetch settles: this is coalescing, not caching.
+    """
+
+    def __init__(self, inner: PriceProvider) -> None:
+        self._inner = inner
+        self._lock = threading.Lock()
+        self._in_flight: dict[_Key, Future[NDArray[np.float64]]] = {}
+        self.coalesced = 0  # calls served by another caller's fetch
+
+    @property
+    def tail_consistent(self) -> bool:
+        return is_tail_consistent(self._inner)
+
+    def name(self) -> str:
+        return self._inner.name()
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        key = (ticker, n_days)
+        with self._lock:
+            shared = self._in_flight.get(key)
+            if shared is None:
+                future: Future[NDArray[np.float64]] = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if shared is not None:
+            return np.array(shared.result(), dtype=np.float64)
+
+        try:
+            prices = self._inner.get_adjusted_close(ticker=ticker, n_days=n_days)
+        except BaseException as e:
+            self._settle(key)
+            future.set_exception(e)
+            raise
+        self._settle(key)
+        future.set_result(prices)
+        return prices
+
+    def get_adjusted_close_many(
+        self, tickers: Sequence[str], n_days: int
+    ) -> BulkPrices:
+        return fetch_many(self._inner, tickers, n_days)
+
+    def _settle(self, key: _Key) -> None:
+        with self._lock:
+            del self._in_flight[key]
+
+
+class AsyncSingleFlightPriceProvider(AsyncPriceProvider):
+    """
+    Asyncio counterpart of SingleFlightPriceProvider: concurrent awaits of the
+    same (ticker, n_days) on one event loop share a single inner fetch. A
+    waiter that is cancelled does not cancel the shared fetch.
+    """
+
+    def __init__(self, inner: AsyncPriceProvider) -> None:
+        self._inner = inner
+        self._in_flight: dict[_Key, asyncio.Task[NDArray[np.float64]]] = {}
+        self.coalesced = 0
+
+    def name(self) -> str:
+        return self._inner.name()
+
+    async def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        key = (ticker, n_days)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._inner.get_adjusted_close(ticker=ticker, n_days=n_days)
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._settle(key, done))
+        else:
+            self.coalesced += 1
+        prices = await asyncio.shield(task)
+        return np.array(prices, dtype=np.float64)
+
+    def _settle(self, key: _Key, task: "asyncio.Task[NDArray[np.float64]]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
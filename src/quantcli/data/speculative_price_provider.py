@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.price_provider import PriceProvider
+from quantcli.observability.debug import log_event
+
+
+class SpeculativePriceProvider(PriceProvider):
+    """
+    PriceProvider that starts fetching a guessed (ticker, n_days) in a
+    background thread as soon as it is created, e.g. while the router is still
+    waiting on the LLM.
+
+    A later request for the same ticker and at most the guessed range is served
+    from the speculative fetch (its most recent n_days bars). Anything else, or
+    a speculative fetch that failed, goes to the inner provider as usual and
+    the guess is discarded.
+    """
+
+    def __init__(
+        self, inner: PriceProvider, ticker: str, n_days: int, cid: str
+    ) -> None:
+        self._inner = inner
+        self.ticker = ticker
+        self.n_days = n_days
+        self._cid = cid
+        self._future: Future[NDArray[np.float64]] = Future()
+        self._settled = False  # claimed or discarded
+        # daemon: a guess nobody claims must never hold up process exit
+        threading.Thread(target=self._fetch, daemon=True).start()
+        log_event("prefetch_start", cid, n_days=n_days)
+
+    def _fetch(self) -> None:
+        if not self._future.set_running_or_notify_cancel():
+            return
+        try:
+            prices = self._inner.get_adjusted_close(
+                ticker=self.ticker, n_days=self.n_days
+            )
+        except BaseException as e:
+            self._future.set_exception(e)
+        else:
+            self._future.set_result(prices)
+
+    def name(self) -> str:
+        return self._inner.name()
+
+    def discard(self, reason: str) -> None:
+        """Drop the guess if nothing claimed it yet; later calls are no-ops."""
+        if self._settled:
+            return
+        self._settled = True
+        self._future.cancel()
+        log_event("prefetch_discard", self._cid, reason=reason)
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        if ticker != self.ticker:
+            self.discard("ticker_mismatch")
+        elif n_days > self.n_days:
+            self.discard("range_longer")
+        elif not self._settled:
+            self._settled = True
+            try:
+                prices = self._future.result()
+            except Exception:
+                log_event("prefetch_discard", self._cid, reason="prefetch_failed")
+            else:
+                log_event("prefetch_hit", self._cid, n_days=n_days)
+                return np.array(prices[-n_days:], dtype=np.float64)
+        return self._inner.get_adjusted_close(ticker=ticker, n_days=n_days)
@@ -0,0 +1,219 @@
+import hashlib
+import json
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import Literal, cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+SyntheticModel = Literal["gbm", "jump_diffusion", "regime_switching", "gapped"]
+
+DEFAULT_HISTORY_DAYS = 5000
+
+_DT = 1.0 / 252
+_S0 = 100.0
+_MU = 0.06  # annual drift
+_SIGMA = 0.2  # annual volatility
+_JUMPS_PER_YEAR = 6.0
+_JUMP_MEAN = -0.02  # mean log jump
+_JUMP_STD = 0.06
+_REGIME_SIGMAS = (0.12, 0.45)  # calm, stressed
+_REGIME_MEAN_DAYS = (120.0, 25.0)
+_GAP_STARTS_PER_DAY = 0.01  # halts / missing sessions
+_GAP_MAX_DAYS = 5
+
+
+def ticker_rng(ticker: str, seed: int) -> np.random.Generator:
+    """Independent stream per (ticker, seed), stable across processes and runs."""
+    digest = hashlib.blake2b(f"{seed}\0{ticker}".encode(), digest_size=8).digest()
+    return np.random.default_rng(int.from_bytes(digest, "little"))
+
+
+def _to_prices(log_returns: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.asarray(_S0 * np.exp(np.cumsum(log_returns)), dtype=np.float64)
+
+
+def _gbm_returns(rng: np.random.Generator, n: int) -> NDArray[np.float64]:
+    drift = (_MU - 0.5 * _SIGMA**2) * _DT
+    return rng.normal(drift, _SIGMA * np.sqrt(_DT), n)
+
+
+def _gbm(rng: np.random.Generator, n: int) -> NDArray[np.float64]:
+    return _to_prices(_gbm_returns(rng, n))
+
+
+def _jump_diffusion(rng: np.random.Generator, n: int) -> NDArray[np.float64]:
+    # Merton: GBM plus a compound Poisson sum of normal log jumps per day
+    returns = _gbm_returns(rng, n)
+    jumps = rng.poisson(_JUMPS_PER_YEAR * _DT, n)
+    returns += jumps * _JUMP_MEAN + np.sqrt(jumps) * _JUMP_STD * rng.normal(size=n)
+    return _to_prices(returns)
+
+
+def _regime_switching(rng: np.random.Generator, n: int) -> NDArray[np.float64]:
+    # two-state Markov chain on volatility: geometric regime durations,
+    # alternating calm/stressed, expanded to one sigma per day
+    calm, stressed = _REGIME_MEAN_DAYS
+    pairs = int(n / (calm + stressed)) + 2
+    durations = np.empty(2 * pairs, dtype=np.int64)
+    while True:
+        durations[0::2] = rng.geometric(1.0 / calm, pairs)
+        durations[1::2] = rng.geometric(1.0 / stressed, pairs)
+        if durations.sum() >= n:
+            break
+    sigmas = np.repeat(np.tile(_REGIME_SIGMAS, pairs), durations)[:n]
+    returns = (_MU - 0.5 * sigmas**2) * _DT + sigmas * np.sqrt(_DT) * rng.normal(size=n)
+    return _to_prices(returns)
+
+
+def _gapped(rng: np.random.Generator, n: int) -> NDArray[np.float64]:
+    # GBM with runs of missing sessions (NaN); the price keeps moving through a
+    # gap, so the next traded price jumps by the accumulated return
+    prices = _gbm(rng, n)
+    starts = np.flatnonzero(rng.random(n) < _GAP_STARTS_PER_DAY)
+    ends = np.minimum(starts + rng.integers(1, _GAP_MAX_DAYS + 1, starts.size), n)
+    depth = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(depth, starts, 1)
+    np.add.at(depth, ends, -1)
+    prices[np.cumsum(depth[:n]) > 0] = np.nan
+    return prices
+
+
+Generator = Callable[[np.random.Generator, int], NDArray[np.float64]]
+
+# Full-history price paths; NaN marks a day without a price.
+GENERATORS: Mapping[SyntheticModel, Generator] = {
+    "gbm": _gbm,
+    "jump_diffusion": _jump_diffusion,
+    "regime_switching": _regime_switching,
+    "gapped": _gapped,
+}
+
+
+class SyntheticUniverse:
+    """
+    Seeded synthetic price histories for any number of tickers.
+
+    Each ticker's history_days-long path is a pure function of (model, ticker,
+    seed), generated on demand, so a 10k-ticker universe costs no memory until
+    it is read. save() materializes a universe into a file that load()
+    memory-maps; tickers missing from the file are still generated on demand.
+    """
+
+    def __init__(
+        self,
+        model: SyntheticModel = "gbm",
+        seed: int = 0,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+    ) -> None:
+        if model not in GENERATORS:
+            raise ValueError(f"unknown synthetic model: {model}")
+        if history_days < 1:
+            raise ValueError("history_days must be >= 1")
+        self.model = model
+        self.seed = seed
+        self.history_days = history_days
+        self._rows: NDArray[np.float64] | None = None
+        self._index: dict[str, int] = {}
+
+    def history(self, ticker: str) -> NDArray[np.float64]:
+        """The ticker's full path (NaN on gap days); read-only when memory-mapped."""
+        row = self._index.get(ticker)
+        if self._rows is not None and row is not None:
+            mapped: NDArray[np.float64] = self._rows[row]
+            return mapped
+        return GENERATORS[self.model](ticker_rng(ticker, self.seed), self.history_days)
+
+    def prices(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        """
+        The last n_days sessions with gap days dropped, as a fresh array. Like a
+        real listing, a ticker has no more than history_days of history.
+        """
+        if n_days < 0:
+            raise ValueError("n_days must be >= 0")
+        if n_days == 0:
+            return np.array([], dtype=np.float64)
+        tail = self.history(ticker)[-n_days:]
+        return np.array(tail[~np.isnan(tail)], dtype=np.float64)
+
+    def prices_many(
+        self, tickers: Sequence[str], n_days: int
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        prices() for several tickers at once, in the BulkPrices layout: row i
+        holds tickers[i]'s sessions right-aligned behind NaN padding, and
+        lengths[i] counts them. The tails are gathered into one matrix (one
+        fancy index for memory-mapped rows) and gap days are packed out of
+        every row with a single stable argsort.
+        """
+        if n_days < 0:
+            raise ValueError("n_days must be >= 0")
+        width = min(n_days, self.history_days)
+        tails = np.empty((len(tickers), width), dtype=np.float64)
+        if width:
+            mapped = [
+                (i, self._index[t]) for i, t in enumerate(tickers) if t in self._index
+            ]
+            if self._rows is not None and mapped:
+                pairs = np.array(mapped, dtype=np.int64)
+                tails[pairs[:, 0]] = self._rows[pairs[:, 1], -width:]
+            done = {i for i, _ in mapped}
+            for i, t in enumerate(tickers):
+                if i not in done:
+                    tails[i] = self.history(t)[-width:]
+        gaps = np.isnan(tails)
+        # gap days (False) sort to the front of each row; sessions keep order
+        order = np.argsort(~gaps, axis=1, kind="stable")
+        packed = np.take_along_axis(tails, order, axis=1)
+        lengths = (width - gaps.sum(axis=1)).astype(np.int64)
+        used = int(lengths.max()) if lengths.size else 0
+        return np.ascontiguousarray(packed[:, width - used :]), lengths
+
+    def save(self, path: str | Path, tickers: Sequence[str]) -> None:
+        """
+        Write the tickers' histories to path as a raw float64 (n_tickers,
+        history_days) matrix, one row at a time, plus a path.json sidecar.
+        """
+        if not tickers:
+            raise ValueError("tickers must not be empty")
+        path = Path(path)
+        rows = np.memmap(
+            path, dtype=np.float64, mode="w+", shape=(len(tickers), self.history_days)
+        )
+        for i, ticker in enumerate(tickers):
+            rows[i] = self.history(ticker)
+        rows.flush()
+        del rows
+        meta = {
+            "model": self.model,
+            "seed": self.seed,
+            "history_days": self.history_days,
+            "tickers": list(tickers),
+        }
+        _sidecar(path).write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SyntheticUniverse":
+        path = Path(path)
+        meta = json.loads(_sidecar(path).read_text(encoding="utf-8"))
+        universe = cls(
+            model=cast(SyntheticModel, meta["model"]),
+            seed=int(meta["seed"]),
+            history_days=int(meta["history_days"]),
+        )
+        shape = (len(meta["tickers"]), universe.history_days)
+        if path.stat().st_size != shape[0] * shape[1] * 8:
+            raise ValueError(f"{path}: size does not match its sidecar")
+        universe._rows = np.memmap(path, dtype=np.float64, mode="r", shape=shape)
+        universe._index = {t: i for i, t in enumerate(meta["tickers"])}
+        return universe
+
+
+def synthetic_tickers(n: int) -> list[str]:
+    """n distinct placeholder symbols (SYN00000, SYN00001, ...)."""
+    return [f"SYN{i:05d}" for i in range(n)]
+
+
+def _sidecar(path: Path) -> Path:
+    return path.with_name(path.name + ".json")
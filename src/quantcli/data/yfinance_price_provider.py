@@ -1,12 +1,18 @@
 # quantcli/data/yfinance_price_provider.py
 import contextlib
 import io
+from collections.abc import Sequence
+from typing import Any
 
 import numpy as np
-import pandas as pd
 from numpy.typing import NDArray
 
-from quantcli.data.price_provider import PriceProvider, PriceProviderError
+from quantcli.data.price_provider import (
+    BulkPrices,
+    PriceProvider,
+    PriceProviderError,
+    assemble_bulk,
+)
 
 
 class YFinancePriceProvider(PriceProvider):
@@ -15,6 +21,7 @@ class YFinancePriceProvider(PriceProvider):
 
     def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
         try:
+            # imported lazily so cached and refusal-only paths never load them
             import yfinance as yf
 
             # yfinance/Yahoo prints warnings/errors; never leak to CLI stdout/stderr
@@ -35,17 +42,95 @@ class YFinancePriceProvider(PriceProvider):
         if "Close" not in df.columns:
             raise PriceProviderError("missing close column")
 
-        prices = pd.to_numeric(df["Close"], errors="coerce").dropna()
+        return _clean_close(df["Close"])
 
-        if len(prices) < 2:
-            raise PriceProviderError("insufficient price points")
+    def get_adjusted_close_many(
+        self, tickers: Sequence[str], n_days: int
+    ) -> BulkPrices:
+        """One batched yf.download for all tickers instead of one call each."""
+        unique = list(dict.fromkeys(tickers))
+        if not unique:
+            return assemble_bulk(tickers, {}, {})
 
-        arr = np.asarray(prices.values, dtype=np.float64)
+        try:
+            import yfinance as yf
+
+            with (
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(io.StringIO()),
+            ):
+                df = yf.download(
+                    unique,
+                    period=f"{n_days}d",
+                    auto_adjust=True,  # adjusted close
+                    group_by="column",
+                    multi_level_index=True,
+                    progress=False,
+                    threads=True,
+                )
+        except Exception:
+            return assemble_bulk(
+                tickers, {}, {t: "yfinance download failed" for t in unique}
+            )
+
+        if (
+            df is None
+            or getattr(df, "empty", True)
+            or "Close" not in df.columns.get_level_values(0)
+        ):
+            return assemble_bulk(tickers, {}, {t: "no price data" for t in unique})
+
+        close = df["Close"]
+        series: dict[str, NDArray[np.float64]] = {}
+        failures: dict[str, str] = {}
+        for t in unique:
+            if t not in close.columns:
+                failures[t] = "no price data"
+                continue
+            try:
+                series[t] = _clean_close(close[t])
+            except PriceProviderError as e:
+                failures[t] = str(e)
+        return assemble_bulk(tickers, series, failures)
+
+
+def _clean_close(column: Any) -> NDArray[np.float64]:
+    try:
+        # numeric columns (what yfinance returns): one copy straight into a
+        # contiguous float64 buffer, missing bars as NaN
+        raw = np.ascontiguousarray(
+            column.to_numpy(dtype=np.float64, na_value=np.nan), dtype=np.float64
+        )
+    except (TypeError, ValueError):
+        raw = _coerce_numeric(column)
+    return validate_prices(raw)
+
+
+def _coerce_numeric(column: Any) -> NDArray[np.float64]:
+    # object columns with unparseable entries: those become missing bars
+    import pandas as pd
 
-        if not np.isfinite(arr).all():
-            raise PriceProviderError("non finite prices")
+    numeric = pd.to_numeric(column, errors="coerce")
+    return np.ascontiguousarray(
+        numeric.to_numpy(dtype=np.float64, na_value=np.nan), dtype=np.float64
+    )
 
-        if (arr <= 0).any():
-            raise PriceProviderError("non positive prices")
 
-        return arr
+def validate_prices(raw: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Drop missing (NaN) bars and reject the series unless at least two remain
+    and all are finite and positive. The checks are two reductions (min, max)
+    over the buffer; no boolean masks are built unless NaNs are present.
+    """
+    if raw.size:
+        lo, hi = raw.min(), raw.max()
+        if np.isnan(lo):
+            raw = raw[~np.isnan(raw)]
+            lo, hi = (raw.min(), raw.max()) if raw.size else (1.0, 1.0)
+    if raw.size < 2:
+        raise PriceProviderError("insufficient price points")
+    if np.isinf(lo) or np.isinf(hi):
+        raise PriceProviderError("non finite prices")
+    if lo <= 0:
+        raise PriceProviderError("non positive prices")
+    return raw
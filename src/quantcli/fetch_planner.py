@@ -0,0 +1,69 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.schemas.intent import Intent
+
+_PRICE_ITEMSIZE = np.dtype(np.float64).itemsize
+
+
+@dataclass(frozen=True)
+class TickerFetch:
+    """One upstream fetch serving every planned intent in members (indexes)."""
+
+    ticker: str
+    n_days: int
+    members: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    fetches: list[TickerFetch]
+    requested_days: int  # sum of n_days over all intents, i.e. without coalescing
+
+    @property
+    def intents(self) -> int:
+        return sum(len(f.members) for f in self.fetches)
+
+    @property
+    def fetches_saved(self) -> int:
+        return self.intents - len(self.fetches)
+
+    @property
+    def bytes_avoided(self) -> int:
+        fetched_days = sum(f.n_days for f in self.fetches)
+        return (self.requested_days - fetched_days) * _PRICE_ITEMSIZE
+
+
+def plan_fetches(intents: Sequence[Intent], merge_ranges: bool = True) -> FetchPlan:
+    """
+    Group validated (single-ticker) intents by ticker: one fetch per ticker at
+    the longest requested n_days, in order of first appearance. Each intent
+    then reads its range as a tail view of that fetch.
+
+    merge_ranges=False (providers that are not tail-consistent) groups by
+    (ticker, n_days) instead, so only identical requests share a fetch.
+    """
+    longest: dict[tuple[str, int], int] = {}
+    members: dict[tuple[str, int], list[int]] = {}
+    for idx, intent in enumerate(intents):
+        ticker = intent.tickers[0]
+        n_days = intent.time_range.n_days
+        key = (ticker, 0 if merge_ranges else n_days)
+        longest[key] = max(longest.get(key, 0), n_days)
+        members.setdefault(key, []).append(idx)
+
+    return FetchPlan(
+        fetches=[
+            TickerFetch(ticker=k[0], n_days=longest[k], members=tuple(members[k]))
+            for k in members
+        ],
+        requested_days=sum(i.time_range.n_days for i in intents),
+    )
+
+
+def tail_view(prices: NDArray[np.float64], n_days: int) -> NDArray[np.float64]:
+    """The most recent n_days bars of prices, without copying."""
+    return prices[max(prices.size - n_days, 0) :]
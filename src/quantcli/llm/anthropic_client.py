@@ -1,45 +1,95 @@
-from collections.abc import Sequence
-from dataclasses import dataclass
-from typing import Any
-
-import anthropic
-from anthropic import Anthropic, Omit, omit
-from anthropic.types import MessageParam
+import threading
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
 
 from quantcli.llm.errors import LLMError
-from quantcli.llm.llm_client import LLMClient, Message
+from quantcli.llm.llm_client import Message, StreamingLLMClient
+
+# The SDK (and httpx) cost ~0.3 s to import; they load on the first request,
+# so queries answered by the fast path or the intent cache never pay for them.
+if TYPE_CHECKING:
+    from anthropic import Anthropic, Omit
+    from anthropic.types import MessageParam
 
 
 @dataclass(frozen=True)
-class AnthropicLLMClient(LLMClient):
+class AnthropicLLMClient(StreamingLLMClient):
     model: str = "claude-haiku-4-5"
     api_key: str | None = None
     max_tokens: int = 256
     timeout_s: float = 30.0
+    pool_size: int = 10
+    base_url: str | None = None
+    # Long-lived SDK client (and its keep-alive connection pool), created on
+    # first use and shared by every thread calling complete().
+    _client: "Anthropic | None" = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _client_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if self.max_tokens < 1:
             raise ValueError("max_tokens must be >= 1")
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+
+    def __enter__(self) -> "AnthropicLLMClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections. A later complete() opens a fresh pool."""
+        with self._client_lock:
+            client = self._client
+            object.__setattr__(self, "_client", None)
+        if client is not None:
+            client.close()
+
+    def _sdk_client(self) -> "Anthropic":
+        client = self._client
+        if client is not None:
+            return client
+        import anthropic
+        import httpx
+
+        with self._client_lock:
+            if self._client is None:
+                http_client = anthropic.DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                )
+                object.__setattr__(
+                    self,
+                    "_client",
+                    anthropic.Anthropic(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        timeout=self.timeout_s,
+                        max_retries=0,  # no implicit retries
+                        http_client=http_client,
+                    ),
+                )
+            assert self._client is not None
+            return self._client
 
     def complete(self, messages: Sequence[Message]) -> str:
-        system_text, msgs = _split_messages(messages)
-        used_prefill = (
-            bool(msgs)
-            and msgs[-1]["role"] == "assistant"
-            and msgs[-1]["content"] == "{"
-        )
-
-        # Anthropic API: system is a top-level param; messages are user/assistant turns
-        payload_messages: list[MessageParam] = [
-            {"role": m["role"], "content": m["content"]} for m in msgs
-        ]
+        system_text, payload_messages, used_prefill = _build_request(messages)
 
         try:
-            client = Anthropic(
-                api_key=self.api_key,
-                timeout=self.timeout_s,
-                max_retries=0,  # no implicit retries
-            )
+            client = self._sdk_client()
 
             resp = client.messages.create(
                 model=self.model,
@@ -52,25 +102,68 @@ class AnthropicLLMClient(LLMClient):
             raw = _extract_text(resp)
             return ("{" + raw) if used_prefill else raw
 
-        except anthropic.RateLimitError as e:
-            raise LLMError(kind="rate_limited", message="LLM rate limited.") from e
-        except (anthropic.AuthenticationError, anthropic.PermissionDeniedError) as e:
-            raise LLMError(kind="auth", message="LLM authentication failed.") from e
-        except anthropic.APITimeoutError as e:
-            raise LLMError(kind="timeout", message="LLM timeout.") from e
-        except (
-            anthropic.APIConnectionError,
-            anthropic.APIStatusError,
-            anthropic.APIError,
-        ) as e:
-            raise LLMError(kind="sdk_error", message="LLM SDK error.") from e
         except Exception as e:
-            raise LLMError(kind="sdk_error", message="LLM SDK error.") from e
+            raise _to_llm_error(e) from e
+
+    def stream(self, messages: Sequence[Message]) -> Iterator[str]:
+        """Streaming counterpart of complete(); closing the iterator early
+        closes the HTTP response instead of waiting for max_tokens."""
+        system_text, payload_messages, used_prefill = _build_request(messages)
+        # the prefill rides on the first real chunk so that time-to-first-token
+        # measures the model, not us
+        prefix = "{" if used_prefill else ""
+
+        try:
+            client = self._sdk_client()
+            with client.messages.stream(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                system=system_text,
+                messages=payload_messages,
+            ) as stream:
+                for text in stream.text_stream:
+                    if not text:
+                        continue
+                    yield prefix + text
+                    prefix = ""
+        except Exception as e:
+            raise _to_llm_error(e) from e
+        if prefix:
+            yield prefix
+
+
+def _to_llm_error(e: Exception) -> LLMError:
+    import anthropic
+
+    if isinstance(e, anthropic.RateLimitError):
+        return LLMError(kind="rate_limited", message="LLM rate limited.")
+    if isinstance(e, anthropic.AuthenticationError | anthropic.PermissionDeniedError):
+        return LLMError(kind="auth", message="LLM authentication failed.")
+    if isinstance(e, anthropic.APITimeoutError):
+        return LLMError(kind="timeout", message="LLM timeout.")
+    return LLMError(kind="sdk_error", message="LLM SDK error.")
+
+
+def _build_request(
+    messages: Sequence[Message],
+) -> "tuple[str | Omit, list[MessageParam], bool]":
+    system_text, msgs = _split_messages(messages)
+    used_prefill = (
+        bool(msgs) and msgs[-1]["role"] == "assistant" and msgs[-1]["content"] == "{"
+    )
+
+    # Anthropic API: system is a top-level param; messages are user/assistant turns
+    payload_messages: list[MessageParam] = [
+        {"role": m["role"], "content": m["content"]} for m in msgs
+    ]
+    return system_text, payload_messages, used_prefill
 
 
 def _split_messages(
     messages: Sequence[Message],
-) -> tuple[str | Omit, list[MessageParam]]:
+) -> "tuple[str | Omit, list[MessageParam]]":
+    from anthropic import omit
+
     system_parts: list[str] = []
     msgs: list[MessageParam] = []
 
@@ -0,0 +1,24 @@
+import asyncio
+from collections.abc import Sequence
+
+from quantcli.llm.llm_client import AsyncLLMClient, LLMClient, Message
+
+
+class ThreadedAsyncLLMClient(AsyncLLMClient):
+    """
+    AsyncLLMClient over a blocking LLMClient.
+
+    Each completion runs in a worker thread (asyncio.to_thread), and at most
+    max_concurrency of them are in flight at once, so one event loop can drive
+    many queries without flooding the backend.
+    """
+
+    def __init__(self, client: LLMClient, max_concurrency: int = 8) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(self, messages: Sequence[Message]) -> str:
+        async with self._semaphore:
+            return await asyncio.to_thread(self._client.complete, messages)
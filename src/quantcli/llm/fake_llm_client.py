@@ -1,6 +1,6 @@
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 
-from quantcli.llm.llm_client import LLMClient, Message
+from quantcli.llm.llm_client import LLMClient, Message, StreamingLLMClient
 
 
 class FakeLLMClient(LLMClient):
@@ -13,3 +13,24 @@ class FakeLLMClient(LLMClient):
         if isinstance(self._response, Exception):
             raise self._response
         return self._response
+
+
+class FakeStreamingLLMClient(FakeLLMClient, StreamingLLMClient):
+    """FakeLLMClient that also streams its response in the given chunks."""
+
+    def __init__(self, chunks: Sequence[str] | Exception):
+        super().__init__(chunks if isinstance(chunks, Exception) else "".join(chunks))
+        self._chunks = [] if isinstance(chunks, Exception) else list(chunks)
+        self.chunks_read = 0
+        self.stream_closed = False
+
+    def stream(self, messages: Sequence[Message]) -> Iterator[str]:
+        self.calls.append(messages)
+        if isinstance(self._response, Exception):
+            raise self._response
+        try:
+            for chunk in self._chunks:
+                self.chunks_read += 1
+                yield chunk
+        finally:
+            self.stream_closed = True
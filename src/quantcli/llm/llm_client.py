@@ -1,5 +1,5 @@
-from collections.abc import Sequence
-from typing import Literal, Protocol, TypedDict
+from collections.abc import Iterator, Sequence
+from typing import Literal, Protocol, TypedDict, runtime_checkable
 
 
 class Message(TypedDict):
@@ -9,3 +9,16 @@ class Message(TypedDict):
 
 class LLMClient(Protocol):
     def complete(self, messages: Sequence[Message]) -> str: ...
+
+
+@runtime_checkable
+class StreamingLLMClient(LLMClient, Protocol):
+    def stream(self, messages: Sequence[Message]) -> Iterator[str]:
+        """Yield the completion as text chunks; the concatenation is what
+        complete() would return. Closing the iterator early abandons the request.
+        """
+        ...
+
+
+class AsyncLLMClient(Protocol):
+    async def complete(self, messages: Sequence[Message]) -> str: ...
@@ -0,0 +1,77 @@
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+class TopLevelObjectScanner:
+    """
+    Incremental brace-depth tracker for a streamed JSON object.
+
+    feed() returns the offset just past the closing brace of the first
+    top-level object once it has been seen, else None. Braces inside string
+    literals (including escaped quotes) are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.closed = False
+
+    def feed(self, chunk: str) -> int | None:
+        if self.closed:
+            return 0
+        for i, ch in enumerate(chunk):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = self._depth > 0
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.closed = True
+                    return i + 1
+        return None
+
+
+@dataclass(frozen=True)
+class StreamedText:
+    text: str
+    first_chunk_at: float | None  # time.perf_counter() of the first non-empty chunk
+    object_closed: bool
+
+
+def read_top_level_object(chunks: Iterable[str]) -> StreamedText:
+    """
+    Accumulate streamed text until the first top-level JSON object closes, then
+    stop reading (closing the stream) so trailing tokens are never waited for.
+    If the object never closes, the whole stream is returned for the decoder
+    to reject.
+    """
+    scanner = TopLevelObjectScanner()
+    parts: list[str] = []
+    first_chunk_at: float | None = None
+    it = iter(chunks)
+    try:
+        for chunk in it:
+            if not chunk:
+                continue
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+            end = scanner.feed(chunk)
+            if end is not None:
+                parts.append(chunk[:end])
+                return StreamedText("".join(parts), first_chunk_at, True)
+            parts.append(chunk)
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+    return StreamedText("".join(parts), first_chunk_at, False)
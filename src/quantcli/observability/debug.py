@@ -3,13 +3,23 @@ import json
 import os
 import sys
 import threading
+import time
 import uuid
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any, TextIO
+from typing import Any, Literal, TextIO
 
 DEBUG_ENV = "QUANTCLI_DEBUG"
 DEBUG_PATH_ENV = "QUANTCLI_DEBUG_PATH"
+DEBUG_ASYNC_ENV = "QUANTCLI_DEBUG_ASYNC"
+DEBUG_QUEUE_SIZE_ENV = "QUANTCLI_DEBUG_QUEUE_SIZE"
+DEBUG_OVERFLOW_ENV = "QUANTCLI_DEBUG_OVERFLOW"
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest"]
+
+_WRITER_POLL_S = 0.05
 
 
 def _utc_ts() -> str:
@@ -24,12 +34,34 @@ def new_correlation_id() -> str:
 class DebugConfig:
     enabled: bool
     path: str | None
+    # async mode: log_event only enqueues; a background thread serializes and
+    # writes in batches. A full queue drops events per the overflow policy.
+    async_mode: bool = False
+    queue_size: int = 4096
+    overflow: OverflowPolicy = "drop_oldest"
+    flush_timeout_s: float = 1.0  # how long exit waits for queued events
 
 
 def _read_config() -> DebugConfig:
     enabled = os.getenv(DEBUG_ENV, "").strip() == "1"
     path = os.getenv(DEBUG_PATH_ENV, "").strip() or None
-    return DebugConfig(enabled=enabled, path=path)
+    async_mode = os.getenv(DEBUG_ASYNC_ENV, "").strip() == "1"
+    try:
+        queue_size = max(int(os.getenv(DEBUG_QUEUE_SIZE_ENV, "").strip()), 1)
+    except ValueError:
+        queue_size = 4096
+    overflow: OverflowPolicy = (
+        "drop_newest"
+        if os.getenv(DEBUG_OVERFLOW_ENV, "").strip() == "drop_newest"
+        else "drop_oldest"
+    )
+    return DebugConfig(
+        enabled=enabled,
+        path=path,
+        async_mode=async_mode,
+        queue_size=queue_size,
+        overflow=overflow,
+    )
 
 
 class DebugLogger:
@@ -39,12 +71,16 @@ class DebugLogger:
     - Writes to stderr by default, or to QUANTCLI_DEBUG_PATH if provided
     - Never writes to stdout
     - Never raises (fails closed)
+    - Async mode keeps serialization and I/O off the caller's thread; events
+      that overflow the queue are dropped and reported by a
+      debug_events_dropped event
     """
 
     def __init__(self, config: DebugConfig) -> None:
         self._config = config
         self._lock = threading.Lock()
         self._fh: TextIO | None = None
+        self._writer: _AsyncWriter | None = None
 
         if not self._config.enabled:
             return
@@ -62,14 +98,27 @@ class DebugLogger:
                 # Fail closed: disable logging if file can't be opened
                 self._fh = None
                 self._config = DebugConfig(enabled=False, path=None)
+                return
+
+        if self._config.async_mode:
+            self._writer = _AsyncWriter(self._config, self._sink)
+            atexit.register(self.close)
 
     def close(self) -> None:
         try:
+            if self._writer is not None:
+                self._writer.stop(self._config.flush_timeout_s)
             if self._fh is not None:
                 self._fh.close()
         except Exception:
             pass
 
+    def flush(self, timeout_s: float = 1.0) -> bool:
+        """Wait until queued events are written (async mode); False on timeout."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout_s)
+
     def _sink(self) -> TextIO:
         return self._fh if self._fh is not None else sys.stderr
 
@@ -80,6 +129,9 @@ class DebugLogger:
         record: dict[str, Any] = {"ts": _utc_ts(), "event": event, "cid": cid, **fields}
 
         try:
+            if self._writer is not None:
+                self._writer.put(record)
+                return
             line = json.dumps(record, separators=(",", ":"), default=str)
             with self._lock:
                 self._sink().write(line + "\n")
@@ -87,6 +139,108 @@ class DebugLogger:
             pass
 
 
+class _AsyncWriter:
+    """
+    Background writer for DebugLogger's async mode.
+
+    put() is a deque append (atomic under the GIL, no lock). The writer thread
+    wakes every few milliseconds, serializes whatever is queued and writes it
+    with one write() call. The dropped count is best effort: concurrent puts
+    into a full queue can race on it.
+    """
+
+    def __init__(self, config: DebugConfig, sink: Callable[[], TextIO]) -> None:
+        self._sink = sink
+        self._drop_oldest = config.overflow == "drop_oldest"
+        self._max = config.queue_size
+        # a bounded deque discards from the far end on append: drop-oldest
+        self._queue: deque[dict[str, Any]] = deque(
+            maxlen=config.queue_size if self._drop_oldest else None
+        )
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._stopping = threading.Event()
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._thread = threading.Thread(
+            target=self._run, name="quantcli-debug-writer", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, record: dict[str, Any]) -> None:
+        if len(self._queue) >= self._max:
+            self._dropped += 1
+            if not self._drop_oldest:
+                return
+        self._queue.append(record)
+
+    def flush(self, timeout_s: float) -> bool:
+        deadline = time.monotonic() + timeout_s
+        self._wake.set()
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._queue and not self._busy,
+                timeout=max(deadline - time.monotonic(), 0.0),
+            )
+
+    def stop(self, timeout_s: float) -> None:
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout=timeout_s)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(_WRITER_POLL_S)
+            self._wake.clear()
+            self._drain()
+            if self._stopping.is_set() and not self._queue:
+                return
+
+    def _drain(self) -> None:
+        with self._idle:
+            self._busy = True
+        try:
+            lines: list[str] = []
+            while self._queue:
+                try:
+                    record = self._queue.popleft()
+                except IndexError:
+                    break
+                lines.append(_dumps(record))
+            dropped = self._dropped
+            if dropped != self._reported_dropped:
+                lines.append(
+                    _dumps(
+                        {
+                            "ts": _utc_ts(),
+                            "event": "debug_events_dropped",
+                            "cid": "-",
+                            "dropped": dropped - self._reported_dropped,
+                            "dropped_total": dropped,
+                        }
+                    )
+                )
+                self._reported_dropped = dropped
+            if lines:
+                sink = self._sink()
+                sink.write("".join(lines))
+                sink.flush()
+        except Exception:
+            pass
+        finally:
+            with self._idle:
+                self._busy = False
+                self._idle.notify_all()
+
+
+def _dumps(record: dict[str, Any]) -> str:
+    try:
+        return json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    except Exception:
+        return ""
+
+
 # Lazily initialized logger singleton
 _LOGGER: DebugLogger | None = None
 _LOGGER_CFG: DebugConfig | None = None
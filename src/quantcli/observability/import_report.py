@@ -0,0 +1,123 @@
+# Summarized `python -X importtime` for the CLI's import stages.
+#
+#   python -m quantcli.observability.import_report [--repeat N]
+#
+# Each stage is imported in order by one fresh interpreter, so a stage's time is
+# what it adds on top of the stages before it (shared modules count once, for
+# the first stage that loads them).
+
+import argparse
+import re
+import subprocess
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+# (stage name, module); the order is the order a query pays for them in
+STAGES: tuple[tuple[str, str], ...] = (
+    ("thin client", "quantcli.daemon"),
+    ("cli entry point", "quantcli.cli"),
+    ("query path", "quantcli.orchestrator"),
+    ("anthropic sdk", "anthropic"),
+    ("yfinance + pandas", "yfinance"),
+)
+
+_MARKER = "#quantcli-stage "
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    name: str
+    module: str
+    total_us: int
+    top_packages: list[tuple[str, int]]  # (root package, self time in us)
+
+
+def parse_importtime(
+    stderr: str, stages: Sequence[tuple[str, str]]
+) -> list[StageTiming]:
+    """Group -X importtime lines by the stage markers written between imports."""
+    totals: dict[str, int] = {}
+    selfs: dict[str, dict[str, int]] = {}
+    current: str | None = None
+    for line in stderr.splitlines():
+        if line.startswith(_MARKER):
+            current = line[len(_MARKER) :].strip()
+            totals[current] = 0
+            selfs[current] = {}
+            continue
+        match = _LINE_RE.match(line)
+        if match is None or current is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        if len(indent) == 1:  # top level: its cumulative time covers its children
+            totals[current] += int(cumulative_us)
+        root = name.split(".")[0]
+        selfs[current][root] = selfs[current].get(root, 0) + int(self_us)
+
+    timings = []
+    for name, module in stages:
+        packages = sorted(selfs.get(name, {}).items(), key=lambda kv: -kv[1])
+        timings.append(
+            StageTiming(
+                name=name,
+                module=module,
+                total_us=totals.get(name, 0),
+                top_packages=packages[:3],
+            )
+        )
+    return timings
+
+
+def measure_stages(
+    stages: Sequence[tuple[str, str]] = STAGES, python: str = sys.executable
+) -> list[StageTiming]:
+    """Import the stages in a fresh interpreter and time each one."""
+    lines = ["import sys"]
+    for name, module in stages:
+        lines.append(f"sys.stderr.write({_MARKER + name!r} + '\\n')")
+        lines.append(f"import {module}")
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", "\n".join(lines)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(proc.stderr, stages)
+
+
+def best_of(runs: Sequence[list[StageTiming]]) -> list[StageTiming]:
+    """Per stage, the fastest of several runs (the least disturbed by noise)."""
+    return [
+        min(timings, key=lambda t: t.total_us) for timings in zip(*runs, strict=True)
+    ]
+
+
+def format_report(timings: Sequence[StageTiming]) -> str:
+    rows = [f"{'stage':<20} {'ms':>8} {'total ms':>9}  heaviest packages (self ms)"]
+    running = 0
+    for t in timings:
+        running += t.total_us
+        heaviest = ", ".join(f"{pkg} {us / 1000:.1f}" for pkg, us in t.top_packages)
+        rows.append(
+            f"{t.name:<20} {t.total_us / 1000:>8.1f} {running / 1000:>9.1f}  {heaviest}"
+        )
+    return "\n".join(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m quantcli.observability.import_report",
+        description="Import cost of each stage of a quantcli invocation",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    runs = [measure_stages() for _ in range(max(args.repeat, 1))]
+    print(format_report(best_of(runs)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,289 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from quantcli.observability.debug import log_event
+
+PROFILE_ENV = "QUANTCLI_PROFILE"
+PROFILE_DIR_ENV = "QUANTCLI_PROFILE_DIR"
+PROFILE_SAMPLE_ENV = "QUANTCLI_PROFILE_SAMPLE"
+PROFILE_MEMORY_ENV = "QUANTCLI_PROFILE_MEMORY"
+
+_TOP_FUNCTIONS = 40
+_TOP_ALLOCATIONS = 15
+
+
+@dataclass(frozen=True)
+class ProfileConfig:
+    enabled: bool = False
+    directory: Path = Path(".")
+    sample_every: int = 1  # profile 1 in N invocations
+    memory: bool = False  # tracemalloc snapshot at the end of every span
+
+    def sampled(self, cid: str) -> bool:
+        # keyed on the correlation id, so a profile is reproducible from the cid
+        if not self.enabled:
+            return False
+        return zlib.crc32(cid.encode("utf-8")) % self.sample_every == 0
+
+
+def profile_config_from_env() -> ProfileConfig:
+    """
+    - Off unless QUANTCLI_PROFILE=1
+    - Reports go to QUANTCLI_PROFILE_DIR (default ~/.cache/quantcli/profiles)
+    - QUANTCLI_PROFILE_SAMPLE=N profiles 1 in N invocations (default 1)
+    - QUANTCLI_PROFILE_MEMORY=1 adds tracemalloc snapshots per stage
+    """
+    if os.getenv(PROFILE_ENV, "").strip() != "1":
+        return ProfileConfig()
+    directory = os.getenv(PROFILE_DIR_ENV, "").strip()
+    if not directory:
+        base = os.getenv("XDG_CACHE_HOME", "").strip()
+        root = Path(base) if base else Path.home() / ".cache"
+        directory = str(root / "quantcli" / "profiles")
+    try:
+        sample_every = max(int(os.getenv(PROFILE_SAMPLE_ENV, "1").strip()), 1)
+    except ValueError:
+        sample_every = 1
+    return ProfileConfig(
+        enabled=True,
+        directory=Path(directory),
+        sample_every=sample_every,
+        memory=os.getenv(PROFILE_MEMORY_ENV, "").strip() == "1",
+    )
+
+
+@dataclass
+class _Session:
+    cid: str
+    config: ProfileConfig
+    threads: bool
+    profiler: Any = None  # the calling thread's cProfile.Profile
+    thread_profilers: list[Any] = field(default_factory=list)
+    snapshots: list[tuple[str, Any]] = field(default_factory=list)
+    traced: bool = False  # holds a tracemalloc reference
+    previous_hook: Any = None  # threading.getprofile() before a thread session
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+# cid -> single-query memory session; spans add their stage snapshot here
+_MEMORY_SESSIONS: dict[str, _Session] = {}
+_MEMORY_LOCK = threading.Lock()
+
+# tracemalloc is process-wide: sessions share it, and it is stopped only when
+# the last session that needed it ends (and only if one of them started it)
+_TRACEMALLOC_LOCK = threading.Lock()
+_TRACEMALLOC_USERS = 0
+_TRACEMALLOC_OWNED = False
+
+_FAILURE_LOGGED = False
+
+
+def note_stage(stage: str, cid: str) -> None:
+    """Called at the end of every span; snapshots memory for profiled cids."""
+    if not _MEMORY_SESSIONS:
+        return
+    with _MEMORY_LOCK:
+        session = _MEMORY_SESSIONS.get(cid)
+    if session is None:
+        return
+    import tracemalloc
+
+    try:
+        snapshot = tracemalloc.take_snapshot()
+    except Exception:
+        return
+    with session.lock:
+        session.snapshots.append((stage, snapshot))
+
+
+@contextlib.contextmanager
+def profiled(
+    cid: str, config: ProfileConfig | None = None, threads: bool = False
+) -> Iterator[None]:
+    """
+    Profile the enclosed block with cProfile if the cid is sampled, and write
+    <cid>.pstats plus a <cid>.profile.txt summary (and a <cid>.alloc.txt
+    allocation report in memory mode) to the configured directory.
+
+    By default only the calling thread is profiled and memory is snapshotted
+    at the end of each of the cid's spans. threads=True also profiles every
+    thread started inside the block (e.g. the --batch pipeline workers) and
+    merges them into one report; its allocation report covers the whole block,
+    since concurrent queries' stages overlap. Profiling problems never fail
+    the block: it runs unprofiled instead.
+    """
+    config = config if config is not None else profile_config_from_env()
+    if not config.sampled(cid):
+        yield
+        return
+
+    session = _start(_Session(cid=cid, config=config, threads=threads))
+    try:
+        yield
+    finally:
+        if session is not None:
+            _finish(session)
+
+
+def _start(session: _Session) -> _Session | None:
+    import cProfile
+    import tracemalloc
+
+    try:
+        if session.config.memory:
+            _acquire_tracemalloc()
+            session.traced = True
+            session.snapshots.append(("start", tracemalloc.take_snapshot()))
+            if not session.threads:
+                with _MEMORY_LOCK:
+                    _MEMORY_SESSIONS[session.cid] = session
+        if session.threads:
+            session.previous_hook = threading.getprofile()
+            threading.setprofile(_thread_bootstrap(session))
+        profiler = cProfile.Profile()
+        profiler.enable()
+        session.profiler = profiler
+    except Exception as e:
+        _log_failure(session.cid, "start", e)
+        _stop(session)
+        return None
+    return session
+
+
+def _thread_bootstrap(session: _Session) -> Callable[..., None]:
+    """Profile hook for new threads: swaps itself for a per-thread profiler."""
+
+    def hook(frame: Any, event: str, arg: Any) -> None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except Exception:
+            sys.setprofile(None)
+            return
+        with session.lock:
+            session.thread_profilers.append(profiler)
+
+    return hook
+
+
+def _finish(session: _Session) -> None:
+    import tracemalloc
+
+    peak = 0
+    try:
+        if session.config.memory:
+            snapshot = tracemalloc.take_snapshot()
+            with session.lock:
+                session.snapshots.append(("end", snapshot))
+            peak = tracemalloc.get_traced_memory()[1]
+    except Exception as e:
+        _log_failure(session.cid, "finish", e)
+        session.snapshots.clear()
+    finally:
+        _stop(session)
+    _write_reports(session, peak)
+
+
+def _stop(session: _Session) -> None:
+    """Undo whatever _start managed to set up. Never raises."""
+    try:
+        if session.threads:
+            threading.setprofile(session.previous_hook)
+        if session.profiler is not None:
+            session.profiler.disable()
+        if not session.threads:
+            with _MEMORY_LOCK:
+                _MEMORY_SESSIONS.pop(session.cid, None)
+    except Exception as e:
+        _log_failure(session.cid, "stop", e)
+    finally:
+        if session.traced:
+            session.traced = False
+            _release_tracemalloc()
+
+
+def _acquire_tracemalloc() -> None:
+    import tracemalloc
+
+    global _TRACEMALLOC_USERS, _TRACEMALLOC_OWNED
+    with _TRACEMALLOC_LOCK:
+        if _TRACEMALLOC_USERS == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _TRACEMALLOC_OWNED = True
+        _TRACEMALLOC_USERS += 1
+
+
+def _release_tracemalloc() -> None:
+    import tracemalloc
+
+    global _TRACEMALLOC_USERS, _TRACEMALLOC_OWNED
+    with _TRACEMALLOC_LOCK:
+        _TRACEMALLOC_USERS -= 1
+        if _TRACEMALLOC_USERS == 0 and _TRACEMALLOC_OWNED:
+            _TRACEMALLOC_OWNED = False
+            tracemalloc.stop()
+
+
+def _log_failure(cid: str, phase: str, error: Exception) -> None:
+    # once per process: a profiler that cannot start (e.g. another profiling
+    # tool is active) would otherwise log on every sampled query
+    global _FAILURE_LOGGED
+    if _FAILURE_LOGGED:
+        return
+    _FAILURE_LOGGED = True
+    log_event("profile_fail", cid, phase=phase, error=repr(error))
+
+
+def _write_reports(session: _Session, peak_bytes: int) -> None:
+    import pstats
+
+    config, cid = session.config, session.cid
+    if session.profiler is None:
+        return
+    with session.lock:
+        profilers = [session.profiler, *session.thread_profilers]
+        snapshots = list(session.snapshots)
+    try:
+        config.directory.mkdir(parents=True, exist_ok=True)
+        text = io.StringIO()
+        stats = pstats.Stats(profilers[0], stream=text)
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats_path = config.directory / f"{cid}.pstats"
+        stats.dump_stats(str(stats_path))
+
+        stats.sort_stats("cumulative").print_stats(_TOP_FUNCTIONS)
+        (config.directory / f"{cid}.profile.txt").write_text(
+            text.getvalue(), encoding="utf-8"
+        )
+
+        if len(snapshots) > 1:
+            (config.directory / f"{cid}.alloc.txt").write_text(
+                _allocation_report(snapshots, peak_bytes), encoding="utf-8"
+            )
+    except Exception:
+        log_event("profile_write_fail", cid)
+        return
+    log_event("profile_written", cid, path=str(stats_path), threads=len(profilers))
+
+
+def _allocation_report(snapshots: list[tuple[str, Any]], peak_bytes: int) -> str:
+    lines = [f"peak traced memory: {peak_bytes / 1024:.1f} KiB"]
+    for (_, before), (stage, after) in zip(snapshots, snapshots[1:], strict=False):
+        diffs = after.compare_to(before, "lineno")
+        grown = sum(d.size_diff for d in diffs)
+        lines.append("")
+        lines.append(f"== {stage}: {grown / 1024:+.1f} KiB")
+        for diff in diffs[:_TOP_ALLOCATIONS]:
+            lines.append(str(diff))
+    return "\n".join(lines) + "\n"
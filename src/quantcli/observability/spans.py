@@ -0,0 +1,201 @@
+import atexit
+import functools
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any, ParamSpec, TextIO, TypeVar
+
+from quantcli.observability.debug import log_event
+from quantcli.observability.profiling import note_stage
+
+LATENCY_REPORT_ENV = "QUANTCLI_LATENCY_REPORT"
+
+# 32 linear sub-buckets per power of two: any recorded value is reported
+# within ~3% of its true value, whatever its magnitude
+_SUB_BUCKETS = 32
+_SUB_BITS = _SUB_BUCKETS.bit_length()  # values below 2**_SUB_BITS are exact
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram over integer microseconds: log-linear buckets,
+    so memory stays bounded (a few hundred counters up to hours) while
+    percentiles keep ~3% relative precision. Not thread-safe on its own; the
+    module registry serializes access.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    @staticmethod
+    def _index(value_us: int) -> int:
+        if value_us < _SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - _SUB_BITS
+        return (shift + 1) * _SUB_BUCKETS + (value_us >> shift) - _SUB_BUCKETS
+
+    @staticmethod
+    def _upper(index: int) -> int:
+        """Largest value that lands in bucket index."""
+        if index < _SUB_BUCKETS:
+            return index
+        shift = index // _SUB_BUCKETS - 1
+        lower = (index % _SUB_BUCKETS + _SUB_BUCKETS) << shift
+        return lower + (1 << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        value_us = max(int(value_us), 0)
+        idx = self._index(value_us)
+        self._counts[idx] = self._counts.get(idx, 0) + 1
+        self.min_us = value_us if self.count == 0 else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+        self.count += 1
+        self.total_us += value_us
+
+    def percentile(self, p: float) -> int:
+        if not 0 <= p <= 100:
+            raise ValueError("p must be in [0, 100]")
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * p // 100))  # ceil, at least the first value
+        seen = 0
+        for idx in sorted(self._counts):
+            seen += self._counts[idx]
+            if seen >= rank:
+                return min(self._upper(idx), self.max_us)
+        return self.max_us
+
+    def summary(self) -> dict[str, float]:
+        """count, mean, p50/p90/p99 and max, in milliseconds."""
+        mean = self.total_us / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": mean / 1000,
+            "p50_ms": self.percentile(50) / 1000,
+            "p90_ms": self.percentile(90) / 1000,
+            "p99_ms": self.percentile(99) / 1000,
+            "max_ms": self.max_us / 1000,
+        }
+
+
+_HISTOGRAMS: dict[str, LatencyHistogram] = {}
+_HISTOGRAMS_LOCK = threading.Lock()
+
+
+def record_latency(stage: str, elapsed_us: int) -> None:
+    with _HISTOGRAMS_LOCK:
+        hist = _HISTOGRAMS.get(stage)
+        if hist is None:
+            hist = _HISTOGRAMS[stage] = LatencyHistogram()
+        hist.record(elapsed_us)
+
+
+@contextmanager
+def span(stage: str, cid: str, **fields: Any) -> Iterator[None]:
+    """
+    Time a stage of one query: the elapsed time goes into the stage's
+    in-process histogram and, with debug logging on, a "span" event records
+    its start and end under cid. Exceptions propagate (recorded as ok=false).
+    """
+    start_ts = datetime.now(UTC)
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        elapsed_us = int((time.perf_counter() - t0) * 1_000_000)
+        record_latency(stage, elapsed_us)
+        note_stage(stage, cid)
+        log_event(
+            "span",
+            cid,
+            stage=stage,
+            start_ts=start_ts.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            elapsed_ms=round(elapsed_us / 1000, 3),
+            ok=ok,
+            **fields,
+        )
+
+
+def timed(stage: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator form of span(); the cid is taken from a `cid` keyword argument."""
+
+    def decorate(fn: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(stage, str(kwargs.get("cid", ""))):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def latency_summary() -> dict[str, dict[str, float]]:
+    """Per-stage count, mean, p50/p90/p99 and max (ms) recorded so far."""
+    with _HISTOGRAMS_LOCK:
+        return {stage: hist.summary() for stage, hist in sorted(_HISTOGRAMS.items())}
+
+
+def reset_latency() -> None:
+    with _HISTOGRAMS_LOCK:
+        _HISTOGRAMS.clear()
+
+
+def format_latency_summary(summary: dict[str, dict[str, float]]) -> str:
+    rows = [
+        f"{'stage':<12} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'p99 ms':>9} {'max ms':>9}"
+    ]
+    for stage, s in summary.items():
+        rows.append(
+            f"{stage:<12} {int(s['count']):>7} {s['p50_ms']:>9.3f} "
+            f"{s['p90_ms']:>9.3f} {s['p99_ms']:>9.3f} {s['max_ms']:>9.3f}"
+        )
+    return "\n".join(rows)
+
+
+def dump_latency_summary(out: TextIO | None = None) -> None:
+    """Write the summary table (stderr by default; never stdout). Never raises."""
+    summary = latency_summary()
+    if not summary:
+        return
+    try:
+        sink = out if out is not None else sys.stderr
+        sink.write(format_latency_summary(summary) + "\n")
+        sink.flush()
+    except Exception:
+        pass
+
+
+_REPORT_REGISTERED = False
+
+
+def init_latency_report_from_env() -> None:
+    """
+    QUANTCLI_LATENCY_REPORT=1: dump the summary to stderr at exit and, where
+    the platform has it, whenever the process receives SIGUSR1 (e.g. to
+    inspect a running daemon).
+    """
+    global _REPORT_REGISTERED
+    if _REPORT_REGISTERED or os.getenv(LATENCY_REPORT_ENV, "").strip() != "1":
+        return
+    _REPORT_REGISTERED = True
+    atexit.register(dump_latency_summary)
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is (
+        threading.main_thread()
+    ):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: dump_latency_summary())
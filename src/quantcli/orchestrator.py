@@ -1,18 +1,102 @@
-from quantcli.data.price_provider import PriceProvider, PriceProviderError
-from quantcli.llm.llm_client import LLMClient
-from quantcli.observability.debug import log_event
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.data.price_provider import (
+    AsyncPriceProvider,
+    PriceProvider,
+    PriceProviderError,
+    is_tail_consistent,
+)
+from quantcli.data.speculative_price_provider import SpeculativePriceProvider
+from quantcli.fetch_planner import TickerFetch, plan_fetches, tail_view
+from quantcli.llm.llm_client import AsyncLLMClient, LLMClient
+from quantcli.observability.debug import log_event, new_correlation_id
+from quantcli.observability.spans import span
+from quantcli.pipeline import Stage, run_pipeline
 from quantcli.refusals import make_refusal
-from quantcli.router.router import route_query
+from quantcli.result_cache import ResultCache, prices_fingerprint
+from quantcli.router.fast_path import prescan_ticker_range
+from quantcli.router.intent_cache import IntentCache
+from quantcli.router.router import route_query, route_query_async
 from quantcli.schemas.intent import Intent
+from quantcli.schemas.multi_result import MultiResult
 from quantcli.schemas.refusal import Refusal
 from quantcli.schemas.result import Result
 from quantcli.schemas.tool_name import ToolName
-from quantcli.tools.registry import get_metric
+from quantcli.tools.accumulators import MetricAccumulator
+from quantcli.tools.metrics import PreparedPrices
+from quantcli.tools.registry import (
+    MetricFn,
+    get_accumulator,
+    get_batch_metric,
+    get_metric,
+    get_prepared_metric,
+)
 from quantcli.validate_intent import validate_intent
 
+# bump when a kernel's output changes so cached Results are not reused
+TOOL_VERSION = "1.1.0"
 
-def run_intent(intent: Intent, provider: PriceProvider, cid: str) -> Result | Refusal:
-    validated_intent = validate_intent(intent)
+
+def run_intent(
+    intent: Intent,
+    provider: PriceProvider,
+    cid: str,
+    result_cache: ResultCache | None = None,
+) -> Result | Refusal:
+    planned = _plan_intent(intent, cid)
+    if isinstance(planned, Refusal):
+        return planned
+    validated_intent, metric_fn = planned
+
+    try:
+        with span("fetch", cid):
+            prices = provider.get_adjusted_close(
+                ticker=validated_intent.tickers[0],
+                n_days=validated_intent.time_range.n_days,
+            )
+    except PriceProviderError:
+        log_event("provider_fail", cid, provider=provider.name())
+        return make_refusal(reason="Unable to retrieve valid price data.")
+
+    return _compute_result(
+        validated_intent, metric_fn, prices, provider.name(), cid, result_cache
+    )
+
+
+async def run_intent_async(
+    intent: Intent,
+    provider: AsyncPriceProvider,
+    cid: str,
+    result_cache: ResultCache | None = None,
+) -> Result | Refusal:
+    planned = _plan_intent(intent, cid)
+    if isinstance(planned, Refusal):
+        return planned
+    validated_intent, metric_fn = planned
+
+    try:
+        with span("fetch", cid):
+            prices = await provider.get_adjusted_close(
+                ticker=validated_intent.tickers[0],
+                n_days=validated_intent.time_range.n_days,
+            )
+    except PriceProviderError:
+        log_event("provider_fail", cid, provider=provider.name())
+        return make_refusal(reason="Unable to retrieve valid price data.")
+
+    return _compute_result(
+        validated_intent, metric_fn, prices, provider.name(), cid, result_cache
+    )
+
+
+def _plan_intent(intent: Intent, cid: str) -> tuple[Intent, MetricFn] | Refusal:
+    with span("validate", cid):
+        validated_intent = validate_intent(intent)
     if isinstance(validated_intent, Refusal):
         log_event("validation_reject", cid, tool=intent.tool.value)
         return validated_intent
@@ -21,64 +105,555 @@ def run_intent(intent: Intent, provider: PriceProvider, cid: str) -> Result | Re
     if metric_fn is None:
         log_event("metric_missing", cid, tool=validated_intent.tool.value)
         return make_refusal(reason="Requested tool is not supported.")
+    return validated_intent, metric_fn
 
-    try:
-        prices = provider.get_adjusted_close(
-            ticker=validated_intent.tickers[0],
-            n_days=validated_intent.time_range.n_days,
+
+def _compute_result(
+    validated_intent: Intent,
+    metric_fn: MetricFn,
+    prices: NDArray[np.float64],
+    price_source: str,
+    cid: str,
+    result_cache: ResultCache | None = None,
+    prepared: PreparedPrices | None = None,
+    value: float | None = None,
+) -> Result | Refusal:
+    """
+    prepared: validated prices shared with other kernels over the same vector
+    (multi-metric mode); the metric then runs on its prepared kernel.
+    value: the metric already computed by a batched kernel; no kernel runs.
+    """
+    tool = validated_intent.tool.value
+    prices_hash = ""
+    if result_cache is not None:
+        prices_hash = prices_fingerprint(prices)
+        hit = result_cache.get(
+            ResultCache.key(validated_intent, prices_hash, price_source, TOOL_VERSION)
         )
-    except PriceProviderError:
-        log_event("provider_fail", cid, provider=provider.name())
-        return make_refusal(reason="Unable to retrieve valid price data.")
+        if hit is not None:
+            log_event("result_cache_hit", cid, tool=tool)
+            log_event("intent_success", cid, tool=tool)
+            return hit
+        log_event("result_cache_miss", cid, tool=tool)
 
+    ret_value: float | NDArray[np.float64]
+    if value is not None:
+        ret_value = value
+    else:
+        try:
+            with span("compute", cid, tool=tool):
+                prepared_fn = get_prepared_metric(validated_intent.tool)
+                if prepared is not None and prepared_fn is not None:
+                    ret_value = prepared_fn(prepared, validated_intent.params)
+                else:
+                    ret_value = metric_fn(prices, validated_intent.params)
+        except ValueError:
+            log_event("metric_fail", cid, tool=tool)
+            return make_refusal(reason="Unable to compute metric.")
+
+    value = ret_value.tolist() if isinstance(ret_value, np.ndarray) else ret_value
+
+    log_event("intent_success", cid, tool=tool)
+    result = _build_result(validated_intent, value, len(prices), price_source)
+    if result_cache is not None:
+        tool_version = str(result.metadata["tool_version"])
+        result_cache.put(
+            ResultCache.key(validated_intent, prices_hash, price_source, tool_version),
+            result,
+        )
+    return result
+
+
+def run_intents(
+    intents: Sequence[Intent],
+    provider: PriceProvider,
+    cid: str,
+    result_cache: ResultCache | None = None,
+) -> MultiResult | Refusal:
+    """
+    Multi-metric mode of run_intent: evaluate several intents for the same
+    ticker and time range over a single fetch. Prices are validated once and
+    log returns and the cumulative max are computed once, then shared by every
+    kernel; each metric otherwise goes through run_intent's steps (spans,
+    result cache). run_batch --coalesce-fetches shares prices the same way.
+
+    A metric that fails validation or computation yields a per-metric Refusal;
+    only an empty request, a ticker/range mismatch or a provider failure
+    refuses the whole request.
+    """
+    if not intents:
+        log_event("multi_reject", cid, reason="EMPTY")
+        return make_refusal(reason="At least one metric must be requested.")
+
+    first = intents[0]
+    if any(
+        i.tickers != first.tickers or i.time_range != first.time_range
+        for i in intents[1:]
+    ):
+        log_event("multi_reject", cid, reason="MIXED_TICKER_OR_RANGE")
+        return make_refusal(
+            reason="Multi-metric requests must share one ticker and time range.",
+            clarifying_question="Request metrics for one ticker and time range.",
+        )
+
+    outcomes: dict[int, Result | Refusal] = {}
+    runnable: list[tuple[int, Intent, MetricFn]] = []
+    for idx, intent in enumerate(intents):
+        planned = _plan_intent(intent, cid)
+        if isinstance(planned, Refusal):
+            outcomes[idx] = planned
+        else:
+            runnable.append((idx, *planned))
+
+    if runnable:
+        _, lead_intent, _ = runnable[0]
+        try:
+            with span("fetch", cid):
+                prices = provider.get_adjusted_close(
+                    ticker=lead_intent.tickers[0],
+                    n_days=lead_intent.time_range.n_days,
+                )
+        except PriceProviderError:
+            log_event("provider_fail", cid, provider=provider.name())
+            return make_refusal(reason="Unable to retrieve valid price data.")
+
+        prepared = _prepare(prices)
+        for idx, validated_intent, metric_fn in runnable:
+            outcomes[idx] = _compute_result(
+                validated_intent,
+                metric_fn,
+                prices,
+                provider.name(),
+                cid,
+                result_cache,
+                prepared,
+            )
+
+    log_event(
+        "multi_success",
+        cid,
+        metric_count=len(intents),
+        computed=sum(isinstance(o, Result) for o in outcomes.values()),
+    )
+    return MultiResult(
+        tickers=first.tickers,
+        results=[outcomes[idx] for idx in range(len(intents))],
+        metadata={
+            "range_n_days": first.time_range.n_days,
+            "price_source": provider.name(),
+            "price_fetches": 1 if runnable else 0,
+        },
+    )
+
+
+def _prepare(prices: NDArray[np.float64]) -> PreparedPrices | None:
+    """Shared intermediates for several kernels over one price vector, or None
+    when the prices fail validation (each kernel then refuses on its own)."""
     try:
-        ret_value = metric_fn(prices, validated_intent.params)
-    except ValueError:
-        log_event("metric_fail", cid, tool=validated_intent.tool.value)
-        return make_refusal(reason="Unable to compute metric.")
+        return PreparedPrices(prices)
+    except (TypeError, ValueError):
+        return None
+
 
-    _uses_annualization = validated_intent.tool in (
+def _build_result(
+    intent: Intent, value: float | list[float], data_points: int, price_source: str
+) -> Result:
+    _uses_annualization = intent.tool in (
         ToolName.realized_volatility,
         ToolName.sharpe_ratio,
+        ToolName.rolling_volatility,
+        ToolName.rolling_sharpe_ratio,
     )
-    annualization = (
-        validated_intent.params.annualization_factor if _uses_annualization else None
-    )
+    annualization = intent.params.annualization_factor if _uses_annualization else None
     risk_free_rate = (
-        validated_intent.params.risk_free_rate
-        if validated_intent.tool == ToolName.sharpe_ratio
+        intent.params.risk_free_rate
+        if intent.tool in (ToolName.sharpe_ratio, ToolName.rolling_sharpe_ratio)
         else None
     )
 
-    log_event("intent_success", cid, tool=validated_intent.tool.value)
     return Result(
-        tool=validated_intent.tool,
-        tickers=validated_intent.tickers,
-        value=ret_value,
+        tool=intent.tool,
+        tickers=intent.tickers,
+        value=value,
         metadata={
-            "range_n_days": validated_intent.time_range.n_days,
-            "window": validated_intent.params.window,
+            "range_n_days": intent.time_range.n_days,
+            "window": intent.params.window,
             "annualization_factor": annualization,
             "risk_free_rate": risk_free_rate,
-            "data_points": len(prices),
-            "price_source": provider.name(),
-            "tool_version": "1.0.0",  # TODO
+            "data_points": data_points,
+            "price_source": price_source,
+            "tool_version": TOOL_VERSION,
             "interpretation_notes": None,  # TODO
         },
     )
 
 
+@dataclass
+class MetricStream:
+    """
+    Keeps a metric accumulator alive between price ticks for one validated intent,
+    so each new bar costs an O(1) update instead of a refetch and full recompute.
+    The held history is capped at the intent's n_days.
+    """
+
+    intent: Intent
+    accumulator: MetricAccumulator
+    price_source: str
+
+    def push(self, price: float, cid: str) -> Result | Refusal:
+        try:
+            self.accumulator.push(price)
+            value = self.accumulator.value()
+        except ValueError:
+            log_event("metric_fail", cid, tool=self.intent.tool.value)
+            return make_refusal(reason="Unable to compute metric.")
+
+        log_event("stream_tick", cid, tool=self.intent.tool.value)
+        return _build_result(
+            self.intent, value, len(self.accumulator), self.price_source
+        )
+
+
+def start_stream(
+    intent: Intent, provider: PriceProvider, cid: str
+) -> MetricStream | Refusal:
+    validated_intent = validate_intent(intent)
+    if isinstance(validated_intent, Refusal):
+        log_event("validation_reject", cid, tool=intent.tool.value)
+        return validated_intent
+
+    accumulator_factory = get_accumulator(validated_intent.tool)
+    if accumulator_factory is None:
+        log_event("accumulator_missing", cid, tool=validated_intent.tool.value)
+        return make_refusal(reason="Requested tool does not support streaming.")
+
+    n_days = validated_intent.time_range.n_days
+    try:
+        prices = provider.get_adjusted_close(
+            ticker=validated_intent.tickers[0],
+            n_days=n_days,
+        )
+    except PriceProviderError:
+        log_event("provider_fail", cid, provider=provider.name())
+        return make_refusal(reason="Unable to retrieve valid price data.")
+
+    try:
+        accumulator = accumulator_factory(validated_intent.params, n_days)
+        for price in prices:
+            accumulator.push(float(price))
+    except ValueError:
+        log_event("metric_fail", cid, tool=validated_intent.tool.value)
+        return make_refusal(reason="Unable to compute metric.")
+
+    log_event("stream_start", cid, tool=validated_intent.tool.value)
+    return MetricStream(
+        intent=validated_intent,
+        accumulator=accumulator,
+        price_source=provider.name(),
+    )
+
+
 def run_query(
-    user_query: str, llm_client: LLMClient, price_provider: PriceProvider, cid: str
+    user_query: str,
+    llm_client: LLMClient,
+    price_provider: PriceProvider,
+    cid: str,
+    intent_cache: IntentCache | None = None,
+    fast_path: bool = False,
+    speculative_prefetch: bool = False,
+    result_cache: ResultCache | None = None,
 ) -> Result | Refusal:
-    intent_or_refusal = route_query(user_query, llm_client, cid=cid)
+    """
+    speculative_prefetch: guess the ticker and range from the query text and
+    start fetching them before routing, so price latency overlaps LLM latency.
+    The guess is used only if the routed intent asks for the same ticker and
+    at most the guessed range.
+
+    result_cache: reuse the Result of an identical validated intent computed
+    over byte-identical prices instead of rerunning the metric kernel.
+    """
+    speculation: SpeculativePriceProvider | None = None
+    if speculative_prefetch:
+        guess = prescan_ticker_range(user_query)
+        if guess is not None:
+            speculation = SpeculativePriceProvider(price_provider, *guess, cid=cid)
+
+    with span("route", cid):
+        intent_or_refusal = route_query(
+            user_query,
+            llm_client,
+            cid=cid,
+            intent_cache=intent_cache,
+            fast_path=fast_path,
+        )
     if isinstance(intent_or_refusal, Refusal):
         log_event("route_refusal", cid)
+        if speculation is not None:
+            speculation.discard("route_refusal")
         return intent_or_refusal
 
-    out = run_intent(intent_or_refusal, price_provider, cid=cid)
+    out = run_intent(
+        intent_or_refusal,
+        speculation or price_provider,
+        cid=cid,
+        result_cache=result_cache,
+    )
+    if speculation is not None:
+        speculation.discard("unclaimed")
     if isinstance(out, Refusal):
         log_event("intent_refusal", cid, tool=intent_or_refusal.tool.value)
     else:
         log_event("intent_result", cid, tool=intent_or_refusal.tool.value)
     return out
+
+
+async def run_query_async(
+    user_query: str,
+    llm_client: AsyncLLMClient,
+    price_provider: AsyncPriceProvider,
+    cid: str,
+    intent_cache: IntentCache | None = None,
+    fast_path: bool = False,
+    result_cache: ResultCache | None = None,
+) -> Result | Refusal:
+    with span("route", cid):
+        intent_or_refusal = await route_query_async(
+            user_query,
+            llm_client,
+            cid=cid,
+            intent_cache=intent_cache,
+            fast_path=fast_path,
+        )
+    if isinstance(intent_or_refusal, Refusal):
+        log_event("route_refusal", cid)
+        return intent_or_refusal
+
+    out = await run_intent_async(
+        intent_or_refusal, price_provider, cid=cid, result_cache=result_cache
+    )
+    if isinstance(out, Refusal):
+        log_event("intent_refusal", cid, tool=intent_or_refusal.tool.value)
+    else:
+        log_event("intent_result", cid, tool=intent_or_refusal.tool.value)
+    return out
+
+
+@dataclass
+class _BatchItem:
+    query: str
+    cid: str
+    intent: Intent | None = None
+    metric_fn: MetricFn | None = None
+    prices: NDArray[np.float64] | None = None
+    prepared: PreparedPrices | None = None
+    value: float | None = None
+    out: Result | Refusal | None = None
+
+
+def _compute_batched(items: Sequence[_BatchItem]) -> None:
+    """
+    Intents sharing a tool, range and params run as one row-wise batched
+    kernel over a right-aligned price matrix. A finite row becomes the item's
+    value; NaN rows (the kernel could not compute them) are left to the point
+    kernel, which refuses with its usual reason.
+    """
+    groups: dict[tuple[ToolName, int, str], list[_BatchItem]] = {}
+    for item in items:
+        if item.out is not None or item.intent is None or item.prices is None:
+            continue
+        if get_batch_metric(item.intent.tool) is None:
+            continue
+        intent = item.intent
+        key = (intent.tool, intent.time_range.n_days, intent.params.model_dump_json())
+        groups.setdefault(key, []).append(item)
+
+    for (tool, _, _), members in groups.items():
+        batch_fn = get_batch_metric(tool)
+        if batch_fn is None or len(members) < 2:
+            continue
+        rows = [m.prices for m in members if m.prices is not None]
+        lengths = np.array([r.size for r in rows], dtype=np.int64)
+        width = int(lengths.max())
+        matrix = np.full((len(rows), width), np.nan, dtype=np.float64)
+        for i, row in enumerate(rows):
+            matrix[i, width - row.size :] = row
+        assert members[0].intent is not None
+        try:
+            with span("compute", members[0].cid, tool=tool.value, batched=len(rows)):
+                values = batch_fn(matrix, lengths, members[0].intent.params)
+        except ValueError:
+            continue
+        for item, v in zip(members, values.tolist(), strict=True):
+            if np.isfinite(v):
+                item.value = v
+
+
+def run_batch(
+    queries: Iterable[str],
+    llm_client: LLMClient,
+    price_provider: PriceProvider,
+    *,
+    route_workers: int = 4,
+    fetch_workers: int = 4,
+    compute_workers: int = 1,
+    queue_size: int = 16,
+    intent_cache: IntentCache | None = None,
+    fast_path: bool = False,
+    result_cache: ResultCache | None = None,
+    coalesce_fetches: bool = False,
+) -> Iterator[tuple[str, Result | Refusal]]:
+    """
+    Many queries through one process: routing, price fetching and metric
+    computation run as pipelined stages with their own worker pools, so one
+    query's LLM call overlaps another's fetch. Yields (cid, outcome) per query
+    in input order; every query gets its own correlation id and the same
+    outcome run_query would give it.
+
+    coalesce_fetches: route the whole batch first, then fetch each ticker once
+    at the longest requested range and give every intent a tail view of it.
+    Only tail-consistent providers (is_tail_consistent) get their ranges
+    merged, since only there is a tail the same prices run_query would fetch;
+    other providers get one fetch per distinct (ticker, range). Intents on
+    the same ticker and range also share one PreparedPrices (the multi-metric
+    mode of run_intents), so validation, log returns and the cumulative max
+    are computed once for all of them, and intents with the same tool, range
+    and params on different tickers run through the tool's batched kernel in
+    one pass. Fewer upstream calls, but nothing is yielded
+    until routing finishes.
+    """
+
+    def _guard(
+        stage: str, fn: Callable[[_BatchItem], None]
+    ) -> Callable[[_BatchItem], _BatchItem]:
+        def run(item: _BatchItem) -> _BatchItem:
+            if item.out is None:
+                try:
+                    fn(item)
+                except Exception:
+                    log_event("batch_stage_fail", item.cid, stage=stage)
+                    item.out = make_refusal(reason="Unexpected internal error.")
+            return item
+
+        return run
+
+    def route(item: _BatchItem) -> None:
+        with span("route", item.cid):
+            routed = route_query(
+                item.query,
+                llm_client,
+                cid=item.cid,
+                intent_cache=intent_cache,
+                fast_path=fast_path,
+            )
+        if isinstance(routed, Refusal):
+            log_event("route_refusal", item.cid)
+            item.out = routed
+            return
+        planned = _plan_intent(routed, item.cid)
+        if isinstance(planned, Refusal):
+            log_event("intent_refusal", item.cid, tool=routed.tool.value)
+            item.out = planned
+            return
+        item.intent, item.metric_fn = planned
+
+    def fetch(item: _BatchItem) -> None:
+        assert item.intent is not None
+        try:
+            with span("fetch", item.cid):
+                item.prices = price_provider.get_adjusted_close(
+                    ticker=item.intent.tickers[0],
+                    n_days=item.intent.time_range.n_days,
+                )
+        except PriceProviderError:
+            _fetch_failed(item)
+
+    def _fetch_failed(item: _BatchItem) -> None:
+        assert item.intent is not None
+        log_event("provider_fail", item.cid, provider=price_provider.name())
+        log_event("intent_refusal", item.cid, tool=item.intent.tool.value)
+        item.out = make_refusal(reason="Unable to retrieve valid price data.")
+
+    def compute(item: _BatchItem) -> None:
+        assert item.intent is not None
+        assert item.metric_fn is not None
+        assert item.prices is not None
+        item.out = _compute_result(
+            item.intent,
+            item.metric_fn,
+            item.prices,
+            price_provider.name(),
+            item.cid,
+            result_cache,
+            item.prepared,
+            item.value,
+        )
+        outcome = "intent_refusal" if isinstance(item.out, Refusal) else "intent_result"
+        log_event(outcome, item.cid, tool=item.intent.tool.value)
+
+    items = (_BatchItem(query=q, cid=new_correlation_id()) for q in queries)
+    route_stage = Stage("route", _guard("route", route), route_workers)
+    compute_stage = Stage("compute", _guard("compute", compute), compute_workers)
+
+    if not coalesce_fetches:
+        stages = [
+            route_stage,
+            Stage("fetch", _guard("fetch", fetch), fetch_workers),
+            compute_stage,
+        ]
+        for item in run_pipeline(items, stages, queue_size=queue_size):
+            assert item.out is not None
+            yield item.cid, item.out
+        return
+
+    routed = list(run_pipeline(items, [route_stage], queue_size=queue_size))
+    pending = [item for item in routed if item.out is None]
+    merge_ranges = is_tail_consistent(price_provider)
+    plan = plan_fetches(
+        [item.intent for item in pending if item.intent is not None], merge_ranges
+    )
+    assert plan.intents == len(pending)
+    log_event(
+        "fetch_plan",
+        new_correlation_id(),
+        intents=plan.intents,
+        fetches=len(plan.fetches),
+        fetches_saved=plan.fetches_saved,
+        bytes_avoided=plan.bytes_avoided,
+        merge_ranges=merge_ranges,
+    )
+
+    def fetch_group(group: TickerFetch) -> None:
+        members = [pending[idx] for idx in group.members]
+        try:
+            with span("fetch", members[0].cid, coalesced=len(members)):
+                prices = price_provider.get_adjusted_close(
+                    ticker=group.ticker, n_days=group.n_days
+                )
+        except PriceProviderError:
+            for item in members:
+                _fetch_failed(item)
+            return
+        except Exception:
+            for item in members:
+                log_event("batch_stage_fail", item.cid, stage="fetch")
+                item.out = make_refusal(reason="Unexpected internal error.")
+            return
+        shared: dict[int, PreparedPrices | None] = {}
+        for item in members:
+            assert item.intent is not None
+            n_days = item.intent.time_range.n_days
+            item.prices = tail_view(prices, n_days)
+            if n_days not in shared:
+                shared[n_days] = _prepare(item.prices)
+            item.prepared = shared[n_days]
+
+    if plan.fetches:
+        with ThreadPoolExecutor(
+            max_workers=min(fetch_workers, len(plan.fetches))
+        ) as pool:
+            list(pool.map(fetch_group, plan.fetches))
+    _compute_batched(pending)
+
+    for item in run_pipeline(routed, [compute_stage], queue_size=queue_size):
+        assert item.out is not None
+        yield item.cid, item.out
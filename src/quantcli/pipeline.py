@@ -0,0 +1,119 @@
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Stage(Generic[T]):
+    name: str
+    fn: Callable[[T], T]
+    workers: int = 1
+
+    def __post_init__(self) -> None:
+        if self.workers < 1:
+            raise ValueError(f"{self.name}: workers must be >= 1")
+
+
+def run_pipeline(
+    items: Iterable[T], stages: Sequence[Stage[T]], queue_size: int = 16
+) -> Iterator[T]:
+    """
+    Push items through stages, each served by its own pool of worker threads
+    and fed by a bounded queue, and yield the results in input order.
+
+    Input is consumed lazily: a slow stage backs up the queues in front of it,
+    and at most queue_size items per stage plus the busy workers are in flight
+    at once (which also bounds the reorder buffer). An exception raised by a
+    stage function is re-raised here; stage functions that want per-item
+    failures should encode them in the item.
+    """
+    if queue_size < 1:
+        raise ValueError("queue_size must be >= 1")
+    if not stages:
+        yield from items
+        return
+
+    # None marks the end of a stream; results also carries stage exceptions
+    queues: list[queue.Queue[tuple[int, T] | None]] = [
+        queue.Queue(maxsize=queue_size) for _ in stages
+    ]
+    results: queue.Queue[tuple[int, T] | BaseException | None] = queue.Queue()
+    in_flight = threading.Semaphore(
+        queue_size * len(stages) + sum(s.workers for s in stages)
+    )
+    stop = threading.Event()
+
+    def feed() -> None:
+        try:
+            for idx, item in enumerate(items):
+                in_flight.acquire()
+                if stop.is_set():
+                    return
+                queues[0].put((idx, item))
+        except BaseException as e:
+            results.put(e)
+        finally:
+            for _ in range(stages[0].workers):
+                queues[0].put(None)
+
+    def work(k: int, remaining: list[int], lock: threading.Lock) -> None:
+        stage = stages[k]
+        is_last_stage = k + 1 == len(stages)
+        while (task := queues[k].get()) is not None:
+            idx, item = task
+            if not stop.is_set():
+                try:
+                    item = stage.fn(item)
+                except BaseException as e:
+                    results.put(e)
+                    continue
+            if is_last_stage:
+                results.put((idx, item))
+            else:
+                queues[k + 1].put((idx, item))
+        with lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker:
+            if is_last_stage:
+                results.put(None)
+            else:
+                for _ in range(stages[k + 1].workers):
+                    queues[k + 1].put(None)
+
+    threads = [threading.Thread(target=feed, daemon=True, name="pipeline-feed")]
+    for k, stage in enumerate(stages):
+        lock = threading.Lock()
+        remaining = [stage.workers]
+        threads.extend(
+            threading.Thread(
+                target=work,
+                args=(k, remaining, lock),
+                daemon=True,
+                name=f"pipeline-{stage.name}-{w}",
+            )
+            for w in range(stage.workers)
+        )
+    for t in threads:
+        t.start()
+
+    pending: dict[int, T] = {}
+    next_idx = 0
+    try:
+        while (done := results.get()) is not None:
+            if isinstance(done, BaseException):
+                raise done
+            idx, value = done
+            pending[idx] = value
+            while next_idx in pending:
+                in_flight.release()
+                yield pending.pop(next_idx)
+                next_idx += 1
+    finally:
+        # on early exit (error or abandoned generator) let the workers drain
+        stop.set()
+        in_flight.release()
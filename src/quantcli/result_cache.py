@@ -0,0 +1,73 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.result import Result
+
+
+def prices_fingerprint(prices: NDArray[np.float64]) -> str:
+    """Content hash of a price vector (values and length, float64 bytes)."""
+    data = np.ascontiguousarray(prices, dtype=np.float64)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data.tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class ResultCache:
+    """
+    Computed Results keyed on the canonical validated intent (tool, tickers,
+    n_days, params), a content hash of the fetched prices, the price source
+    and the tool_version recorded in the result metadata.
+
+    - In-memory LRU of max_entries, shared safely across threads
+    - A data revision changes the price hash and a kernel change bumps
+      tool_version, so a stale entry is never hit again
+    - Only Results are cached; refusals are cheap to rebuild
+    """
+
+    max_entries: int = 1024
+    _entries: "OrderedDict[str, Result]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+    @staticmethod
+    def key(
+        intent: Intent, prices_hash: str, price_source: str, tool_version: str
+    ) -> str:
+        raw = "\x00".join(
+            (intent.model_dump_json(), prices_hash, price_source, tool_version)
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Result | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+        return hit.model_copy(deep=True)
+
+    def put(self, key: str, result: Result) -> None:
+        stored = result.model_copy(deep=True)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,371 @@
+import re
+import threading
+
+from pydantic import ValidationError
+
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.params import Params
+from quantcli.schemas.time_range import TimeRange
+from quantcli.schemas.tool_name import ToolName
+
+# numbers (with an optional percent sign), uppercase share-class tickers such as
+# BRK.B / BF-B, plain words, and any other single non-space character
+_TOKEN_RE = re.compile(
+    r"(?P<num>\d+(?:\.\d+)?)(?P<pct>%)?"
+    r"|(?P<ticker>\b[A-Z]{1,5}[.-][A-Z]{1,2}\b)"
+    r"|(?P<word>[A-Za-z]+)"
+    r"|(?P<punct>\S)"
+)
+_TICKER_RE = re.compile(r"[A-Z]{1,5}(?:[.-][A-Z]{1,2})?")
+
+_IGNORED_PUNCT = frozenset(",.?!:;-'’\"")
+_FILLER = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "calculate",
+        "compute",
+        "during",
+        "for",
+        "get",
+        "in",
+        "is",
+        "me",
+        "of",
+        "over",
+        "please",
+        "s",  # possessive, as in "AAPL's"
+        "show",
+        "the",
+        "using",
+        "was",
+        "what",
+        "with",
+    }
+)
+_RANGE_ANCHORS = frozenset({"last", "past", "previous", "trailing"})
+_TRADING = frozenset({"trading"})
+_DAY_UNITS = frozenset({"day", "days"})
+_DAY_WORDS = _DAY_UNITS | _TRADING
+_ASSIGN = frozenset({"of", "is"})
+_WINDOW_PHRASES = (("window",), ("rolling", "window"))
+
+_TOOL_KEYWORDS: dict[tuple[str, ...], ToolName] = {
+    ("total", "return"): ToolName.total_return,
+    ("max", "drawdown"): ToolName.max_drawdown,
+    ("maximum", "drawdown"): ToolName.max_drawdown,
+    ("realized", "volatility"): ToolName.realized_volatility,
+    ("realised", "volatility"): ToolName.realized_volatility,
+    ("sharpe", "ratio"): ToolName.sharpe_ratio,
+    ("sharpe",): ToolName.sharpe_ratio,
+    ("rolling", "volatility"): ToolName.rolling_volatility,
+    ("rolling", "realized", "volatility"): ToolName.rolling_volatility,
+    ("rolling", "realised", "volatility"): ToolName.rolling_volatility,
+    ("rolling", "sharpe", "ratio"): ToolName.rolling_sharpe_ratio,
+    ("rolling", "sharpe"): ToolName.rolling_sharpe_ratio,
+}
+_TOOL_PHRASES = sorted(_TOOL_KEYWORDS, key=len, reverse=True)
+_RISK_FREE_PHRASES = (("risk", "free", "rate"), ("riskfree", "rate"))
+_ANNUALIZATION_PHRASES = (
+    ("annualization", "factor"),
+    ("annualisation", "factor"),
+    ("annualization",),
+    ("annualisation",),
+)
+
+_WINDOW_TOOLS = frozenset(
+    {
+        ToolName.realized_volatility,
+        ToolName.rolling_volatility,
+        ToolName.sharpe_ratio,
+        ToolName.rolling_sharpe_ratio,
+    }
+)
+_SHARPE_TOOLS = frozenset({ToolName.sharpe_ratio, ToolName.rolling_sharpe_ratio})
+
+# all-caps words that are part of the grammar, so "MAX DRAWDOWN" is no ticker
+_PRESCAN_VOCABULARY = (
+    _FILLER | _DAY_WORDS | _RANGE_ANCHORS | {w for p in _TOOL_KEYWORDS for w in p}
+)
+# other all-caps words common in queries that are not tickers
+_NOT_TICKERS = _PRESCAN_VOCABULARY | frozenset(
+    {"i", "my", "vs", "us", "usd", "etf", "ytd", "eod", "pct"}
+)
+# a bare single letter is far more often "I" or "A" than F or T; those
+# tickers still route through the LLM
+_MIN_BARE_TICKER_LEN = 2
+
+
+class _NoMatch(Exception):
+    pass
+
+
+class _Token:
+    __slots__ = ("kind", "text", "lower", "pct")
+
+    def __init__(self, kind: str, text: str, pct: bool = False) -> None:
+        self.kind = kind
+        self.text = text
+        self.lower = text.lower()
+        self.pct = pct
+
+
+def _is_bare_ticker(tok: _Token) -> bool:
+    """An all-caps word that reads as a ticker (share-class forms such as BRK.B
+    are tokenized as tickers already)."""
+    return (
+        tok.kind == "word"
+        and tok.text.isupper()
+        and len(tok.text) >= _MIN_BARE_TICKER_LEN
+        and tok.lower not in _NOT_TICKERS
+        and _TICKER_RE.fullmatch(tok.text) is not None
+    )
+
+
+def _tokenize(user_text: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    for m in _TOKEN_RE.finditer(user_text):
+        kind = m.lastgroup
+        if kind == "pct":
+            tokens.append(_Token("num", m.group("num"), pct=True))
+        elif kind == "punct":
+            if m.group() not in _IGNORED_PUNCT:
+                raise _NoMatch
+        elif kind is not None:
+            tokens.append(_Token(kind, m.group()))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[_Token]) -> None:
+        self.tokens = tokens
+        self.i = 0
+        self.tool: ToolName | None = None
+        self.tickers: list[str] = []
+        self.n_days: int | None = None
+        self.window: int | None = None
+        self.risk_free_rate: float | None = None
+        self.annualization_factor: int | None = None
+
+    def _peek(self, offset: int = 0) -> _Token | None:
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else None
+
+    def _words_at(self, phrase: tuple[str, ...]) -> bool:
+        for k, word in enumerate(phrase):
+            tok = self._peek(k)
+            if tok is None or tok.kind != "word" or tok.lower != word:
+                return False
+        return True
+
+    def _accept_word(self, words: frozenset[str]) -> bool:
+        tok = self._peek()
+        if tok is not None and tok.kind == "word" and tok.lower in words:
+            self.i += 1
+            return True
+        return False
+
+    def _number(self) -> _Token:
+        tok = self._peek()
+        if tok is None or tok.kind != "num":
+            raise _NoMatch
+        self.i += 1
+        return tok
+
+    def _int(self) -> int:
+        tok = self._number()
+        if tok.pct or "." in tok.text:
+            raise _NoMatch
+        return int(tok.text)
+
+    def _days(self) -> None:
+        # "<n> days" / "<n> trading days" / "<n>-day"
+        self._accept_word(_TRADING)
+        if not self._accept_word(_DAY_UNITS):
+            raise _NoMatch
+
+    def _set_n_days(self, value: int) -> None:
+        if self.n_days is not None:
+            raise _NoMatch
+        self.n_days = value
+
+    def _set_window(self, value: int) -> None:
+        if self.window is not None:
+            raise _NoMatch
+        self.window = value
+
+    def _count_with_unit(self) -> None:
+        # "<n> days" is the range, "<n> day window" / "<n> day rolling window"
+        # is the window
+        value = self._int()
+        self._days()
+        if self._phrase(_WINDOW_PHRASES):
+            self._set_window(value)
+        else:
+            self._set_n_days(value)
+
+    def _window_of(self) -> None:
+        # "window of <n> (days)"
+        self._accept_word(_ASSIGN)
+        self._set_window(self._int())
+        tok = self._peek()
+        if tok is not None and tok.kind == "word" and tok.lower in _DAY_WORDS:
+            self._days()
+
+    def _risk_free(self) -> None:
+        if self.risk_free_rate is not None:
+            raise _NoMatch
+        self._accept_word(_ASSIGN)
+        tok = self._number()
+        value = float(tok.text)
+        if tok.pct:
+            value /= 100.0
+        elif value >= 1.0:
+            # "5" could mean 5% or 500%: leave it to the LLM
+            raise _NoMatch
+        self.risk_free_rate = value
+
+    def _annualization(self) -> None:
+        if self.annualization_factor is not None:
+            raise _NoMatch
+        self._accept_word(_ASSIGN)
+        self.annualization_factor = self._int()
+
+    def _tool(self) -> bool:
+        for phrase in _TOOL_PHRASES:
+            if self._words_at(phrase):
+                tool = _TOOL_KEYWORDS[phrase]
+                if self.tool is not None and self.tool != tool:
+                    raise _NoMatch
+                self.tool = tool
+                self.i += len(phrase)
+                return True
+        return False
+
+    def _phrase(self, phrases: tuple[tuple[str, ...], ...]) -> bool:
+        for phrase in phrases:
+            if self._words_at(phrase):
+                self.i += len(phrase)
+                return True
+        return False
+
+    def parse(self) -> None:
+        while (tok := self._peek()) is not None:
+            if tok.kind == "num":
+                self._count_with_unit()
+            elif tok.kind == "ticker":
+                self.tickers.append(tok.text)
+                self.i += 1
+            elif tok.lower in _RANGE_ANCHORS:
+                self.i += 1
+                self._set_n_days(self._int())
+                self._days()
+            elif tok.lower == "window":
+                self.i += 1
+                self._window_of()
+            elif self._tool():
+                continue
+            elif self._phrase(_RISK_FREE_PHRASES):
+                self._risk_free()
+            elif self._phrase(_ANNUALIZATION_PHRASES):
+                self._annualization()
+            elif _is_bare_ticker(tok):
+                self.tickers.append(tok.text)
+                self.i += 1
+            elif tok.lower in _FILLER:
+                self.i += 1
+            else:
+                raise _NoMatch
+
+    def intent(self) -> Intent:
+        tool = self.tool
+        if tool is None or self.n_days is None or len(self.tickers) != 1:
+            raise _NoMatch
+        # mirror the router prompt: a window is required exactly for the window
+        # tools and a risk-free rate only makes sense for Sharpe
+        if (self.window is not None) != (tool in _WINDOW_TOOLS):
+            raise _NoMatch
+        if self.risk_free_rate is not None and tool not in _SHARPE_TOOLS:
+            raise _NoMatch
+
+        params: dict[str, int | float] = {}
+        if self.window is not None:
+            params["window"] = self.window
+        if self.annualization_factor is not None:
+            params["annualization_factor"] = self.annualization_factor
+        if self.risk_free_rate is not None:
+            params["risk_free_rate"] = self.risk_free_rate
+        try:
+            return Intent(
+                tool=tool,
+                tickers=self.tickers,
+                time_range=TimeRange(n_days=self.n_days),
+                params=Params.model_validate(params),
+            )
+        except ValidationError as e:
+            raise _NoMatch from e
+
+
+def parse_canonical(user_text: str) -> Intent | None:
+    """
+    Rule-based parse of the canonical query shapes, e.g.
+    "Compute realized volatility for MSFT over the last 90 days with a 20 day
+    window." Returns an Intent only when every token is accounted for and
+    nothing is ambiguous; otherwise None, and the caller falls through to the
+    LLM.
+    """
+    try:
+        parser = _Parser(_tokenize(user_text))
+        parser.parse()
+        return parser.intent()
+    except _NoMatch:
+        return None
+
+
+def prescan_ticker_range(user_text: str) -> tuple[str, int] | None:
+    """
+    Cheap guess at (ticker, n_days) for speculative prefetching: the only
+    ticker-looking token and the longest "<n> days" span that is not a window.
+    Unlike parse_canonical this never has to be right; a wrong guess only
+    wastes a fetch.
+    """
+    try:
+        tokens = _tokenize(user_text)
+    except _NoMatch:
+        return None
+
+    tickers = {t.text for t in tokens if t.kind == "ticker" or _is_bare_ticker(t)}
+    spans: list[int] = []
+    for k, tok in enumerate(tokens):
+        if tok.kind != "num" or tok.pct or "." in tok.text or int(tok.text) == 0:
+            continue
+        rest = [t.lower for t in tokens[k + 1 : k + 4]]
+        if rest[:1] == ["trading"]:
+            rest = rest[1:]
+        if rest[:1] and rest[0] in _DAY_UNITS and "window" not in rest[1:3]:
+            spans.append(int(tok.text))
+
+    if len(tickers) != 1 or not spans:
+        return None
+    return tickers.pop(), max(spans)
+
+
+class FastPathStats:
+    """Process-wide accept/fallthrough counters for debug logging."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.fell_through = 0
+
+    def record(self, accepted: bool) -> tuple[int, int]:
+        with self._lock:
+            if accepted:
+                self.accepted += 1
+            else:
+                self.fell_through += 1
+            return self.accepted, self.fell_through
+
+
+FAST_PATH_STATS = FastPathStats()
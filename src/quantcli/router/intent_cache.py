@@ -0,0 +1,175 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from quantcli.router.prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.llm_refusal import LLMRefusal
+
+CACHE_VERSION = 2
+
+CachedRoute = Intent | LLMRefusal
+
+
+def normalize_query(user_text: str) -> str:
+    return " ".join(user_text.split()).casefold()
+
+
+def prompt_fingerprint() -> str:
+    prompt = SYSTEM_PROMPT + "\x00" + USER_PROMPT_TEMPLATE
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class IntentCache:
+    """
+    Decoded router output (Intent or LLMRefusal) keyed on the normalized query,
+    the prompt fingerprint and the model name.
+
+    - In-memory LRU of max_entries, backed by one JSON file per key under
+      cache_dir (memory-only when cache_dir is None)
+    - Intents expire after ttl_s; the disk store holds at most
+      max_disk_entries files, evicting the oldest-written first
+    - LLM refusals can come from a non-deterministic completion, so they are
+      kept in memory only, for refusal_ttl_s, and never written to disk
+    - Changing the prompt or the model changes every key, so old entries are
+      simply never hit again
+    - Disk problems never fail routing; they degrade to a miss
+    """
+
+    model: str
+    cache_dir: str | os.PathLike[str] | None = None
+    max_entries: int = 256
+    ttl_s: float = 7 * 24 * 3600.0
+    refusal_ttl_s: float = 60.0
+    max_disk_entries: int = 4096
+    clock: Callable[[], float] = time.time
+    _entries: "OrderedDict[str, tuple[CachedRoute, float]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if self.ttl_s < 0 or self.refusal_ttl_s < 0:
+            raise ValueError("ttl_s and refusal_ttl_s must be >= 0")
+        if self.max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be >= 1")
+        self._dir = Path(self.cache_dir) if self.cache_dir is not None else None
+        self._fingerprint = prompt_fingerprint()
+
+    def key(self, user_text: str) -> str:
+        raw = f"{self._fingerprint}\x00{self.model}\x00{normalize_query(user_text)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, user_text: str) -> CachedRoute | None:
+        key = self.key(user_text)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], entry[1], now):
+                    self._entries.move_to_end(key)
+                    return entry[0].model_copy(deep=True)
+                del self._entries[key]
+
+        disk = self._read(key, now)
+        if disk is None:
+            return None
+        self._remember(key, *disk)
+        return disk[0].model_copy(deep=True)
+
+    def put(self, user_text: str, routed: CachedRoute) -> None:
+        key = self.key(user_text)
+        stored = routed.model_copy(deep=True)
+        stored_at = self.clock()
+        self._remember(key, stored, stored_at)
+        if isinstance(stored, Intent):
+            self._write(key, stored, stored_at)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, routed: CachedRoute, stored_at: float, now: float) -> bool:
+        ttl = self.ttl_s if isinstance(routed, Intent) else self.refusal_ttl_s
+        return now - stored_at > ttl
+
+    def _remember(self, key: str, routed: CachedRoute, stored_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (routed, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read(self, key: str, now: float) -> tuple[Intent, float] | None:
+        if self._dir is None:
+            return None
+        path = self._dir / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw: Any = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(raw, dict) or raw.get("version") != CACHE_VERSION:
+            return None
+        stored_at = raw.get("stored_at")
+        if not isinstance(stored_at, int | float) or now - stored_at > self.ttl_s:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+            return None
+        try:
+            return Intent.model_validate(raw.get("intent")), float(stored_at)
+        except ValidationError:
+            return None
+
+    def _write(self, key: str, routed: Intent, stored_at: float) -> None:
+        if self._dir is None:
+            return
+        payload = {
+            "version": CACHE_VERSION,
+            "stored_at": stored_at,
+            "intent": routed.model_dump(mode="json"),
+        }
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._dir, prefix=f".{key}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, separators=(",", ":"))
+                os.replace(tmp, self._dir / f"{key}.json")
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp)
+                raise
+            self._evict_disk(self._dir)
+        except OSError:
+            # fail closed: the routed value is still returned to the caller
+            pass
+
+    def _evict_disk(self, directory: Path) -> None:
+        """Drop the oldest-written files beyond max_disk_entries."""
+        files = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".json") and not entry.name.startswith("."):
+                with contextlib.suppress(OSError):
+                    files.append((entry.stat().st_mtime, entry.path))
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        for _, path in sorted(files)[:excess]:
+            with contextlib.suppress(OSError):
+                os.unlink(path)
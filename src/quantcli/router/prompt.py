@@ -39,11 +39,13 @@ SUPPORTED TOOLS (tool must be exactly one of):
 - "max_drawdown"
 - "realized_volatility"
 - "sharpe_ratio"
+- "rolling_volatility" (realized volatility at every date, not just the latest)
+- "rolling_sharpe_ratio" (Sharpe ratio at every date, not just the latest)
 
 INTENT CONSTRAINTS:
 - Exactly ONE ticker symbol must be explicitly provided.
 - time_range.n_days must be an explicit integer number of days.
-- For "realized_volatility" or "sharpe_ratio": user MUST explicitly specify "window"; otherwise refuse.
+- For "realized_volatility", "sharpe_ratio", "rolling_volatility" or "rolling_sharpe_ratio": user MUST explicitly specify "window"; otherwise refuse.
 - For all other tools: MUST NOT include "window" (if user specifies one anyway, refuse).
 
 PARAMS RULES:
@@ -52,7 +54,7 @@ PARAMS RULES:
 - Allowed params fields:
   - "window" (int)
   - "annualization_factor" (int or float)
-  - "risk_free_rate" (float) — only for "sharpe_ratio"
+  - "risk_free_rate" (float) — only for "sharpe_ratio" or "rolling_sharpe_ratio"
 - Do NOT include null fields.
 
 If the request is outside supported tools (predictions, advice, comparisons, portfolios, plotting, multi-asset),
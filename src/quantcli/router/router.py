@@ -1,37 +1,153 @@
 import time
 
 from quantcli.llm.errors import LLMError
-from quantcli.llm.llm_client import LLMClient
+from quantcli.llm.llm_client import AsyncLLMClient, LLMClient, StreamingLLMClient
+from quantcli.llm.streaming import read_top_level_object
 from quantcli.observability.debug import log_event
 from quantcli.refusals import INTERNAL_CODE_TO_USER_REASON, make_refusal
 from quantcli.router.decode import decode_llm_output
+from quantcli.router.fast_path import FAST_PATH_STATS, parse_canonical
+from quantcli.router.intent_cache import IntentCache
 from quantcli.router.prompt import build_messages
 from quantcli.schemas.intent import Intent
 from quantcli.schemas.llm_refusal import LLMRefusal
 from quantcli.schemas.refusal import Refusal
 
 
-def route_query(user_text: str, llm: LLMClient, cid: str) -> Intent | Refusal:
+def route_query(
+    user_text: str,
+    llm: LLMClient,
+    cid: str,
+    intent_cache: IntentCache | None = None,
+    fast_path: bool = False,
+) -> Intent | Refusal:
     user_text = user_text.strip()
     if user_text == "":
         log_event("route_reject", cid, reason="USER_QUERY_EMPTY")
         return make_refusal(reason="USER_QUERY_EMPTY")
 
+    if fast_path:
+        parsed = _fast_path(user_text, cid)
+        if parsed is not None:
+            return parsed
+
+    cached = _cache_lookup(intent_cache, user_text, cid)
+    if cached is not None:
+        return cached
+
     llm_prompts = build_messages(user_text)
     log_event("llm_call_start", cid, prompt_count=len(llm_prompts))
 
     t0 = time.perf_counter()
+    first_chunk_at: float | None = None
     try:
-        llm_output = llm.complete(llm_prompts)
+        if isinstance(llm, StreamingLLMClient):
+            # stop reading as soon as the top-level JSON object closes
+            streamed = read_top_level_object(llm.stream(llm_prompts))
+            llm_output, first_chunk_at = streamed.text, streamed.first_chunk_at
+        else:
+            llm_output = llm.complete(llm_prompts)
     except LLMError as e:
-        elapsed_ms = int((time.perf_counter() - t0) * 1000)
-        log_event("llm_fail", cid, elapsed_ms=elapsed_ms, kind=e.kind)
-        return make_refusal(reason="Unable to process this request right now.")
+        return _llm_failure(e, t0, cid)
+    return _decode_routed(
+        llm_output, t0, cid, user_text, intent_cache, first_chunk_at=first_chunk_at
+    )
+
+
+async def route_query_async(
+    user_text: str,
+    llm: AsyncLLMClient,
+    cid: str,
+    intent_cache: IntentCache | None = None,
+    fast_path: bool = False,
+) -> Intent | Refusal:
+    user_text = user_text.strip()
+    if user_text == "":
+        log_event("route_reject", cid, reason="USER_QUERY_EMPTY")
+        return make_refusal(reason="USER_QUERY_EMPTY")
+
+    if fast_path:
+        parsed = _fast_path(user_text, cid)
+        if parsed is not None:
+            return parsed
+
+    cached = _cache_lookup(intent_cache, user_text, cid)
+    if cached is not None:
+        return cached
+
+    llm_prompts = build_messages(user_text)
+    log_event("llm_call_start", cid, prompt_count=len(llm_prompts))
+
+    t0 = time.perf_counter()
+    try:
+        llm_output = await llm.complete(llm_prompts)
+    except LLMError as e:
+        return _llm_failure(e, t0, cid)
+    return _decode_routed(llm_output, t0, cid, user_text, intent_cache)
+
+
+def _llm_failure(e: LLMError, t0: float, cid: str) -> Refusal:
     elapsed_ms = int((time.perf_counter() - t0) * 1000)
-    log_event("llm_call_end", cid, elapsed_ms=elapsed_ms, output_len=len(llm_output))
+    log_event("llm_fail", cid, elapsed_ms=elapsed_ms, kind=e.kind)
+    return make_refusal(reason="Unable to process this request right now.")
+
+
+def _fast_path(user_text: str, cid: str) -> Intent | None:
+    t0 = time.perf_counter()
+    parsed = parse_canonical(user_text)
+    elapsed_us = int((time.perf_counter() - t0) * 1_000_000)
+    accepted, fell_through = FAST_PATH_STATS.record(parsed is not None)
+    log_event(
+        "fast_path_accept" if parsed is not None else "fast_path_fallthrough",
+        cid,
+        elapsed_us=elapsed_us,
+        accepted_total=accepted,
+        fallthrough_total=fell_through,
+    )
+    if parsed is not None:
+        log_event("intent_routed", cid, tool=parsed.tool.value, path="fast_path")
+    return parsed
+
+
+def _cache_lookup(
+    intent_cache: IntentCache | None, user_text: str, cid: str
+) -> Intent | Refusal | None:
+    if intent_cache is None:
+        return None
+    cached = intent_cache.get(user_text)
+    if cached is None:
+        log_event("intent_cache_miss", cid)
+        return None
+    log_event("intent_cache_hit", cid, model=intent_cache.model)
+    return _route_decoded(cached, cid)
+
+
+def _decode_routed(
+    llm_output: str,
+    t0: float,
+    cid: str,
+    user_text: str,
+    intent_cache: IntentCache | None,
+    first_chunk_at: float | None = None,
+) -> Intent | Refusal:
+    timings = {"elapsed_ms": int((time.perf_counter() - t0) * 1000)}
+    if first_chunk_at is not None:
+        timings["ttft_ms"] = int((first_chunk_at - t0) * 1000)
+    log_event("llm_call_end", cid, output_len=len(llm_output), **timings)
 
     decoded_output = decode_llm_output(llm_output)
 
+    # decoder rejects are not cached: they point at a flaky completion, and a
+    # retry may well decode
+    if intent_cache is not None and isinstance(decoded_output, Intent | LLMRefusal):
+        intent_cache.put(user_text, decoded_output)
+
+    return _route_decoded(decoded_output, cid)
+
+
+def _route_decoded(
+    decoded_output: Intent | LLMRefusal | Refusal, cid: str
+) -> Intent | Refusal:
     if isinstance(decoded_output, LLMRefusal):
         log_event("llm_refusal", cid)
         return make_refusal(reason=decoded_output.reason)
@@ -1,19 +1,134 @@
 import os
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from quantcli.llm.anthropic_client import AnthropicLLMClient
+from quantcli.llm.llm_client import LLMClient
+
+# Imported by the entry point before argument parsing, so it stays light: each
+# factory imports what it builds (numpy, pydantic, SDKs) when it is called.
+if TYPE_CHECKING:
+    from quantcli.data.price_provider import PriceProvider
+    from quantcli.llm.anthropic_client import AnthropicLLMClient
+    from quantcli.result_cache import ResultCache
+    from quantcli.router.intent_cache import IntentCache
+
+PRICE_CACHE_ENV = "QUANTCLI_PRICE_CACHE"
+PRICE_CACHE_DIR_ENV = "QUANTCLI_PRICE_CACHE_DIR"
+PRICE_CACHE_TTL_ENV = "QUANTCLI_PRICE_CACHE_TTL_S"
+PRICE_CACHE_MAX_BYTES_ENV = "QUANTCLI_PRICE_CACHE_MAX_BYTES"
+INTENT_CACHE_ENV = "QUANTCLI_INTENT_CACHE"
+INTENT_CACHE_DIR_ENV = "QUANTCLI_INTENT_CACHE_DIR"
+INTENT_CACHE_TTL_ENV = "QUANTCLI_INTENT_CACHE_TTL_S"
+INTENT_CACHE_MAX_ENTRIES_ENV = "QUANTCLI_INTENT_CACHE_MAX_ENTRIES"
+FAST_PATH_ENV = "QUANTCLI_FAST_PATH"
+SPECULATIVE_PREFETCH_ENV = "QUANTCLI_SPECULATIVE_PREFETCH"
+RESULT_CACHE_ENV = "QUANTCLI_RESULT_CACHE"
 
 
 class ConfigError(Exception):
     pass
 
 
-def anthropic_client_from_env() -> AnthropicLLMClient:
+def anthropic_client_from_env() -> "AnthropicLLMClient":
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ConfigError("LLM authentication failed.")
+    from quantcli.llm.anthropic_client import AnthropicLLMClient
+
     anthropic_model = os.getenv("QUANTCLI_ANTHROPIC_MODEL")
     return (
         AnthropicLLMClient(api_key=api_key, model=anthropic_model)
         if anthropic_model
         else AnthropicLLMClient(api_key=api_key)
     )
+
+
+def _default_cache_dir(name: str) -> Path:
+    base = os.getenv("XDG_CACHE_HOME", "").strip()
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "quantcli" / name
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError as e:
+        raise ConfigError(f"{name} must be a number.") from e
+    if value < 0:
+        raise ConfigError(f"{name} must be >= 0.")
+    return value
+
+
+def price_provider_from_env() -> "PriceProvider":
+    """
+    yfinance provider behind the on-disk price cache.
+    - Cache on by default (QUANTCLI_PRICE_CACHE=0 to disable)
+    - QUANTCLI_PRICE_CACHE_DIR overrides the cache location
+    - QUANTCLI_PRICE_CACHE_TTL_S / QUANTCLI_PRICE_CACHE_MAX_BYTES tune freshness
+      and size
+    - Concurrent identical fetches (batch mode, the daemon) are coalesced into
+      one, in front of the cache
+    """
+    from quantcli.data.cached_price_provider import CachedPriceProvider
+    from quantcli.data.single_flight_price_provider import SingleFlightPriceProvider
+    from quantcli.data.yfinance_price_provider import YFinancePriceProvider
+
+    provider: PriceProvider = YFinancePriceProvider()
+    if os.getenv(PRICE_CACHE_ENV, "").strip() != "0":
+        cache_dir = os.getenv(PRICE_CACHE_DIR_ENV, "").strip() or _default_cache_dir(
+            "prices"
+        )
+        provider = CachedPriceProvider(
+            inner=provider,
+            cache_dir=cache_dir,
+            ttl_s=_env_number(PRICE_CACHE_TTL_ENV, 900.0),
+            max_bytes=int(_env_number(PRICE_CACHE_MAX_BYTES_ENV, 64 * 1024 * 1024)),
+        )
+    return SingleFlightPriceProvider(provider)
+
+
+def intent_cache_from_env(llm_client: LLMClient) -> "IntentCache | None":
+    """
+    On-disk intent cache for the given LLM client.
+    - On by default (QUANTCLI_INTENT_CACHE=0 to disable)
+    - QUANTCLI_INTENT_CACHE_DIR overrides the cache location
+    - QUANTCLI_INTENT_CACHE_TTL_S / QUANTCLI_INTENT_CACHE_MAX_ENTRIES tune
+      freshness and the number of entries kept on disk
+    """
+    if os.getenv(INTENT_CACHE_ENV, "").strip() == "0":
+        return None
+    from quantcli.router.intent_cache import IntentCache
+
+    model = getattr(llm_client, "model", None) or type(llm_client).__name__
+    cache_dir = os.getenv(INTENT_CACHE_DIR_ENV, "").strip() or _default_cache_dir(
+        "intents"
+    )
+    return IntentCache(
+        model=str(model),
+        cache_dir=cache_dir,
+        ttl_s=_env_number(INTENT_CACHE_TTL_ENV, 7 * 24 * 3600.0),
+        max_disk_entries=max(int(_env_number(INTENT_CACHE_MAX_ENTRIES_ENV, 4096)), 1),
+    )
+
+
+def fast_path_from_env() -> bool:
+    """Rule-based routing of canonical queries; on unless QUANTCLI_FAST_PATH=0."""
+    return os.getenv(FAST_PATH_ENV, "").strip() != "0"
+
+
+def speculative_prefetch_from_env() -> bool:
+    """Prefetch the guessed ticker during routing; opt-in with
+    QUANTCLI_SPECULATIVE_PREFETCH=1."""
+    return os.getenv(SPECULATIVE_PREFETCH_ENV, "").strip() == "1"
+
+
+def result_cache_from_env() -> "ResultCache | None":
+    """In-memory computed-result cache; on unless QUANTCLI_RESULT_CACHE=0."""
+    if os.getenv(RESULT_CACHE_ENV, "").strip() == "0":
+        return None
+    from quantcli.result_cache import ResultCache
+
+    return ResultCache()
@@ -0,0 +1,17 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+
+
+class MultiResult(BaseModel):
+    tickers: list[str] = Field(min_length=1)
+    results: list[Result | Refusal] = Field(
+        description="per-metric Result or Refusal, in request order"
+    )
+    metadata: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Metadata shared by every metric, such as the price source.",
+    )
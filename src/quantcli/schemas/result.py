@@ -8,7 +8,12 @@ from quantcli.schemas.tool_name import ToolName
 class Result(BaseModel):
     tool: ToolName
     tickers: list[str] = Field(min_length=1)
-    value: float = Field(description="computed metric value")
+    value: float | list[float] = Field(
+        description=(
+            "computed metric value; rolling metrics return one value per window, "
+            "oldest->newest"
+        )
+    )
     metadata: dict[str, Any] = Field(
         default_factory=dict,
         description=(
@@ -6,3 +6,5 @@ class ToolName(StrEnum):
     realized_volatility = "realized_volatility"
     total_return = "total_return"
     sharpe_ratio = "sharpe_ratio"
+    rolling_volatility = "rolling_volatility"
+    rolling_sharpe_ratio = "rolling_sharpe_ratio"
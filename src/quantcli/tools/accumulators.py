@@ -0,0 +1,265 @@
+import math
+import sys
+from collections import deque
+from typing import Protocol
+
+from quantcli.schemas.params import Params
+from quantcli.tools.metrics import FLAT_TOL
+
+
+class MetricAccumulator(Protocol):
+    """
+    Stateful, append-only counterpart of a metric kernel.
+
+    push() appends the newest price and evict() drops the oldest one; value()
+    returns what the batch kernel would return for the prices currently held
+    (up to floating-point rounding), raising ValueError in the same situations.
+    """
+
+    def push(self, price: float) -> None: ...
+
+    def evict(self) -> None: ...
+
+    def value(self) -> float: ...
+
+    def __len__(self) -> int: ...
+
+
+def _validate_price(price: float) -> float:
+    p = float(price)
+    if not math.isfinite(p):
+        raise ValueError("price must be a finite value (no NaN/inf).")
+    if p <= 0:
+        raise ValueError("price must be strictly positive.")
+    return p
+
+
+def _validate_maxlen(maxlen: int | None, minimum: int) -> None:
+    if maxlen is not None and maxlen < minimum:
+        raise ValueError(f"maxlen must be at least {minimum}.")
+
+
+class TotalReturnAccumulator:
+    """Total return from the first and last held price. push/evict are O(1)."""
+
+    def __init__(self, params: Params, maxlen: int | None = None) -> None:
+        if params.window is not None:
+            raise ValueError("Window is not supported for total_return.")
+        _validate_maxlen(maxlen, 2)
+        self._prices: deque[float] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def push(self, price: float) -> None:
+        self._prices.append(_validate_price(price))
+
+    def evict(self) -> None:
+        if not self._prices:
+            raise ValueError("No prices to evict.")
+        self._prices.popleft()
+
+    def value(self) -> float:
+        if len(self._prices) < 2:
+            raise ValueError(
+                "At least two price points are required to compute total return."
+            )
+        first = self._prices[0]
+        return (self._prices[-1] - first) / first
+
+
+class MaxDrawdownAccumulator:
+    """
+    Running peak plus max drawdown. push is O(1).
+
+    evict is O(1); when the evicted price was above its successor it invalidates
+    the running state, and the next value() rebuilds it in one O(n) pass over
+    the held prices, after which pushes are O(1) again.
+    """
+
+    def __init__(self, params: Params, maxlen: int | None = None) -> None:
+        if params.window is not None:
+            raise ValueError("Window is not supported for max_drawdown.")
+        _validate_maxlen(maxlen, 2)
+        self._maxlen = maxlen
+        self._prices: deque[float] = deque()
+        self._peak = 0.0
+        self._max_dd = 0.0
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def _update(self, price: float) -> None:
+        if price > self._peak:
+            self._peak = price
+        dd = (self._peak - price) / self._peak
+        if dd > self._max_dd:
+            self._max_dd = dd
+
+    def _rebuild(self) -> None:
+        self._peak = 0.0
+        self._max_dd = 0.0
+        for p in self._prices:
+            self._update(p)
+        self._stale = False
+
+    def push(self, price: float) -> None:
+        p = _validate_price(price)
+        if self._maxlen is not None and len(self._prices) == self._maxlen:
+            self.evict()
+        self._prices.append(p)
+        if not self._stale:
+            self._update(p)
+
+    def evict(self) -> None:
+        if not self._prices:
+            raise ValueError("No prices to evict.")
+        evicted = self._prices.popleft()
+        # Every drawdown is measured from a running peak. If the evicted price
+        # did not exceed its successor it never set a peak on its own, so the
+        # running state is still exact; otherwise it must be rebuilt.
+        if not self._prices or evicted > self._prices[0]:
+            self._stale = True
+
+    def value(self) -> float:
+        if len(self._prices) < 2:
+            raise ValueError(
+                "At least two price points are required to compute max drawdown."
+            )
+        if self._stale:
+            self._rebuild()
+        return self._max_dd
+
+
+_REFINE = 1e4  # headroom over the downdating roundoff bound
+
+
+def _is_step(prev: float, r: float) -> bool:
+    return abs(r - prev) > FLAT_TOL * max(abs(r), 1.0)
+
+
+class _WindowedLogReturns:
+    """
+    Welford mean/variance over the last `window` log returns of the held prices,
+    plus a count of the return steps in the window (metrics.return_steps), so
+    zero volatility is detected by the same rule as the array kernels.
+    push and evict are O(1). Downdating leaves an absolute roundoff of about
+    eps times the largest m2 seen, so a window that has gone much quieter than
+    that is recomputed exactly from the held returns (O(window), only then).
+    """
+
+    def __init__(self, params: Params, maxlen: int | None, metric_label: str) -> None:
+        af = params.annualization_factor
+        if not math.isfinite(af) or af <= 0:
+            raise ValueError("annualization_factor must be a positive finite number.")
+
+        window = params.window
+        if window is None:
+            raise ValueError(f"Window must be provided for {metric_label}.")
+        if window < 2:
+            raise ValueError(
+                "Window must be at least 2 to compute sample std (ddof=1)."
+            )
+        _validate_maxlen(maxlen, window + 1)
+
+        self._metric_label = metric_label
+        self._window = window
+        self._af = float(af)
+        self._prices: deque[float] = deque(maxlen=maxlen)
+        self._returns: deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._steps = 0
+        self._m2_peak = 0.0
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def _add(self, r: float) -> None:
+        if self._returns:
+            self._steps += _is_step(self._returns[-1], r)
+        self._returns.append(r)
+        n = len(self._returns)
+        delta = r - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (r - self._mean)
+        self._m2_peak = max(self._m2_peak, self._m2)
+
+    def _remove_oldest(self) -> None:
+        r = self._returns.popleft()
+        n = len(self._returns)
+        if n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            self._m2_peak = 0.0
+            self._steps = 0
+            return
+        self._steps -= _is_step(r, self._returns[0])
+        delta = r - self._mean
+        self._mean -= delta / n
+        self._m2 -= delta * (r - self._mean)
+        if self._m2 < 0.0:
+            self._m2 = 0.0
+
+    def push(self, price: float) -> None:
+        p = _validate_price(price)
+        if self._prices.maxlen is not None and len(self._prices) == self._prices.maxlen:
+            self.evict()
+        if self._prices:
+            if len(self._returns) == self._window:
+                self._remove_oldest()
+            self._add(math.log(p / self._prices[-1]))
+        self._prices.append(p)
+
+    def evict(self) -> None:
+        if not self._prices:
+            raise ValueError("No prices to evict.")
+        self._prices.popleft()
+        # the return out of the evicted price is only tracked while the held
+        # prices are no longer than window + 1
+        if len(self._returns) > len(self._prices) - 1:
+            self._remove_oldest()
+
+    def _mean_std(self) -> tuple[float, float]:
+        window = self._window
+        if len(self._prices) < window + 1:
+            raise ValueError(
+                f"At least {window + 1} price points are required to compute "
+                f"{self._metric_label} with window={window}."
+            )
+        if self._m2 < _REFINE * sys.float_info.epsilon * self._m2_peak:
+            n = len(self._returns)
+            self._mean = math.fsum(self._returns) / n
+            self._m2 = math.fsum((r - self._mean) ** 2 for r in self._returns)
+            self._m2_peak = self._m2
+        std = math.sqrt(self._m2 / (window - 1))
+        if not math.isfinite(std):
+            raise ValueError("Computed volatility is not finite.")
+        return self._mean, std
+
+
+class RealizedVolatilityAccumulator(_WindowedLogReturns):
+    def __init__(self, params: Params, maxlen: int | None = None) -> None:
+        super().__init__(params, maxlen, "realized volatility")
+
+    def value(self) -> float:
+        _, std = self._mean_std()
+        return std * math.sqrt(self._af)
+
+
+class SharpeRatioAccumulator(_WindowedLogReturns):
+    def __init__(self, params: Params, maxlen: int | None = None) -> None:
+        super().__init__(params, maxlen, "Sharpe ratio")
+        rf_annual = params.risk_free_rate
+        if not math.isfinite(rf_annual):
+            raise ValueError("risk_free_rate must be a finite number.")
+        self._rf_daily = float(rf_annual) / self._af
+
+    def value(self) -> float:
+        mean, std = self._mean_std()
+        # subtracting a constant shifts the mean but leaves the std unchanged
+        mean_excess = mean - self._rf_daily
+        if std <= 0.0 or self._steps == 0:
+            raise ValueError("Volatility is zero, Sharpe ratio is undefined.")
+        return (mean_excess / std) * math.sqrt(self._af)
@@ -0,0 +1,177 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.schemas.params import Params
+from quantcli.tools.metrics import return_steps
+
+
+def _validate_price_matrix(
+    prices: NDArray[np.float64],
+    lengths: NDArray[np.int64] | None,
+    min_points: int,
+) -> tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.bool_]]:
+    """
+    Enforce the numeric contract for batched metric kernels:
+    - 2-D numpy array of shape (n_tickers, n_days), oldest->newest per row
+    - rows are right-aligned: row i holds its lengths[i] most recent prices in the
+      last lengths[i] columns; leading padding columns are ignored
+    - lengths is a 1-D integer vector with 0 <= lengths[i] <= n_days
+      (None means every row is full length)
+
+    Returns a sanitized float64 matrix, the lengths vector and a per-row mask of
+    rows that can be computed. A row is unusable when it has fewer than
+    min_points prices or any non-finite / non-positive price in its valid region.
+    Unusable rows are filled with 1.0 so downstream reductions stay warning-free.
+    """
+    if not isinstance(prices, np.ndarray):
+        raise TypeError("prices must be a numpy ndarray.")
+    if prices.ndim != 2:
+        raise ValueError("prices must be a 2-D array of shape (n_tickers, n_days).")
+
+    if prices.dtype != np.float64:
+        prices = prices.astype(np.float64, copy=False)
+
+    n_tickers, n_days = prices.shape
+
+    if lengths is None:
+        row_lengths = np.full(n_tickers, n_days, dtype=np.int64)
+    else:
+        if not isinstance(lengths, np.ndarray):
+            raise TypeError("lengths must be a numpy ndarray.")
+        if lengths.shape != (n_tickers,):
+            raise ValueError("lengths must be a 1-D array with one entry per row.")
+        if not np.issubdtype(lengths.dtype, np.integer):
+            raise ValueError("lengths must be an integer array.")
+        row_lengths = lengths.astype(np.int64, copy=False)
+        if np.any(row_lengths < 0) or np.any(row_lengths > n_days):
+            raise ValueError("lengths must be within [0, n_days].")
+
+    starts = n_days - row_lengths
+    valid = np.arange(n_days)[None, :] >= starts[:, None]
+
+    bad_points = valid & ~(np.isfinite(prices) & (prices > 0))
+    ok = (row_lengths >= min_points) & ~bad_points.any(axis=1)
+
+    if n_days == 0:
+        return prices, row_lengths, ok
+
+    # Replace the padding region with each row's first valid price so that
+    # cumulative/peak reductions over the full row are unaffected by it.
+    first = prices[np.arange(n_tickers), np.minimum(starts, n_days - 1)]
+    safe = np.where(valid, prices, first[:, None])
+    safe = np.where(ok[:, None], safe, 1.0)
+
+    return safe, row_lengths, ok
+
+
+def _validate_window_params(params: Params, metric_label: str) -> int:
+    if not np.isfinite(params.annualization_factor) or params.annualization_factor <= 0:
+        raise ValueError("annualization_factor must be a positive finite number.")
+
+    window = params.window
+    if window is None:
+        raise ValueError(f"Window must be provided for {metric_label}.")
+    if window < 2:
+        raise ValueError("Window must be at least 2 to compute sample std (ddof=1).")
+    return window
+
+
+def _window_log_returns(
+    safe_prices: NDArray[np.float64], window: int
+) -> NDArray[np.float64]:
+    # Only the last window+1 columns contribute to the last window log returns.
+    tail = safe_prices[:, -(window + 1) :]
+    return np.asarray(np.log(tail[:, 1:] / tail[:, :-1]), dtype=np.float64)
+
+
+def total_return_batch(
+    prices: NDArray[np.float64], lengths: NDArray[np.int64] | None, params: Params
+) -> NDArray[np.float64]:
+    """
+    Row-wise total return of a (n_tickers, n_days) price matrix.
+    Rows that cannot be computed are NaN.
+    """
+
+    if params.window is not None:
+        raise ValueError("Window is not supported for total_return.")
+
+    safe, _, ok = _validate_price_matrix(prices, lengths, min_points=2)
+    if safe.shape[1] == 0:
+        return np.full(safe.shape[0], np.nan, dtype=np.float64)
+
+    # padding columns already hold each row's first valid price
+    first = safe[:, 0]
+    last = safe[:, -1]
+    out = (last - first) / first
+    return np.where(ok, out, np.nan)
+
+
+def max_drawdown_batch(
+    prices: NDArray[np.float64], lengths: NDArray[np.int64] | None, params: Params
+) -> NDArray[np.float64]:
+    """
+    Row-wise maximum peak-to-trough drawdown of a (n_tickers, n_days) price matrix,
+    in [0, 1]. Rows that cannot be computed are NaN.
+    """
+
+    if params.window is not None:
+        raise ValueError("Window is not supported for max_drawdown.")
+
+    safe, _, ok = _validate_price_matrix(prices, lengths, min_points=2)
+    if safe.shape[1] == 0:
+        return np.full(safe.shape[0], np.nan, dtype=np.float64)
+
+    cumulative_max = np.maximum.accumulate(safe, axis=1)
+    drawdown = (cumulative_max - safe) / cumulative_max
+    return np.where(ok, np.max(drawdown, axis=1), np.nan)
+
+
+def realized_volatility_batch(
+    prices: NDArray[np.float64], lengths: NDArray[np.int64] | None, params: Params
+) -> NDArray[np.float64]:
+    """
+    Row-wise annualized realized volatility over the last `window` log returns of
+    a (n_tickers, n_days) price matrix. Rows that cannot be computed are NaN.
+    """
+
+    window = _validate_window_params(params, "realized volatility")
+    safe, _, ok = _validate_price_matrix(prices, lengths, min_points=window + 1)
+    if safe.shape[1] < window + 1:
+        return np.full(safe.shape[0], np.nan, dtype=np.float64)
+
+    window_returns = _window_log_returns(safe, window)
+    vol = np.std(window_returns, axis=1, ddof=1)
+    ok = ok & np.isfinite(vol)
+    return np.where(ok, vol * float(np.sqrt(params.annualization_factor)), np.nan)
+
+
+def sharpe_ratio_batch(
+    prices: NDArray[np.float64], lengths: NDArray[np.int64] | None, params: Params
+) -> NDArray[np.float64]:
+    """
+    Row-wise annualized Sharpe ratio over the last `window` log returns of a
+    (n_tickers, n_days) price matrix. Rows that cannot be computed (including
+    zero volatility, by the rule sharpe_ratio uses) are NaN.
+    """
+
+    af = params.annualization_factor
+    window = _validate_window_params(params, "Sharpe ratio")
+
+    rf_annual = params.risk_free_rate
+    if not np.isfinite(rf_annual):
+        raise ValueError("risk_free_rate must be a finite number.")
+    rf_daily = float(rf_annual) / float(af)
+
+    safe, _, ok = _validate_price_matrix(prices, lengths, min_points=window + 1)
+    if safe.shape[1] < window + 1:
+        return np.full(safe.shape[0], np.nan, dtype=np.float64)
+
+    window_returns = _window_log_returns(safe, window)
+    excess = window_returns - rf_daily
+    mean_excess = np.mean(excess, axis=1)
+    vol = np.std(excess, axis=1, ddof=1)
+
+    ok = ok & np.isfinite(mean_excess) & np.isfinite(vol)
+    ok = ok & (vol > 0.0) & return_steps(window_returns).any(axis=1)
+    safe_vol = np.where(ok, vol, 1.0)
+    return np.where(ok, (mean_excess / safe_vol) * float(np.sqrt(af)), np.nan)
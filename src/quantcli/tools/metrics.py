@@ -1,8 +1,24 @@
+from functools import cached_property
+
 import numpy as np
 from numpy.typing import NDArray
 
 from quantcli.schemas.params import Params
 
+# The zero-volatility rule every Sharpe kernel shares: a window is flat when
+# each log return equals its neighbour to within FLAT_TOL (relative, floored
+# at 1). Log returns of rounded prices carry about this much noise even when
+# the true return is constant, so no absolute volatility cutoff is needed,
+# and genuine low-volatility series are never rejected as flat.
+FLAT_TOL = 16 * float(np.finfo(np.float64).eps)
+
+
+def return_steps(log_returns: NDArray[np.float64]) -> NDArray[np.bool_]:
+    """Along the last axis, True where a log return differs from the previous
+    one by more than FLAT_TOL; a window with no steps has zero volatility."""
+    prev, cur = log_returns[..., :-1], log_returns[..., 1:]
+    return np.asarray(np.abs(cur - prev) > FLAT_TOL * np.maximum(np.abs(cur), 1.0))
+
 
 def _validate_prices(prices: NDArray[np.float64]) -> NDArray[np.float64]:
     """
@@ -25,12 +41,45 @@ def _validate_prices(prices: NDArray[np.float64]) -> NDArray[np.float64]:
     return prices
 
 
+class PreparedPrices:
+    """
+    Validated prices plus the intermediates shared by the metric kernels.
+
+    Validation runs once on construction; positivity, log returns and the
+    cumulative max are each computed at most once, on first use, so several
+    kernels evaluated over the same series share the work.
+    """
+
+    def __init__(self, prices: NDArray[np.float64]) -> None:
+        self.prices = _validate_prices(prices)
+
+    @property
+    def size(self) -> int:
+        return int(self.prices.size)
+
+    @cached_property
+    def all_positive(self) -> bool:
+        return bool(np.all(self.prices > 0))
+
+    @cached_property
+    def log_returns(self) -> NDArray[np.float64]:
+        # length = prices.size - 1; callers check all_positive first
+        return np.asarray(np.log(self.prices[1:] / self.prices[:-1]), np.float64)
+
+    @cached_property
+    def cumulative_max(self) -> NDArray[np.float64]:
+        return np.asarray(np.maximum.accumulate(self.prices), np.float64)
+
+
 def total_return(prices: NDArray[np.float64], params: Params) -> float:
     """
     Total return of a price series, where 0.1 corresponds to a 10% total return.
     """
+    return total_return_prepared(PreparedPrices(prices), params)
+
 
-    validated_prices = _validate_prices(prices)
+def total_return_prepared(prepared: PreparedPrices, params: Params) -> float:
+    validated_prices = prepared.prices
 
     if params.window is not None:
         raise ValueError("Window is not supported for total_return.")
@@ -40,7 +89,7 @@ def total_return(prices: NDArray[np.float64], params: Params) -> float:
             "At least two price points are required to compute total return."
         )
 
-    if np.any(validated_prices <= 0):
+    if not prepared.all_positive:
         raise ValueError("Prices must be strictly positive to compute total return.")
 
     return float((validated_prices[-1] - validated_prices[0]) / validated_prices[0])
@@ -50,8 +99,11 @@ def max_drawdown(prices: NDArray[np.float64], params: Params) -> float:
     """
     Maximum peak-to-trough drawdown of a price series, in [0, 1].
     """
+    return max_drawdown_prepared(PreparedPrices(prices), params)
 
-    validated_prices = _validate_prices(prices)
+
+def max_drawdown_prepared(prepared: PreparedPrices, params: Params) -> float:
+    validated_prices = prepared.prices
 
     if params.window is not None:
         raise ValueError("Window is not supported for max_drawdown.")
@@ -61,10 +113,10 @@ def max_drawdown(prices: NDArray[np.float64], params: Params) -> float:
             "At least two price points are required to compute max drawdown."
         )
 
-    if np.any(validated_prices <= 0):
+    if not prepared.all_positive:
         raise ValueError("Prices must be strictly positive to compute drawdown.")
 
-    cumulative_max = np.maximum.accumulate(validated_prices)
+    cumulative_max = prepared.cumulative_max
     drawdown = (cumulative_max - validated_prices) / cumulative_max
     return float(np.max(drawdown))
 
@@ -74,8 +126,11 @@ def realized_volatility(prices: NDArray[np.float64], params: Params) -> float:
     Annualized realized volatility computed as the sample std (ddof=1) of log returns
     over the specified window, scaled by sqrt(annualization_factor).
     """
+    return realized_volatility_prepared(PreparedPrices(prices), params)
+
 
-    validated_prices = _validate_prices(prices)
+def realized_volatility_prepared(prepared: PreparedPrices, params: Params) -> float:
+    validated_prices = prepared.prices
 
     if not np.isfinite(params.annualization_factor) or params.annualization_factor <= 0:
         raise ValueError("annualization_factor must be a positive finite number.")
@@ -86,7 +141,7 @@ def realized_volatility(prices: NDArray[np.float64], params: Params) -> float:
     if window < 2:
         raise ValueError("Window must be at least 2 to compute sample std (ddof=1).")
 
-    if np.any(validated_prices <= 0):
+    if not prepared.all_positive:
         raise ValueError("Prices must be strictly positive to compute log returns.")
 
     # Need at least window+1 prices to compute window log returns
@@ -96,9 +151,7 @@ def realized_volatility(prices: NDArray[np.float64], params: Params) -> float:
             f"volatility with window={window}."
         )
 
-    log_returns = np.log(
-        validated_prices[1:] / validated_prices[:-1]
-    )  # length = validated_prices.size - 1
+    log_returns = prepared.log_returns  # length = validated_prices.size - 1
     window_returns = log_returns[-window:]
 
     vol = float(np.std(window_returns, ddof=1))
@@ -108,7 +161,11 @@ def realized_volatility(prices: NDArray[np.float64], params: Params) -> float:
 
 
 def sharpe_ratio(prices: NDArray[np.float64], params: Params) -> float:
-    validated_prices = _validate_prices(prices)
+    return sharpe_ratio_prepared(PreparedPrices(prices), params)
+
+
+def sharpe_ratio_prepared(prepared: PreparedPrices, params: Params) -> float:
+    validated_prices = prepared.prices
 
     af = params.annualization_factor
     if not np.isfinite(af) or af <= 0:
@@ -120,7 +177,7 @@ def sharpe_ratio(prices: NDArray[np.float64], params: Params) -> float:
     if window < 2:
         raise ValueError("Window must be at least 2 to compute sample std (ddof=1).")
 
-    if np.any(validated_prices <= 0):
+    if not prepared.all_positive:
         raise ValueError("Prices must be strictly positive to compute log returns.")
 
     if validated_prices.size < window + 1:
@@ -135,7 +192,7 @@ def sharpe_ratio(prices: NDArray[np.float64], params: Params) -> float:
         raise ValueError("risk_free_rate must be a finite number.")
     rf_daily = float(rf_annual) / float(af)
 
-    log_returns = np.log(validated_prices[1:] / validated_prices[:-1])
+    log_returns = prepared.log_returns
     window_returns = log_returns[-window:]
 
     excess = window_returns - rf_daily
@@ -146,7 +203,7 @@ def sharpe_ratio(prices: NDArray[np.float64], params: Params) -> float:
     vol = float(np.std(excess, ddof=1))
     if not np.isfinite(vol):
         raise ValueError("Computed volatility is not finite.")
-    if vol <= 0.0 or np.isclose(vol, 0.0):
+    if vol <= 0.0 or not return_steps(window_returns).any():
         raise ValueError("Volatility is zero, Sharpe ratio is undefined.")
 
     return (mean_excess / vol) * float(np.sqrt(af))
@@ -5,14 +5,43 @@ from numpy.typing import NDArray
 
 from quantcli.schemas.params import Params
 from quantcli.schemas.tool_name import ToolName
+from quantcli.tools.accumulators import (
+    MaxDrawdownAccumulator,
+    MetricAccumulator,
+    RealizedVolatilityAccumulator,
+    SharpeRatioAccumulator,
+    TotalReturnAccumulator,
+)
+from quantcli.tools.batch_metrics import (
+    max_drawdown_batch,
+    realized_volatility_batch,
+    sharpe_ratio_batch,
+    total_return_batch,
+)
 from quantcli.tools.metrics import (
+    PreparedPrices,
     max_drawdown,
+    max_drawdown_prepared,
     realized_volatility,
+    realized_volatility_prepared,
     sharpe_ratio,
+    sharpe_ratio_prepared,
     total_return,
+    total_return_prepared,
+)
+from quantcli.tools.rolling_metrics import (
+    rolling_sharpe_ratio,
+    rolling_sharpe_ratio_prepared,
+    rolling_volatility,
+    rolling_volatility_prepared,
 )
 
-MetricFn = Callable[[NDArray[np.float64], Params], float]
+# Point metrics return a float; rolling metrics return one value per window.
+MetricFn = Callable[[NDArray[np.float64], Params], float | NDArray[np.float64]]
+PreparedMetricFn = Callable[[PreparedPrices, Params], float | NDArray[np.float64]]
+BatchMetricFn = Callable[
+    [NDArray[np.float64], NDArray[np.int64] | None, Params], NDArray[np.float64]
+]
 
 # Tools that have been implemented and exposed.
 TOOL_REGISTRY: Mapping[ToolName, MetricFn] = {
@@ -20,6 +49,37 @@ TOOL_REGISTRY: Mapping[ToolName, MetricFn] = {
     ToolName.max_drawdown: max_drawdown,
     ToolName.realized_volatility: realized_volatility,
     ToolName.sharpe_ratio: sharpe_ratio,
+    ToolName.rolling_volatility: rolling_volatility,
+    ToolName.rolling_sharpe_ratio: rolling_sharpe_ratio,
+}
+
+# Same tools over a PreparedPrices, so several metrics share one validation and
+# one set of intermediates (log returns, cumulative max).
+PREPARED_TOOL_REGISTRY: Mapping[ToolName, PreparedMetricFn] = {
+    ToolName.total_return: total_return_prepared,
+    ToolName.max_drawdown: max_drawdown_prepared,
+    ToolName.realized_volatility: realized_volatility_prepared,
+    ToolName.sharpe_ratio: sharpe_ratio_prepared,
+    ToolName.rolling_volatility: rolling_volatility_prepared,
+    ToolName.rolling_sharpe_ratio: rolling_sharpe_ratio_prepared,
+}
+
+# Batched (n_tickers, n_days) variants of the tools above.
+BATCH_TOOL_REGISTRY: Mapping[ToolName, BatchMetricFn] = {
+    ToolName.total_return: total_return_batch,
+    ToolName.max_drawdown: max_drawdown_batch,
+    ToolName.realized_volatility: realized_volatility_batch,
+    ToolName.sharpe_ratio: sharpe_ratio_batch,
+}
+
+AccumulatorFactory = Callable[[Params, int | None], MetricAccumulator]
+
+# Streaming (push/evict) counterparts of the point metrics.
+ACCUMULATOR_REGISTRY: Mapping[ToolName, AccumulatorFactory] = {
+    ToolName.total_return: TotalReturnAccumulator,
+    ToolName.max_drawdown: MaxDrawdownAccumulator,
+    ToolName.realized_volatility: RealizedVolatilityAccumulator,
+    ToolName.sharpe_ratio: SharpeRatioAccumulator,
 }
 
 
@@ -29,3 +89,15 @@ def supported_tools() -> list[ToolName]:
 
 def get_metric(tool: ToolName) -> MetricFn | None:
     return TOOL_REGISTRY.get(tool)
+
+
+def get_prepared_metric(tool: ToolName) -> PreparedMetricFn | None:
+    return PREPARED_TOOL_REGISTRY.get(tool)
+
+
+def get_batch_metric(tool: ToolName) -> BatchMetricFn | None:
+    return BATCH_TOOL_REGISTRY.get(tool)
+
+
+def get_accumulator(tool: ToolName) -> AccumulatorFactory | None:
+    return ACCUMULATOR_REGISTRY.get(tool)
@@ -0,0 +1,137 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from quantcli.schemas.params import Params
+from quantcli.tools.metrics import PreparedPrices, return_steps
+
+_EPS = float(np.finfo(np.float64).eps)
+_REFINE = 1e4  # headroom over the cumsum roundoff bound
+
+
+def _rolling_mean_std(
+    values: NDArray[np.float64], window: int
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Mean and sample std (ddof=1) of every length-`window` window of `values`,
+    in one O(n) pass over cumulative sums of x and x^2.
+
+    Values are shifted by their overall mean before accumulating so that the
+    sum-of-squares difference does not suffer catastrophic cancellation when
+    returns are small relative to their mean. The window differences still
+    carry an absolute roundoff of about eps * sum(x^2) over the whole series,
+    so windows whose variance is within _REFINE of that (quiet stretches of an
+    otherwise volatile series) are recomputed directly with a two-pass std.
+    """
+    shift = float(np.mean(values))
+    centered = values - shift
+
+    s1 = np.concatenate(([0.0], np.cumsum(centered)))
+    s2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+    win_s1 = s1[window:] - s1[:-window]
+    win_s2 = s2[window:] - s2[:-window]
+
+    mean = win_s1 / window + shift
+    var = (win_s2 - win_s1 * win_s1 / window) / (window - 1)
+    noisy = np.flatnonzero(var < _REFINE * _EPS * s2[-1] / (window - 1))
+    if noisy.size:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)[noisy]
+        var[noisy] = np.var(windows, axis=1, ddof=1)
+    return mean, np.sqrt(var)
+
+
+def _flat_windows(log_returns: NDArray[np.float64], window: int) -> NDArray[np.bool_]:
+    """Windows without a return step (metrics.return_steps): zero volatility."""
+    steps = np.concatenate(([0], np.cumsum(return_steps(log_returns))))
+    return np.asarray(steps[window - 1 :] == steps[: steps.size - window + 1])
+
+
+def _rolling_log_returns(
+    prepared: PreparedPrices, params: Params, metric_label: str
+) -> tuple[NDArray[np.float64], int, float]:
+    validated_prices = prepared.prices
+
+    af = params.annualization_factor
+    if not np.isfinite(af) or af <= 0:
+        raise ValueError("annualization_factor must be a positive finite number.")
+
+    window = params.window
+    if window is None:
+        raise ValueError(f"Window must be provided for {metric_label}.")
+    if window < 2:
+        raise ValueError("Window must be at least 2 to compute sample std (ddof=1).")
+
+    if not prepared.all_positive:
+        raise ValueError("Prices must be strictly positive to compute log returns.")
+
+    if validated_prices.size < window + 1:
+        raise ValueError(
+            f"At least {window + 1} price points are required to compute "
+            f"{metric_label} with window={window}."
+        )
+
+    return prepared.log_returns, window, float(af)
+
+
+def rolling_volatility(
+    prices: NDArray[np.float64], params: Params
+) -> NDArray[np.float64]:
+    """
+    Annualized realized volatility for every trailing `window` of log returns.
+
+    Element k covers log returns [k, k + window), so the series has
+    len(prices) - window entries, oldest->newest, and its last element equals
+    realized_volatility(prices, params).
+    """
+    return rolling_volatility_prepared(PreparedPrices(prices), params)
+
+
+def rolling_volatility_prepared(
+    prepared: PreparedPrices, params: Params
+) -> NDArray[np.float64]:
+    log_returns, window, af = _rolling_log_returns(
+        prepared, params, "rolling volatility"
+    )
+
+    _, vol = _rolling_mean_std(log_returns, window)
+    if not np.isfinite(vol).all():
+        raise ValueError("Computed volatility is not finite.")
+    # exact zero on flat windows, where roundoff leaves a tiny positive std
+    vol[_flat_windows(log_returns, window)] = 0.0
+    return vol * float(np.sqrt(af))
+
+
+def rolling_sharpe_ratio(
+    prices: NDArray[np.float64], params: Params
+) -> NDArray[np.float64]:
+    """
+    Annualized Sharpe ratio for every trailing `window` of log returns, aligned
+    like rolling_volatility. Windows with zero volatility are NaN; both kernels
+    use the same zero-volatility rule (metrics.return_steps), so the last
+    element is NaN exactly when sharpe_ratio(prices, params) refuses and
+    equals it otherwise.
+    """
+    return rolling_sharpe_ratio_prepared(PreparedPrices(prices), params)
+
+
+def rolling_sharpe_ratio_prepared(
+    prepared: PreparedPrices, params: Params
+) -> NDArray[np.float64]:
+    log_returns, window, af = _rolling_log_returns(
+        prepared, params, "rolling Sharpe ratio"
+    )
+
+    rf_annual = params.risk_free_rate
+    if not np.isfinite(rf_annual):
+        raise ValueError("risk_free_rate must be a finite number.")
+    rf_daily = float(rf_annual) / af
+
+    mean_excess, vol = _rolling_mean_std(log_returns - rf_daily, window)
+    if not np.isfinite(mean_excess).all():
+        raise ValueError("Computed mean excess return is not finite.")
+    if not np.isfinite(vol).all():
+        raise ValueError("Computed volatility is not finite.")
+
+    ok = (vol > 0.0) & ~_flat_windows(log_returns, window)
+    safe_vol = np.where(ok, vol, 1.0)
+    return np.where(ok, (mean_excess / safe_vol) * float(np.sqrt(af)), np.nan)
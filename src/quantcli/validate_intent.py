@@ -3,6 +3,15 @@ from quantcli.schemas.intent import Intent
 from quantcli.schemas.refusal import Refusal
 from quantcli.schemas.tool_name import ToolName
 
+_VOLATILITY_TOOLS = (ToolName.realized_volatility, ToolName.rolling_volatility)
+_SHARPE_TOOLS = (ToolName.sharpe_ratio, ToolName.rolling_sharpe_ratio)
+_WINDOW_TOOLS = _VOLATILITY_TOOLS + _SHARPE_TOOLS
+
+
+def requires_window(tool: ToolName) -> bool:
+    """Whether the tool takes (and validation demands) a window parameter."""
+    return tool in _WINDOW_TOOLS
+
 
 def validate_intent(intent: Intent) -> Intent | Refusal:
     """
@@ -10,9 +19,9 @@ def validate_intent(intent: Intent) -> Intent | Refusal:
 
     A. Exactly one ticker must be provided (single-asset only).
     B. Time range must include at least 2 trading days.
-    C. Realized volatility requires a window parameter.
+    C. Realized volatility (point or rolling) requires a window parameter.
     D. For realized volatility, window must be strictly less than n_days.
-    E. Sharpe ratio requires a window parameter.
+    E. Sharpe ratio (point or rolling) requires a window parameter.
     F. For Sharpe ratio, window must be strictly less than n_days.
     G. Window is not allowed for non-volatility metrics.
     H. risk_free_rate is only allowed for Sharpe ratio.
@@ -36,7 +45,7 @@ def validate_intent(intent: Intent) -> Intent | Refusal:
         )
 
     # C + D. Realized volatility rules
-    if intent.tool == ToolName.realized_volatility:
+    if intent.tool in _VOLATILITY_TOOLS:
         # window parameter is required for realized volatility
         if intent.params.window is None:
             return make_refusal(
@@ -56,7 +65,7 @@ def validate_intent(intent: Intent) -> Intent | Refusal:
             )
 
     # E + F. Sharpe ratio rules
-    if intent.tool == ToolName.sharpe_ratio:
+    if intent.tool in _SHARPE_TOOLS:
         # window parameter is required for Sharpe ratio
         if intent.params.window is None:
             return make_refusal(
@@ -76,10 +85,7 @@ def validate_intent(intent: Intent) -> Intent | Refusal:
             )
 
     # G. Window not allowed for other metrics
-    if (
-        intent.tool not in [ToolName.realized_volatility, ToolName.sharpe_ratio]
-        and intent.params.window is not None
-    ):
+    if not requires_window(intent.tool) and intent.params.window is not None:
         tool_label = _tool_label(intent.tool)
 
         return make_refusal(
@@ -88,7 +94,7 @@ def validate_intent(intent: Intent) -> Intent | Refusal:
         )
 
     # H. risk_free_rate only allowed for Sharpe ratio
-    if intent.tool != ToolName.sharpe_ratio and intent.params.risk_free_rate != 0.0:
+    if intent.tool not in _SHARPE_TOOLS and intent.params.risk_free_rate != 0.0:
         tool_label = _tool_label(intent.tool)
         return make_refusal(
             reason=f"risk_free_rate parameter is not applicable for {tool_label}.",
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from quantcli.llm.anthropic_client import AnthropicLLMClient
+from quantcli.router.prompt import build_messages
+from quantcli.router.router import route_query
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.tool_name import ToolName
+
+# the model continues after the prefilled "{"
+DELTAS = [
+    '"type": "intent", "intent": {"tickers": ["MSFT"], ',
+    '"time_range": {"n_days": 90}, "tool": "max_drawdown"}',
+    "}",
+    "\nHere is the extraction you asked for.",
+]
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+@pytest.fixture
+def stand_in():
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", "0")))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            message = {
+                "id": "msg_1",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-haiku-4-5",
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1},
+            }
+            block = {"type": "text", "text": ""}
+            try:
+                self.wfile.write(
+                    _sse("message_start", {"type": "message_start", "message": message})
+                )
+                self.wfile.write(
+                    _sse(
+                        "content_block_start",
+                        {
+                            "type": "content_block_start",
+                            "index": 0,
+                            "content_block": block,
+                        },
+                    )
+                )
+                for text in DELTAS:
+                    delta = {"type": "text_delta", "text": text}
+                    self.wfile.write(
+                        _sse(
+                            "content_block_delta",
+                            {"type": "content_block_delta", "index": 0, "delta": delta},
+                        )
+                    )
+                self.wfile.flush()
+                # a slow tail: only a client that waits for message_stop sees it
+                release.wait(timeout=10)
+                self.wfile.write(_sse("message_stop", {"type": "message_stop"}))
+            except OSError:
+                pass
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        release.set()
+        server.shutdown()
+        server.server_close()
+
+
+def test_stream_yields_prefill_with_first_chunk(stand_in):
+    with AnthropicLLMClient(api_key="test", base_url=stand_in) as llm:
+        chunks = llm.stream(build_messages("max drawdown MSFT last 90 days"))
+        first = next(chunks)
+        chunks.close()
+
+    assert first == "{" + DELTAS[0]
+
+
+def test_route_query_returns_before_stream_ends(stand_in, cid):
+    with AnthropicLLMClient(api_key="test", base_url=stand_in) as llm:
+        t0 = time.perf_counter()
+        out = route_query("max drawdown MSFT last 90 days", llm, cid)
+        elapsed = time.perf_counter() - t0
+
+    assert isinstance(out, Intent)
+    assert out.tool == ToolName.max_drawdown
+    assert out.tickers == ["MSFT"]
+    assert elapsed < 5.0
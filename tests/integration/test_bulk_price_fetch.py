@@ -0,0 +1,115 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.data.price_provider import (
+    PriceProvider,
+    PriceProviderError,
+    fetch_many_concurrently,
+)
+from quantcli.schemas.params import Params
+from quantcli.tools.batch_metrics import total_return_batch
+
+
+class SingleOnlyProvider(PriceProvider):
+    """Implements only the single-ticker method; inherits the bulk fallback."""
+
+    def __init__(self, series: dict[str, list[float]], delay_s: float = 0.0) -> None:
+        self._series = series
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls: list[str] = []
+
+    def name(self) -> str:
+        return "SingleOnlyProvider"
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> np.ndarray:
+        with self._lock:
+            self.calls.append(ticker)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._delay_s)
+            if ticker not in self._series:
+                raise PriceProviderError("no price data")
+            return np.array(self._series[ticker][-n_days:], dtype=np.float64)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_default_bulk_fallback_aligns_rows_and_reports_failures():
+    provider = SingleOnlyProvider(
+        {"AAA": [1.0, 2.0, 3.0, 4.0], "BBB": [10.0, 11.0], "CCC": [5.0, 6.0, 7.0]}
+    )
+
+    bulk = provider.get_adjusted_close_many(["AAA", "BBB", "ZZZ", "CCC"], 4)
+
+    assert bulk.tickers == ["AAA", "BBB", "ZZZ", "CCC"]
+    assert bulk.prices.shape == (4, 4)
+    assert bulk.lengths.tolist() == [4, 2, 0, 3]
+    assert bulk.failures == {"ZZZ": "no price data"}
+    np.testing.assert_array_equal(bulk.row("BBB"), [10.0, 11.0])
+    assert np.isnan(bulk.prices[1, :2]).all()
+    assert np.isnan(bulk.prices[2]).all()
+
+    returns = total_return_batch(bulk.prices, bulk.lengths, Params())
+    assert returns[0] == pytest.approx(3.0)
+    assert returns[1] == pytest.approx(0.1)
+    assert np.isnan(returns[2])
+    assert returns[3] == pytest.approx(0.4)
+
+
+def test_bulk_fallback_runs_on_bounded_thread_pool():
+    series = {f"T{i}": [1.0, 2.0] for i in range(12)}
+    provider = SingleOnlyProvider(series, delay_s=0.02)
+
+    bulk = fetch_many_concurrently(provider, list(series) + ["T0"], 2, max_workers=4)
+
+    assert 1 < provider.max_in_flight <= 4
+    assert sorted(provider.calls) == sorted(series)  # duplicates fetched once
+    assert bulk.lengths.tolist() == [2] * 13
+
+
+def test_bulk_fallback_isolates_unexpected_errors():
+    class FlakyProvider(SingleOnlyProvider):
+        def get_adjusted_close(self, ticker: str, n_days: int) -> np.ndarray:
+            if ticker == "BAD":
+                raise KeyError(ticker)
+            return super().get_adjusted_close(ticker, n_days)
+
+    provider = FlakyProvider({"AAA": [1.0, 2.0]})
+
+    bulk = fetch_many_concurrently(provider, ["AAA", "BAD"], 2)
+
+    assert bulk.lengths.tolist() == [2, 0]
+    assert bulk.failures == {"BAD": "unexpected provider error: KeyError"}
+
+
+def test_bulk_fallback_rejects_invalid_pool_size():
+    with pytest.raises(ValueError):
+        fetch_many_concurrently(SingleOnlyProvider({}), ["AAA"], 2, max_workers=0)
+
+
+def test_fake_provider_bulk_is_one_call_matching_single_fetches():
+    provider = FakePriceProvider()
+
+    bulk = provider.get_adjusted_close_many(["AAA", "BBB", "CCC"], 5)
+
+    assert provider.calls == 1
+    assert bulk.prices.shape == (3, 5)
+    assert bulk.failures == {}
+    for t in ("AAA", "BBB", "CCC"):
+        np.testing.assert_array_equal(bulk.row(t), provider.get_adjusted_close(t, 5))
+
+
+def test_fake_provider_bulk_failure_reports_every_ticker():
+    provider = FakePriceProvider(fail=True)
+    bulk = provider.get_adjusted_close_many(["AAA", "BBB"], 5)
+    assert set(bulk.failures) == {"AAA", "BBB"}
+    assert bulk.lengths.tolist() == [0, 0]
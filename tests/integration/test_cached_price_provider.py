@@ -0,0 +1,321 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from quantcli.data.cached_price_provider import CachedPriceProvider
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.data.price_provider import PriceProviderError, is_tail_consistent
+
+# Monday 2026-10-12 15:00 UTC
+MONDAY_TS = 1_791_817_200.0
+DAY_S = 86_400.0
+
+
+class FakeClock:
+    def __init__(self, now: float = MONDAY_TS) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class HistoryProvider:
+    """Serves the last n_days of a mutable history and records request sizes."""
+
+    def __init__(self, history: list[float]) -> None:
+        self.history = list(history)
+        self.requests: list[int] = []
+
+    def name(self) -> str:
+        return "HistoryProvider"
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> np.ndarray:
+        self.requests.append(n_days)
+        return np.array(self.history[-n_days:], dtype=np.float64)
+
+
+def _walk(n: int, seed: int = 1) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return (100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n)))).tolist()
+
+
+def test_cache_miss_then_hit_skips_inner_provider(tmp_path):
+    inner = FakePriceProvider("drawdown")
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+
+    first = provider.get_adjusted_close("AAPL", 30)
+    second = provider.get_adjusted_close("AAPL", 30)
+
+    assert inner.calls == 1
+    assert second.dtype == np.float64
+    np.testing.assert_array_equal(first, second)
+    assert provider.name() == "FakePriceProvider"
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    entry = index["entries"]["AAPL|30"]
+    assert entry["count"] == 30
+    assert (tmp_path / entry["file"]).stat().st_size == 30 * 8
+
+
+def test_cache_keys_on_ticker_and_n_days(tmp_path):
+    inner = FakePriceProvider()
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+
+    provider.get_adjusted_close("AAPL", 10)
+    provider.get_adjusted_close("AAPL", 20)
+    provider.get_adjusted_close("^GSPC", 10)
+    provider.get_adjusted_close("_GSPC", 10)
+
+    assert inner.calls == 4
+
+
+def test_cache_entry_expires_after_ttl(tmp_path):
+    clock = FakeClock()
+    inner = FakePriceProvider()
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, delta_refresh=False, clock=clock
+    )
+
+    provider.get_adjusted_close("AAPL", 10)
+    clock.now += 60.0
+    provider.get_adjusted_close("AAPL", 10)
+    assert inner.calls == 1
+
+    clock.now += 1.0
+    provider.get_adjusted_close("AAPL", 10)
+    assert inner.calls == 2
+
+
+def test_cache_evicts_oldest_entries_over_max_bytes(tmp_path):
+    clock = FakeClock()
+    inner = FakePriceProvider()
+    # room for two 10-point series
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, max_bytes=2 * 10 * 8, clock=clock
+    )
+
+    for ticker in ("AAA", "BBB", "CCC"):
+        provider.get_adjusted_close(ticker, 10)
+        clock.now += 1.0
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert set(index["entries"]) == {"BBB|10", "CCC|10"}
+    assert len(list(tmp_path.glob("*.f64"))) == 2
+
+    provider.get_adjusted_close("AAA", 10)
+    assert inner.calls == 4
+
+
+def test_cache_corruption_degrades_to_miss(tmp_path):
+    inner = FakePriceProvider()
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+    provider.get_adjusted_close("AAPL", 10)
+
+    for f in tmp_path.glob("*.f64"):
+        f.write_bytes(b"\x00" * 3)
+    provider.get_adjusted_close("AAPL", 10)
+    assert inner.calls == 2
+
+    (tmp_path / "index.json").write_text("not json")
+    prices = provider.get_adjusted_close("AAPL", 10)
+    assert inner.calls == 3
+    assert prices.size == 10
+
+
+def test_cache_does_not_store_provider_failures(tmp_path):
+    inner = FakePriceProvider(fail=True)
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+
+    for _ in range(2):
+        with pytest.raises(PriceProviderError):
+            provider.get_adjusted_close("AAPL", 10)
+    assert inner.calls == 2
+    assert not (tmp_path / "index.json").exists()
+
+
+def test_warm_cache_never_imports_pandas_or_yfinance(tmp_path):
+    # populate with the fake provider, then read through a yfinance-backed cache
+    # in a fresh interpreter
+    seeded = CachedPriceProvider(inner=FakePriceProvider(), cache_dir=tmp_path)
+    expected = seeded.get_adjusted_close("AAPL", 10)
+
+    script = textwrap.dedent(f"""
+        import json, sys
+        from quantcli.data.cached_price_provider import CachedPriceProvider
+        from quantcli.data.yfinance_price_provider import YFinancePriceProvider
+
+        provider = CachedPriceProvider(
+            inner=YFinancePriceProvider(), cache_dir={str(tmp_path)!r}
+        )
+        prices = provider.get_adjusted_close("AAPL", 10)
+        print(json.dumps({{
+            "prices": prices.tolist(),
+            "pandas": "pandas" in sys.modules,
+            "yfinance": "yfinance" in sys.modules,
+        }}))
+        """)
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(out.stdout)
+
+    assert report["prices"] == expected.tolist()
+    assert report["pandas"] is False
+    assert report["yfinance"] is False
+
+
+def test_stale_entry_fetches_only_missing_tail_and_appends_in_place(tmp_path):
+    clock = FakeClock()
+    inner = HistoryProvider(_walk(200))
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, clock=clock
+    )
+    provider.get_adjusted_close("AAPL", 100)
+    cache_file = next(tmp_path.glob("*.f64"))
+    assert cache_file.stat().st_size == 100 * 8
+
+    # the provisional last bar settles and two new sessions close
+    inner.history[-1] *= 1.001
+    inner.history += [inner.history[-1] * 1.01, inner.history[-1] * 0.99]
+    clock.now += 2 * DAY_S
+
+    prices = provider.get_adjusted_close("AAPL", 100)
+
+    np.testing.assert_array_equal(prices, np.array(inner.history[-100:]))
+    assert inner.requests[0] == 100
+    assert inner.requests[1] < 10
+    assert len(inner.requests) == 2
+    assert cache_file.stat().st_size == 102 * 8
+    entry = json.loads((tmp_path / "index.json").read_text())["entries"]["AAPL|100"]
+    assert entry["offset"] == 2
+    assert entry["count"] == 100
+
+    # refreshed entry is fresh again and read back from its new offset
+    again = provider.get_adjusted_close("AAPL", 100)
+    np.testing.assert_array_equal(again, prices)
+    assert len(inner.requests) == 2
+
+
+def test_delta_refresh_compacts_dead_prefix(tmp_path):
+    clock = FakeClock()
+    inner = HistoryProvider(_walk(100))
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, clock=clock
+    )
+    provider.get_adjusted_close("AAPL", 10)
+    cache_file = next(tmp_path.glob("*.f64"))
+
+    for step in range(15):
+        inner.history.append(inner.history[-1] * (1.0 + 0.001 * (step + 1)))
+        clock.now += DAY_S
+        prices = provider.get_adjusted_close("AAPL", 10)
+        np.testing.assert_array_equal(prices, np.array(inner.history[-10:]))
+
+    assert inner.requests[0] == 10
+    assert all(n < 10 for n in inner.requests[1:])
+    entry = json.loads((tmp_path / "index.json").read_text())["entries"]["AAPL|10"]
+    assert entry["offset"] <= entry["count"]
+    assert cache_file.stat().st_size == (entry["offset"] + entry["count"]) * 8
+
+
+def test_readjusted_history_falls_back_to_full_refetch(tmp_path):
+    clock = FakeClock()
+    inner = HistoryProvider(_walk(200))
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, clock=clock
+    )
+    provider.get_adjusted_close("AAPL", 100)
+
+    # a dividend back-adjusts every historical bar
+    inner.history = [p * 0.98 for p in inner.history] + [inner.history[-1]]
+    clock.now += DAY_S
+
+    prices = provider.get_adjusted_close("AAPL", 100)
+
+    np.testing.assert_array_equal(prices, np.array(inner.history[-100:]))
+    assert inner.requests[0] == 100
+    assert inner.requests[1] < 10
+    assert inner.requests[2] == 100
+
+
+def test_ambiguous_overlap_falls_back_to_full_refetch(tmp_path):
+    clock = FakeClock()
+    inner = HistoryProvider([100.0] * 50)
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, clock=clock
+    )
+    provider.get_adjusted_close("AAPL", 30)
+
+    inner.history += [100.0, 101.0]
+    clock.now += DAY_S
+
+    prices = provider.get_adjusted_close("AAPL", 30)
+
+    np.testing.assert_array_equal(prices, np.array(inner.history[-30:]))
+    assert inner.requests[-1] == 30
+
+
+def test_failed_delta_fetch_falls_back_to_full_refetch(tmp_path):
+    class NoShortWindows(HistoryProvider):
+        def get_adjusted_close(self, ticker: str, n_days: int) -> np.ndarray:
+            prices = super().get_adjusted_close(ticker, n_days)
+            if n_days < 10:
+                raise PriceProviderError("no price data")
+            return prices
+
+    clock = FakeClock()
+    inner = NoShortWindows(_walk(200))
+    provider = CachedPriceProvider(
+        inner=inner, cache_dir=tmp_path, ttl_s=60.0, clock=clock
+    )
+    provider.get_adjusted_close("AAPL", 100)
+
+    inner.history.append(inner.history[-1] * 1.01)
+    clock.now += DAY_S
+
+    prices = provider.get_adjusted_close("AAPL", 100)
+
+    np.testing.assert_array_equal(prices, np.array(inner.history[-100:]))
+    assert inner.requests[1] < 10
+    assert inner.requests[2] == 100
+
+
+def test_bulk_fetch_serves_hits_and_fetches_misses_in_one_call(tmp_path):
+    inner = FakePriceProvider()
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+    provider.get_adjusted_close("AAA", 10)
+
+    bulk = provider.get_adjusted_close_many(["AAA", "BBB", "CCC"], 10)
+
+    assert inner.calls == 2  # one single fetch, then one bulk fetch for BBB, CCC
+    assert bulk.lengths.tolist() == [10, 10, 10]
+
+    provider.get_adjusted_close_many(["AAA", "BBB", "CCC"], 10)
+    provider.get_adjusted_close("CCC", 10)
+    assert inner.calls == 2
+
+
+def test_bulk_fetch_falls_back_for_structural_inner_provider(tmp_path):
+    inner = HistoryProvider(_walk(50))
+    provider = CachedPriceProvider(inner=inner, cache_dir=tmp_path)
+
+    bulk = provider.get_adjusted_close_many(["AAA", "BBB"], 20)
+
+    assert bulk.lengths.tolist() == [20, 20]
+    assert inner.requests == [20, 20]
+
+
+def test_tail_consistency_is_the_inner_providers(tmp_path):
+    synthetic = CachedPriceProvider(inner=FakePriceProvider("gbm"), cache_dir=tmp_path)
+    named = CachedPriceProvider(inner=FakePriceProvider("drawdown"), cache_dir=tmp_path)
+
+    assert is_tail_consistent(synthetic)
+    assert not is_tail_consistent(named)
+    assert not is_tail_consistent(HistoryProvider([1.0]))
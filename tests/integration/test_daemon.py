@@ -0,0 +1,190 @@
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from quantcli.cli import answer_query
+from quantcli.daemon import forward, main
+from quantcli.daemon_server import QueryServer
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.orchestrator import run_query
+
+REPO_SRC = Path(__file__).resolve().parents[2] / "src"
+
+INTENT_RESPONSE = json.dumps(
+    {
+        "type": "intent",
+        "intent": {
+            "tickers": ["AAPL"],
+            "time_range": {"n_days": 10},
+            "tool": "total_return",
+        },
+    }
+)
+REFUSAL_RESPONSE = json.dumps({"type": "refusal", "refusal": {"reason": "AMBIGUOUS"}})
+
+
+@contextlib.contextmanager
+def serving(socket_path, llm_client):
+    server = QueryServer(socket_path, llm_client, FakePriceProvider(), run_query)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUANTCLI_DAEMON", raising=False)
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    socket_path = tmp_path / "daemon.sock"
+    with serving(socket_path, FakeLLMClient(INTENT_RESPONSE)):
+        yield socket_path
+
+
+@pytest.mark.parametrize(
+    "llm_response, argv, exit_code",
+    [
+        (INTENT_RESPONSE, ["total", "return", "AAPL", "10", "days"], 0),
+        (REFUSAL_RESPONSE, ["compare", "AAPL", "and", "MSFT"], 2),
+        ("not valid json", ["garbled"], 2),
+    ],
+)
+def test_forward_matches_in_process_output(
+    tmp_path, monkeypatch, llm_response, argv, exit_code
+):
+    monkeypatch.delenv("QUANTCLI_DAEMON", raising=False)
+    llm_client = FakeLLMClient(llm_response)
+    expected = answer_query(
+        " ".join(argv), llm_client, FakePriceProvider, run_query, "cid-local"
+    )
+
+    with serving(tmp_path / "daemon.sock", llm_client):
+        forwarded = forward(argv, tmp_path / "daemon.sock")
+
+    assert forwarded == expected
+    assert forwarded[1] == exit_code
+
+
+def test_main_prints_forwarded_stdout(daemon, monkeypatch, capsys):
+    monkeypatch.setenv("QUANTCLI_DAEMON_SOCKET", str(daemon))
+
+    code = main(["total", "return", "AAPL", "10", "days"])
+
+    out = capsys.readouterr().out.strip()
+    assert code == 0
+    assert json.loads(out)["tool"] == "total_return"
+
+
+def test_forward_returns_none_without_daemon(tmp_path):
+    assert forward(["total", "return", "AAPL"], tmp_path / "missing.sock") is None
+
+
+def test_forward_disabled_by_env(daemon, monkeypatch):
+    monkeypatch.setenv("QUANTCLI_DAEMON", "0")
+    assert forward(["total", "return", "AAPL"], daemon) is None
+
+
+def test_forward_gives_up_on_a_wedged_daemon(tmp_path, monkeypatch):
+    monkeypatch.delenv("QUANTCLI_DAEMON", raising=False)
+    socket_path = tmp_path / "wedged.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as wedged:
+        wedged.bind(str(socket_path))
+        wedged.listen()  # accepts connections, never answers
+
+        started = time.monotonic()
+        out = forward(["total", "return", "AAPL"], socket_path, reply_timeout_s=0.2)
+
+    assert out is None
+    assert time.monotonic() - started < 5
+
+
+def test_forward_declined_when_env_differs(daemon, monkeypatch):
+    argv = ["total", "return", "AAPL", "10", "days"]
+    assert forward(argv, daemon) is not None
+
+    monkeypatch.setenv("QUANTCLI_FAST_PATH", "0")
+    assert forward(argv, daemon) is None
+
+    # the client's own socket settings do not count as a difference
+    monkeypatch.delenv("QUANTCLI_FAST_PATH")
+    monkeypatch.setenv("QUANTCLI_DAEMON_SOCKET", str(daemon))
+    assert forward(argv, daemon) is not None
+
+
+def test_flags_are_never_forwarded(daemon):
+    assert forward(["--batch", "queries.txt"], daemon) is None
+    assert forward(["--help"], daemon) is None
+
+
+def test_bad_request_gets_internal_error_refusal(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(daemon))
+        sock.sendall(b'{"version": 99, "argv": ["x"]}\n')
+        with sock.makefile("rb") as f:
+            reply = json.loads(f.readline())
+
+    assert reply["exit_code"] == 2
+    assert json.loads(reply["stdout"])["reason"] == "Unexpected internal error."
+
+
+def test_second_server_on_live_socket_is_rejected(daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        QueryServer(
+            daemon, FakeLLMClient(INTENT_RESPONSE), FakePriceProvider(), run_query
+        )
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    socket_path = tmp_path / "daemon.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()  # file stays behind, nobody listens
+
+    server = QueryServer(
+        socket_path, FakeLLMClient(INTENT_RESPONSE), FakePriceProvider(), run_query
+    )
+    try:
+        assert oct(os.stat(socket_path).st_mode & 0o777) == oct(0o600)
+    finally:
+        server.server_close()
+    assert not socket_path.exists()
+
+
+def test_thin_client_skips_heavy_imports(daemon):
+    script = (
+        "import json, sys\n"
+        "from quantcli.daemon import main\n"
+        "code = main(['total', 'return', 'AAPL', '10', 'days'])\n"
+        "heavy = [m for m in ('numpy', 'pydantic', 'anthropic') if m in sys.modules]\n"
+        "print(json.dumps({'code': code, 'heavy': heavy}), file=sys.stderr)\n"
+    )
+    env = {**os.environ, "QUANTCLI_DAEMON_SOCKET": str(daemon)}
+    env.pop("QUANTCLI_DAEMON", None)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(REPO_SRC), env.get("PYTHONPATH", "")) if p
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=30,
+        check=True,
+    )
+
+    report = json.loads(proc.stderr.strip().splitlines()[-1])
+    assert report == {"code": 0, "heavy": []}
+    assert json.loads(proc.stdout)["tool"] == "total_return"
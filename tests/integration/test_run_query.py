@@ -77,7 +77,7 @@ def test_run_query_happy_path_total_return(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert len(llm_client.calls) == 1
     assert price_provider.calls == 1
@@ -110,7 +110,7 @@ def test_run_query_happy_path_max_drawdown(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert len(llm_client.calls) == 1
     assert price_provider.calls == 1
@@ -148,7 +148,7 @@ def test_run_query_happy_path_realized_volatility(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert len(llm_client.calls) == 1
     assert price_provider.calls == 1
@@ -186,7 +186,7 @@ def test_run_query_happy_path_sharpe_ratio(cid):
     assert result.metadata["risk_free_rate"] == 0.0
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert len(llm_client.calls) == 1
     assert price_provider.calls == 1
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from quantcli.data.async_adapter import ThreadedAsyncPriceProvider
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.llm.async_adapter import ThreadedAsyncLLMClient
+from quantcli.llm.errors import LLMError
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.orchestrator import run_query, run_query_async
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+
+INTENT_RESPONSE = """
+{
+    "type": "intent",
+    "intent": {
+        "tickers": ["AAPL"],
+        "time_range": {"n_days": 10},
+        "tool": "total_return"
+    }
+}
+"""
+
+
+class SlowFakeLLMClient(FakeLLMClient):
+    """Blocking fake that records how many completions overlap."""
+
+    def __init__(self, response: str, delay_s: float) -> None:
+        super().__init__(response)
+        self._delay_s = delay_s
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def complete(self, messages):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._delay_s)
+            return super().complete(messages)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_run_query_async_matches_sync(cid):
+    sync_result = run_query(
+        "total return AAPL 10 days",
+        FakeLLMClient(INTENT_RESPONSE),
+        FakePriceProvider(),
+        cid,
+    )
+
+    async_result = asyncio.run(
+        run_query_async(
+            "total return AAPL 10 days",
+            ThreadedAsyncLLMClient(FakeLLMClient(INTENT_RESPONSE)),
+            ThreadedAsyncPriceProvider(FakePriceProvider()),
+            cid,
+        )
+    )
+
+    assert isinstance(async_result, Result)
+    assert async_result == sync_result
+
+
+def test_run_query_async_overlaps_queries_with_bounded_concurrency(cid):
+    llm = SlowFakeLLMClient(INTENT_RESPONSE, delay_s=0.05)
+    provider = FakePriceProvider()
+
+    async def _main() -> list[Result | Refusal]:
+        async_llm = ThreadedAsyncLLMClient(llm, max_concurrency=4)
+        async_provider = ThreadedAsyncPriceProvider(provider, max_concurrency=2)
+        return await asyncio.gather(
+            *(
+                run_query_async(
+                    "total return AAPL 10 days", async_llm, async_provider, cid
+                )
+                for _ in range(12)
+            )
+        )
+
+    t0 = time.perf_counter()
+    results = asyncio.run(_main())
+    elapsed = time.perf_counter() - t0
+
+    assert all(isinstance(r, Result) for r in results)
+    assert llm.max_in_flight == 4
+    assert len(llm.calls) == 12
+    assert provider.calls == 12
+    # 12 x 50ms serially; 3 waves of 4 when overlapped
+    assert elapsed < 12 * 0.05
+
+
+def test_run_query_async_llm_error_returns_refusal(cid):
+    result = asyncio.run(
+        run_query_async(
+            "total return AAPL 10 days",
+            ThreadedAsyncLLMClient(FakeLLMClient(LLMError(kind="timeout"))),
+            ThreadedAsyncPriceProvider(FakePriceProvider()),
+            cid,
+        )
+    )
+    assert isinstance(result, Refusal)
+    assert result.reason == "Unable to process this request right now."
+
+
+def test_run_query_async_provider_failure_returns_refusal(cid):
+    provider = FakePriceProvider(fail=True)
+    result = asyncio.run(
+        run_query_async(
+            "total return AAPL 10 days",
+            ThreadedAsyncLLMClient(FakeLLMClient(INTENT_RESPONSE)),
+            ThreadedAsyncPriceProvider(provider),
+            cid,
+        )
+    )
+    assert isinstance(result, Refusal)
+    assert result.reason == "Unable to retrieve valid price data."
+    assert provider.calls == 1
+
+
+def test_async_adapters_reject_invalid_concurrency():
+    with pytest.raises(ValueError):
+        ThreadedAsyncLLMClient(FakeLLMClient(INTENT_RESPONSE), max_concurrency=0)
+    with pytest.raises(ValueError):
+        ThreadedAsyncPriceProvider(FakePriceProvider(), max_concurrency=0)
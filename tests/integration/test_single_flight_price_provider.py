@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from quantcli.data.async_adapter import ThreadedAsyncPriceProvider
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.data.price_provider import PriceProviderError
+from quantcli.data.single_flight_price_provider import (
+    AsyncSingleFlightPriceProvider,
+    SingleFlightPriceProvider,
+)
+
+
+class GatedFakePriceProvider(FakePriceProvider):
+    """FakePriceProvider whose fetches block until the test opens the gate."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__(fail=fail)
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+
+    def get_adjusted_close(self, ticker, n_days):
+        self.entered.set()
+        assert self.gate.wait(timeout=5)
+        return super().get_adjusted_close(ticker, n_days)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _fetch_concurrently(provider, keys):
+    results: list[object] = [None] * len(keys)
+
+    def call(i, ticker, n_days):
+        try:
+            results[i] = provider.get_adjusted_close(ticker=ticker, n_days=n_days)
+        except Exception as e:
+            results[i] = e
+
+    threads = [
+        threading.Thread(target=call, args=(i, *key)) for i, key in enumerate(keys)
+    ]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def test_concurrent_identical_fetches_hit_upstream_once():
+    upstream = GatedFakePriceProvider()
+    provider = SingleFlightPriceProvider(upstream)
+
+    threads, results = _fetch_concurrently(provider, [("AAPL", 10)] * 8)
+    _wait_for(lambda: provider.coalesced == 7)
+    upstream.gate.set()
+    for t in threads:
+        t.join()
+
+    assert upstream.calls == 1
+    expected = FakePriceProvider().get_adjusted_close("AAPL", 10)
+    for prices in results:
+        assert isinstance(prices, np.ndarray)
+        np.testing.assert_array_equal(prices, expected)
+    # every caller owns its array
+    assert len({id(p) for p in results}) == len(results)
+
+
+def test_distinct_keys_are_fetched_separately():
+    upstream = GatedFakePriceProvider()
+    upstream.gate.set()
+    provider = SingleFlightPriceProvider(upstream)
+
+    threads, _ = _fetch_concurrently(
+        provider, [("AAPL", 10), ("AAPL", 20), ("MSFT", 10)]
+    )
+    for t in threads:
+        t.join()
+
+    assert upstream.calls == 3
+    assert provider.coalesced == 0
+
+
+def test_errors_are_shared_with_waiters():
+    upstream = GatedFakePriceProvider(fail=True)
+    provider = SingleFlightPriceProvider(upstream)
+
+    threads, results = _fetch_concurrently(provider, [("AAPL", 10)] * 4)
+    _wait_for(lambda: provider.coalesced == 3)
+    upstream.gate.set()
+    for t in threads:
+        t.join()
+
+    assert upstream.calls == 1
+    assert all(isinstance(r, PriceProviderError) for r in results)
+
+
+def test_settled_fetch_is_not_cached():
+    upstream = FakePriceProvider()
+    provider = SingleFlightPriceProvider(upstream)
+
+    provider.get_adjusted_close("AAPL", 10)
+    provider.get_adjusted_close("AAPL", 10)
+
+    assert upstream.calls == 2
+
+
+def test_failed_fetch_is_retried_by_the_next_caller():
+    upstream = FakePriceProvider(fail=True)
+    provider = SingleFlightPriceProvider(upstream)
+
+    with pytest.raises(PriceProviderError):
+        provider.get_adjusted_close("AAPL", 10)
+    upstream.fail = False
+
+    assert provider.get_adjusted_close("AAPL", 10).size == 10
+    assert upstream.calls == 2
+
+
+def test_bulk_fetch_goes_to_inner():
+    upstream = FakePriceProvider()
+    provider = SingleFlightPriceProvider(upstream)
+
+    bulk = provider.get_adjusted_close_many(["AAPL", "MSFT"], 5)
+
+    assert bulk.prices.shape == (2, 5)
+    assert upstream.calls == 1
+
+
+def test_bulk_fetch_falls_back_for_structural_inner_provider():
+    class SingleOnly:
+        def name(self):
+            return "SingleOnly"
+
+        def get_adjusted_close(self, ticker, n_days):
+            return np.arange(1.0, n_days + 1.0)
+
+    bulk = SingleFlightPriceProvider(SingleOnly()).get_adjusted_close_many(
+        ["AAPL", "MSFT"], 5
+    )
+
+    assert bulk.lengths.tolist() == [5, 5]
+    assert bulk.failures == {}
+
+
+def test_async_concurrent_identical_fetches_hit_upstream_once():
+    upstream = GatedFakePriceProvider()
+    provider = AsyncSingleFlightPriceProvider(ThreadedAsyncPriceProvider(upstream))
+
+    async def _main():
+        calls = [provider.get_adjusted_close("AAPL", 10) for _ in range(10)]
+        calls.append(provider.get_adjusted_close("MSFT", 10))
+        gathered = asyncio.gather(*calls)
+        await asyncio.to_thread(upstream.entered.wait, 5)
+        await asyncio.sleep(0)
+        upstream.gate.set()
+        return await gathered
+
+    results = asyncio.run(_main())
+
+    assert upstream.calls == 2
+    assert provider.coalesced == 9
+    assert all(r.size == 10 for r in results)
+
+
+def test_async_errors_are_shared_with_waiters():
+    upstream = FakePriceProvider(fail=True)
+    provider = AsyncSingleFlightPriceProvider(ThreadedAsyncPriceProvider(upstream))
+
+    async def _main():
+        return await asyncio.gather(
+            *(provider.get_adjusted_close("AAPL", 10) for _ in range(5)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(_main())
+
+    assert upstream.calls == 1
+    assert all(isinstance(r, PriceProviderError) for r in results)
+
+
+def test_async_cancelled_waiter_does_not_cancel_shared_fetch():
+    upstream = GatedFakePriceProvider()
+    provider = AsyncSingleFlightPriceProvider(ThreadedAsyncPriceProvider(upstream))
+
+    async def _main():
+        first = asyncio.ensure_future(provider.get_adjusted_close("AAPL", 10))
+        second = asyncio.ensure_future(provider.get_adjusted_close("AAPL", 10))
+        await asyncio.to_thread(upstream.entered.wait, 5)
+        first.cancel()
+        upstream.gate.set()
+        return await second, first.cancelled()
+
+    prices, first_cancelled = asyncio.run(_main())
+
+    assert first_cancelled
+    assert prices.size == 10
+    assert upstream.calls == 1
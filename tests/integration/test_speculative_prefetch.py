@@ -0,0 +1,153 @@
+import json
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.data.speculative_price_provider import SpeculativePriceProvider
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.llm.llm_client import Message
+from quantcli.orchestrator import run_query
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+
+
+def _intent_response(ticker: str, n_days: int) -> str:
+    return json.dumps(
+        {
+            "type": "intent",
+            "intent": {
+                "tickers": [ticker],
+                "time_range": {"n_days": n_days},
+                "tool": "total_return",
+            },
+        }
+    )
+
+
+class RecordingProvider(FakePriceProvider):
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.requests: list[tuple[str, int]] = []
+        self.fetch_started = threading.Event()
+
+    def get_adjusted_close(self, ticker: str, n_days: int):
+        self.requests.append((ticker, n_days))
+        self.fetch_started.set()
+        return super().get_adjusted_close(ticker, n_days)
+
+
+class WaitsForFetchLLM(FakeLLMClient):
+    """Completes only once a price fetch is in flight (or after a timeout)."""
+
+    def __init__(
+        self, response: str, provider: RecordingProvider, timeout: float = 2.0
+    ) -> None:
+        super().__init__(response)
+        self._provider = provider
+        self._timeout = timeout
+        self.saw_fetch_in_flight = False
+
+    def complete(self, messages: Sequence[Message]) -> str:
+        self.saw_fetch_in_flight = self._provider.fetch_started.wait(self._timeout)
+        return super().complete(messages)
+
+
+def test_prefetch_overlaps_routing(cid):
+    provider = RecordingProvider()
+    llm = WaitsForFetchLLM(_intent_response("AAPL", 30), provider)
+
+    out = run_query(
+        "total return AAPL over the last 30 days",
+        llm,
+        provider,
+        cid,
+        speculative_prefetch=True,
+    )
+
+    assert isinstance(out, Result)
+    assert llm.saw_fetch_in_flight
+    assert provider.requests == [("AAPL", 30)]
+    assert out.metadata["data_points"] == 30
+
+
+def test_prefetch_off_by_default_is_serial(cid):
+    provider = RecordingProvider()
+    llm = WaitsForFetchLLM(_intent_response("AAPL", 30), provider, timeout=0.05)
+
+    out = run_query("total return AAPL over the last 30 days", llm, provider, cid)
+
+    assert isinstance(out, Result)
+    assert not llm.saw_fetch_in_flight
+    assert provider.requests == [("AAPL", 30)]
+
+
+def test_prefetch_reused_for_shorter_range(cid):
+    provider = RecordingProvider()
+    llm = FakeLLMClient(_intent_response("AAPL", 10))
+
+    out = run_query(
+        "total return AAPL over the last 30 days",
+        llm,
+        provider,
+        cid,
+        speculative_prefetch=True,
+    )
+
+    assert isinstance(out, Result)
+    assert provider.requests == [("AAPL", 30)]
+    assert out.metadata["data_points"] == 10
+
+
+def test_prefetch_discarded_on_ticker_or_range_mismatch(cid):
+    for ticker, n_days in (("MSFT", 30), ("AAPL", 60)):
+        provider = RecordingProvider()
+        llm = FakeLLMClient(_intent_response(ticker, n_days))
+
+        out = run_query(
+            "total return AAPL over the last 30 days",
+            llm,
+            provider,
+            cid,
+            speculative_prefetch=True,
+        )
+
+        assert isinstance(out, Result)
+        assert out.metadata["data_points"] == n_days
+        # the discarded guess may or may not have reached the provider
+        assert (ticker, n_days) in provider.requests
+        assert set(provider.requests) <= {("AAPL", 30), (ticker, n_days)}
+
+
+def test_prefetch_discarded_on_route_refusal(cid):
+    provider = RecordingProvider()
+    llm = FakeLLMClient("not valid json")
+
+    out = run_query(
+        "total return AAPL over the last 30 days",
+        llm,
+        provider,
+        cid,
+        speculative_prefetch=True,
+    )
+
+    assert isinstance(out, Refusal)
+    assert len(provider.requests) <= 1
+
+
+class FailsOnceProvider(RecordingProvider):
+    def get_adjusted_close(self, ticker: str, n_days: int):
+        self.fail = not self.requests
+        return super().get_adjusted_close(ticker, n_days)
+
+
+def test_failed_prefetch_falls_back_to_inner(cid):
+    provider = FailsOnceProvider()
+    speculation = SpeculativePriceProvider(provider, "AAPL", 30, cid=cid)
+
+    prices = speculation.get_adjusted_close("AAPL", 30)
+
+    assert isinstance(prices, np.ndarray)
+    assert prices.size == 30
+    assert len(provider.requests) == 2
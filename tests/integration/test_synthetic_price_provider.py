@@ -0,0 +1,178 @@
+import json
+import re
+from collections.abc import Sequence
+
+import numpy as np
+import pytest
+
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.data.synthetic import (
+    GENERATORS,
+    SyntheticUniverse,
+    synthetic_tickers,
+)
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.llm.llm_client import Message
+from quantcli.orchestrator import run_batch
+from quantcli.schemas.params import Params
+from quantcli.schemas.result import Result
+from quantcli.tools.metrics import total_return
+
+MODELS = sorted(GENERATORS)
+
+
+def _kurtosis(prices: np.ndarray) -> float:
+    r = np.diff(np.log(prices))
+    r = r - r.mean()
+    return float((r**4).mean() / (r**2).mean() ** 2)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_synthetic_prices_are_valid_and_deterministic(model):
+    provider = FakePriceProvider(model, seed=7)
+    prices = provider.get_adjusted_close("AAPL", 1000)
+
+    assert prices.dtype == np.float64
+    assert np.isfinite(prices).all()
+    assert (prices > 0).all()
+    assert 900 < prices.size <= 1000
+    np.testing.assert_array_equal(
+        prices, FakePriceProvider(model, seed=7).get_adjusted_close("AAPL", 1000)
+    )
+    assert not np.array_equal(
+        prices[:100], provider.get_adjusted_close("MSFT", 1000)[:100]
+    )
+    assert not np.array_equal(
+        prices[:100], FakePriceProvider(model, seed=8).get_adjusted_close("AAPL", 1000)
+    )
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_shorter_ranges_are_tails_of_the_same_history(model):
+    provider = FakePriceProvider(model)
+    full = provider.get_adjusted_close("AAPL", 500)
+    tail = provider.get_adjusted_close("AAPL", 50)
+    np.testing.assert_array_equal(tail, full[full.size - tail.size :])
+
+
+def test_range_is_capped_at_the_history_length():
+    provider = FakePriceProvider("gbm", history_days=300)
+    assert provider.get_adjusted_close("AAPL", 1000).size == 300
+    assert provider.get_adjusted_close("AAPL", 0).size == 0
+    with pytest.raises(ValueError):
+        provider.get_adjusted_close("AAPL", -1)
+
+
+def test_gapped_series_drop_missing_sessions():
+    universe = SyntheticUniverse("gapped", seed=3)
+    history = universe.history("AAPL")
+    assert np.isnan(history).any()
+    prices = universe.prices("AAPL", history.size)
+    assert prices.size == np.count_nonzero(~np.isnan(history))
+
+
+def test_model_shapes_differ_from_gbm():
+    gbm = FakePriceProvider("gbm", seed=1).get_adjusted_close("AAPL", 5000)
+    jumps = FakePriceProvider("jump_diffusion", seed=1).get_adjusted_close("AAPL", 5000)
+    regimes = FakePriceProvider("regime_switching", seed=1)
+    regime_prices = regimes.get_adjusted_close("AAPL", 5000)
+
+    assert _kurtosis(gbm) < 3.5
+    assert _kurtosis(jumps) > 4.0
+    assert _kurtosis(regime_prices) > 4.0
+
+
+def test_bulk_fetch_matches_single_fetches():
+    provider = FakePriceProvider("gapped", seed=5)
+    tickers = ["A", "B", "A", "C"]
+    bulk = provider.get_adjusted_close_many(tickers, 252)
+
+    assert bulk.tickers == tickers
+    assert bulk.failures == {}
+    for i, ticker in enumerate(tickers):
+        single = provider.get_adjusted_close(ticker, 252)
+        assert bulk.lengths[i] == single.size
+        np.testing.assert_array_equal(bulk.prices[i, -single.size :], single)
+
+
+def test_saved_universe_is_memory_mapped(tmp_path):
+    universe = SyntheticUniverse("regime_switching", seed=11, history_days=400)
+    tickers = synthetic_tickers(50)
+    path = tmp_path / "universe.f64"
+    universe.save(path, tickers)
+
+    loaded = SyntheticUniverse.load(path)
+    assert isinstance(loaded.history("SYN00010"), np.memmap)
+    assert (loaded.model, loaded.seed, loaded.history_days) == (
+        "regime_switching",
+        11,
+        400,
+    )
+    for ticker in (*tickers[:5], "NOT_SAVED"):
+        np.testing.assert_array_equal(
+            loaded.prices(ticker, 100), universe.prices(ticker, 100)
+        )
+
+    provider = FakePriceProvider("regime_switching", universe=loaded)
+    np.testing.assert_array_equal(
+        provider.get_adjusted_close("SYN00003", 30), universe.prices("SYN00003", 30)
+    )
+
+
+def test_memory_mapped_bulk_fetch_matches_single_fetches(tmp_path):
+    universe = SyntheticUniverse("gapped", seed=4, history_days=300)
+    path = tmp_path / "universe.f64"
+    universe.save(path, synthetic_tickers(5))
+    provider = FakePriceProvider("gapped", universe=SyntheticUniverse.load(path))
+    tickers = ["SYN00001", "NOT_SAVED", "SYN00004", "SYN00001"]
+
+    bulk = provider.get_adjusted_close_many(tickers, 120)
+
+    assert bulk.prices.shape == (4, int(bulk.lengths.max()))
+    for i, ticker in enumerate(tickers):
+        single = universe.prices(ticker, 120)
+        assert bulk.lengths[i] == single.size
+        np.testing.assert_array_equal(bulk.prices[i, -single.size :], single)
+        assert np.isnan(bulk.prices[i, : bulk.prices.shape[1] - single.size]).all()
+
+
+def test_universe_model_must_match_fixture():
+    with pytest.raises(ValueError):
+        FakePriceProvider("gbm", universe=SyntheticUniverse("gapped"))
+    with pytest.raises(ValueError):
+        SyntheticUniverse("brownian")  # type: ignore[arg-type]
+
+
+class TickerEchoLLMClient(FakeLLMClient):
+    """Routes every query to total_return over 252 days for the SYN ticker named."""
+
+    def __init__(self) -> None:
+        super().__init__("")
+
+    def complete(self, messages: Sequence[Message]) -> str:
+        ticker = re.findall(r"SYN\d{5}", messages[1]["content"])[-1]
+        intent = {"tickers": [ticker], "time_range": {"n_days": 252}}
+        return json.dumps(
+            {"type": "intent", "intent": {**intent, "tool": "total_return"}}
+        )
+
+
+def test_batch_over_a_synthetic_universe():
+    tickers = synthetic_tickers(300)
+    provider = FakePriceProvider("jump_diffusion", seed=2)
+
+    outcomes = list(
+        run_batch(
+            (f"total return {t} last year" for t in tickers),
+            TickerEchoLLMClient(),
+            provider,
+            coalesce_fetches=True,
+        )
+    )
+
+    assert len(outcomes) == len(tickers)
+    for ticker, (_, out) in zip(tickers, outcomes, strict=True):
+        assert isinstance(out, Result)
+        assert out.tickers == [ticker]
+        expected = total_return(provider.get_adjusted_close(ticker, 252), Params())
+        assert out.value == pytest.approx(expected)
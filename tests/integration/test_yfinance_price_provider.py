@@ -118,3 +118,92 @@ def test_yfinance_provider_non_finite_prices_raise(patch_yfinance_history, capsy
         provider.get_adjusted_close("AAPL", n_days=5)
 
     _assert_no_output(capsys)
+
+
+def test_yfinance_provider_bulk_uses_single_download(monkeypatch, capsys):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append((list(tickers), kwargs))
+        print("noise to stdout")
+        close = pd.DataFrame(
+            {
+                "AAPL": [100.0, 101.0, 102.0],
+                "MSFT": [np.nan, 200.0, 210.0],
+                "BAD": [1.0, -1.0, 2.0],
+            }
+        )
+        return pd.concat({"Close": close}, axis=1)
+
+    import yfinance
+
+    monkeypatch.setattr(yfinance, "download", fake_download)
+
+    provider = YFinancePriceProvider()
+    bulk = provider.get_adjusted_close_many(["AAPL", "MSFT", "BAD", "NOPE"], 3)
+
+    assert len(calls) == 1
+    assert calls[0][0] == ["AAPL", "MSFT", "BAD", "NOPE"]
+    assert calls[0][1]["auto_adjust"] is True
+    assert bulk.lengths.tolist() == [3, 2, 0, 0]
+    np.testing.assert_array_equal(bulk.row("MSFT"), [200.0, 210.0])
+    assert bulk.failures == {"BAD": "non positive prices", "NOPE": "no price data"}
+
+    _assert_no_output(capsys)
+
+
+def test_yfinance_provider_bulk_download_error_reports_failures(monkeypatch):
+    def failing_download(tickers, **kwargs):
+        raise RuntimeError("network down")
+
+    import yfinance
+
+    monkeypatch.setattr(yfinance, "download", failing_download)
+
+    bulk = YFinancePriceProvider().get_adjusted_close_many(["AAPL", "MSFT"], 3)
+
+    assert set(bulk.failures) == {"AAPL", "MSFT"}
+    assert bulk.prices.shape == (2, 0)
+
+
+def test_yfinance_provider_coerces_object_close_column(patch_yfinance_history):
+    df = pd.DataFrame({"Close": ["100.0", "n/a", 101.5, None, "103"]})
+    patch_yfinance_history(df)
+
+    prices = YFinancePriceProvider().get_adjusted_close("AAPL", n_days=5)
+
+    np.testing.assert_array_equal(prices, [100.0, 101.5, 103.0])
+    assert prices.flags.c_contiguous
+
+
+def test_yfinance_provider_nullable_float_column(patch_yfinance_history):
+    df = pd.DataFrame({"Close": pd.array([100.0, None, 102.0], dtype="Float64")})
+    patch_yfinance_history(df)
+
+    prices = YFinancePriceProvider().get_adjusted_close("AAPL", n_days=5)
+
+    assert prices.dtype == np.float64
+    np.testing.assert_array_equal(prices, [100.0, 102.0])
+
+
+def test_yfinance_provider_negative_infinity_is_non_finite(patch_yfinance_history):
+    df = pd.DataFrame({"Close": [100.0, -np.inf, 105.0]})
+    patch_yfinance_history(df)
+
+    with pytest.raises(PriceProviderError, match="non finite prices"):
+        YFinancePriceProvider().get_adjusted_close("AAPL", n_days=5)
+
+
+def test_yfinance_provider_module_does_not_import_pandas():
+    import subprocess
+
+    code = (
+        "import sys\n"
+        "import quantcli.data.yfinance_price_provider\n"
+        "print(sorted(m for m in ('pandas', 'yfinance') if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert out.strip() == "[]"
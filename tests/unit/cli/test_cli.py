@@ -1,4 +1,9 @@
+import io
 import json
+import threading
+import time
+
+import pytest
 
 from quantcli.cli import cli
 from quantcli.data.fake_price_provider import FakePriceProvider
@@ -186,3 +191,144 @@ def test_cli_debug_logs_to_file(tmp_path, capsys, monkeypatch):
         rec = json.loads(line)
         assert "event" in rec
         assert "cid" in rec
+
+
+def test_cli_batch_file_writes_one_line_per_query(tmp_path, capsys, monkeypatch):
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    monkeypatch.delenv("QUANTCLI_DEBUG_PATH", raising=False)
+    batch = tmp_path / "queries.txt"
+    batch.write_text("first query\n\n  second query  \nthird query\n")
+    seen = {}
+
+    def fake_run_batch(queries, llm_client, price_provider, args):
+        seen["queries"] = list(queries)
+        seen["route_workers"] = args.route_workers
+        for i, q in enumerate(seen["queries"]):
+            if q == "second query":
+                yield f"cid{i}", Refusal(
+                    reason="AMBIGUOUS",
+                    clarifying_question=None,
+                    allowed_capabilities=supported_tools(),
+                )
+            else:
+                yield f"cid{i}", Result(
+                    tool=ToolName.total_return,
+                    tickers=["AAPL"],
+                    value=float(i),
+                    metadata={},
+                )
+
+    code = cli(
+        ["--batch", str(batch), "--route-workers", "2"],
+        llm_factory=lambda: FakeLLMClient("valid response"),
+        provider_factory=FakePriceProvider,
+        run_batch_fn=fake_run_batch,
+    )
+
+    captured = capsys.readouterr()
+    assert captured.err == ""
+    lines = [json.loads(line) for line in captured.out.splitlines()]
+    assert seen == {
+        "queries": ["first query", "second query", "third query"],
+        "route_workers": 2,
+    }
+    assert [line.get("value") for line in lines] == [0.0, None, 2.0]
+    assert lines[1]["reason"] == "AMBIGUOUS"
+    assert code == 2
+
+
+def test_cli_batch_failure_keeps_one_line_per_query(tmp_path, capsys, monkeypatch):
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    batch = tmp_path / "queries.txt"
+    batch.write_text("q1\nq2\nq3\nq4\n")
+
+    def failing_run_batch(queries, llm_client, price_provider, args):
+        it = iter(queries)
+        next(it)
+        next(it)  # read ahead, like the pipeline
+        yield "cid0", Result(
+            tool=ToolName.total_return, tickers=["AAPL"], value=1.0, metadata={}
+        )
+        raise RuntimeError("boom")
+
+    code = cli(
+        ["--batch", str(batch)],
+        llm_factory=lambda: FakeLLMClient("valid response"),
+        provider_factory=FakePriceProvider,
+        run_batch_fn=failing_run_batch,
+    )
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 2
+    assert len(lines) == 4
+    assert lines[0]["value"] == 1.0
+    assert all(line["reason"] == "Unexpected internal error." for line in lines[1:])
+
+
+class SlowLines(io.StringIO):
+    """stdin whose lines arrive slowly, so a reader sits inside the read."""
+
+    def __next__(self):
+        time.sleep(0.001)
+        return super().__next__()
+
+
+def test_cli_batch_failure_while_feed_thread_reads(capsys, monkeypatch):
+    # like the real pipeline: a feed thread keeps pulling queries while the
+    # consumer side fails, and the error path must not race it for the input
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    monkeypatch.setattr("sys.stdin", SlowLines("".join(f"q{i}\n" for i in range(200))))
+    pulled = threading.Event()
+
+    def racing_run_batch(queries, llm_client, price_provider, args):
+        def feed():
+            for _ in queries:
+                pulled.set()
+
+        threading.Thread(target=feed, daemon=True).start()
+        pulled.wait(5)
+        yield "cid0", Result(
+            tool=ToolName.total_return, tickers=["AAPL"], value=1.0, metadata={}
+        )
+        raise RuntimeError("boom")
+
+    code = cli(
+        ["--batch", "-"],
+        llm_factory=lambda: FakeLLMClient("valid response"),
+        provider_factory=FakePriceProvider,
+        run_batch_fn=racing_run_batch,
+    )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert code == 2
+    assert len(lines) == 200
+
+
+def test_cli_batch_stdin_end_to_end(capsys, monkeypatch):
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    monkeypatch.setenv("QUANTCLI_INTENT_CACHE", "0")
+    monkeypatch.delenv("QUANTCLI_FAST_PATH", raising=False)
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.StringIO("max drawdown AAPL last 10 days\ntotal return MSFT last 5 days\n"),
+    )
+
+    code = cli(
+        ["--batch", "-"],
+        llm_factory=lambda: FakeLLMClient("not valid json"),
+        provider_factory=FakePriceProvider,
+    )
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert code == 0
+    assert [line["tool"] for line in lines] == ["max_drawdown", "total_return"]
+    assert [line["tickers"] for line in lines] == [["AAPL"], ["MSFT"]]
+
+
+def test_cli_batch_and_query_are_exclusive(capsys):
+    with pytest.raises(SystemExit):
+        cli(["--batch", "-", "total return AAPL"])
+    with pytest.raises(SystemExit):
+        cli([])
+    with pytest.raises(SystemExit):
+        cli(["--batch", "-", "--fetch-workers", "0"])
@@ -0,0 +1,51 @@
+import json
+import subprocess
+import sys
+
+from quantcli.observability.import_report import best_of, measure_stages
+
+# Recorded cold-start budget for `import quantcli.cli` (interpreter startup
+# excluded). It measures ~30-50 ms today; loading numpy, pydantic or an SDK
+# eagerly again costs several times that.
+CLI_IMPORT_BUDGET_MS = 150.0
+
+HEAVY_MODULES = ("numpy", "pydantic", "anthropic", "httpx", "pandas", "yfinance")
+
+
+def _loaded_heavy_modules(code: str) -> list[str]:
+    script = (
+        "import json, sys\n"
+        f"{code}\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "sys.stderr.write(json.dumps(heavy))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=60
+    )
+    loaded: list[str] = json.loads(proc.stderr.strip().splitlines()[-1])
+    return loaded
+
+
+def test_cli_import_loads_no_heavy_modules():
+    assert _loaded_heavy_modules("import quantcli.cli") == []
+
+
+def test_help_loads_no_heavy_modules():
+    code = (
+        "from quantcli.daemon import main\n"
+        "try:\n"
+        "    main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+    assert _loaded_heavy_modules(code) == []
+
+
+def test_cli_cold_import_within_budget():
+    stages = (("cli", "quantcli.cli"),)
+    (timing,) = best_of([measure_stages(stages) for _ in range(3)])
+
+    assert timing.total_us / 1000 < CLI_IMPORT_BUDGET_MS, (
+        f"import quantcli.cli took {timing.total_us / 1000:.1f} ms "
+        f"(budget {CLI_IMPORT_BUDGET_MS} ms); heaviest: {timing.top_packages}"
+    )
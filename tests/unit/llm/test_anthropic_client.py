@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from quantcli.llm.anthropic_client import AnthropicLLMClient
+
+
+def test_sdk_client_is_created_once_and_shared_across_threads():
+    llm = AnthropicLLMClient(api_key="test", pool_size=4)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: llm._sdk_client(), range(32)))
+    assert len({id(c) for c in clients}) == 1
+    llm.close()
+
+
+def test_close_releases_pool_and_next_use_reopens():
+    with AnthropicLLMClient(api_key="test") as llm:
+        first = llm._sdk_client()
+    assert llm._client is None
+
+    second = llm._sdk_client()
+    assert second is not first
+    llm.close()
+    llm.close()  # idempotent
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        AnthropicLLMClient(pool_size=0)
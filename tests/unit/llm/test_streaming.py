@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from quantcli.llm.errors import LLMError
+from quantcli.llm.fake_llm_client import FakeStreamingLLMClient
+from quantcli.llm.streaming import TopLevelObjectScanner, read_top_level_object
+from quantcli.observability.debug import init_logging_from_env
+from quantcli.router.router import route_query
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.refusal import Refusal
+
+INTENT_CHUNKS = [
+    '{"type": "intent", ',
+    '"intent": {"tickers": ["AAPL"], ',
+    '"time_range": {"n_days": 10}, "tool": "total_return"}',
+    "}",
+    "\n\nThe JSON above",
+    " captures the request.",
+]
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        (['{"a": 1}', " trailing"], '{"a": 1}'),
+        (['{"a": {"b"', ": {}}", "} tail"], '{"a": {"b": {}}}'),
+        (['{"a": "}{"}', "x"], '{"a": "}{"}'),
+        (['{"a": "\\"}', '"}', "x"], '{"a": "\\"}"}'),
+        (["  ", '{"a"', ":", " 1}{"], '  {"a": 1}'),
+    ],
+)
+def test_scanner_stops_at_top_level_close(chunks, expected):
+    out = read_top_level_object(chunks)
+    assert out.object_closed
+    assert out.text == expected
+    assert json.loads(out.text) == json.loads(expected)
+
+
+def test_scanner_never_closing_returns_everything():
+    out = read_top_level_object(['{"a": ', "1"])
+    assert not out.object_closed
+    assert out.text == '{"a": 1'
+
+    scanner = TopLevelObjectScanner()
+    assert scanner.feed("no json here }") is None
+
+
+def test_read_top_level_object_closes_stream_early():
+    llm = FakeStreamingLLMClient(INTENT_CHUNKS)
+    out = read_top_level_object(llm.stream([]))
+
+    assert out.object_closed
+    assert out.first_chunk_at is not None
+    assert llm.chunks_read == 4
+    assert llm.stream_closed
+
+
+def test_route_query_streams_and_logs_ttft(capsys, monkeypatch, cid):
+    monkeypatch.setenv("QUANTCLI_DEBUG", "1")
+    monkeypatch.delenv("QUANTCLI_DEBUG_PATH", raising=False)
+    init_logging_from_env()
+
+    llm = FakeStreamingLLMClient(INTENT_CHUNKS)
+    out = route_query("total return AAPL 10 days", llm, cid)
+
+    monkeypatch.delenv("QUANTCLI_DEBUG")
+    init_logging_from_env()
+
+    assert isinstance(out, Intent)
+    assert out.tickers == ["AAPL"]
+    assert llm.chunks_read == 4
+    records = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    (end,) = [r for r in records if r["event"] == "llm_call_end"]
+    assert 0 <= end["ttft_ms"] <= end["elapsed_ms"]
+
+
+def test_route_query_stream_error_is_refusal(cid):
+    llm = FakeStreamingLLMClient(LLMError(kind="timeout"))
+    out = route_query("total return AAPL 10 days", llm, cid)
+
+    assert isinstance(out, Refusal)
+    assert out.reason == "Unable to process this request right now."
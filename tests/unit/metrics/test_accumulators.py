@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from quantcli.schemas.params import Params
+from quantcli.schemas.tool_name import ToolName
+from quantcli.tools.accumulators import (
+    MaxDrawdownAccumulator,
+    RealizedVolatilityAccumulator,
+    SharpeRatioAccumulator,
+    TotalReturnAccumulator,
+)
+from quantcli.tools.registry import ACCUMULATOR_REGISTRY, get_metric
+
+
+def _random_walk(n: int, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=n)))
+
+
+def _params_for(tool: ToolName) -> Params:
+    if tool == ToolName.sharpe_ratio:
+        return Params(window=5, risk_free_rate=0.02)
+    if tool == ToolName.realized_volatility:
+        return Params(window=5)
+    return Params()
+
+
+@pytest.mark.parametrize("tool", list(ACCUMULATOR_REGISTRY))
+def test_accumulator_matches_batch_kernel_on_sliding_range(tool):
+    prices = _random_walk(80)
+    n_days = 20
+    params = _params_for(tool)
+    acc = ACCUMULATOR_REGISTRY[tool](params, n_days)
+
+    for end, price in enumerate(prices, start=1):
+        acc.push(price)
+        held = prices[max(0, end - n_days) : end]
+        try:
+            expected = get_metric(tool)(held, params)
+        except ValueError:
+            with pytest.raises(ValueError):
+                acc.value()
+            continue
+        assert acc.value() == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize("tool", list(ACCUMULATOR_REGISTRY))
+def test_accumulator_explicit_evict_matches_batch_kernel(tool):
+    prices = _random_walk(30, seed=9)
+    params = _params_for(tool)
+    acc = ACCUMULATOR_REGISTRY[tool](params, None)
+    reference: list[float] = []
+    for price in prices[:10]:
+        acc.push(price)
+        reference.append(price)
+
+    for price in prices[10:]:
+        acc.evict()
+        acc.push(price)
+        acc.push(price * 1.01)
+        acc.evict()
+        reference = reference[1:] + [price, price * 1.01]
+        reference = reference[1:]
+
+    expected = get_metric(tool)(np.array(reference, dtype=np.float64), params)
+    assert len(acc) == len(reference)
+    assert acc.value() == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_max_drawdown_accumulator_evicting_peak():
+    acc = MaxDrawdownAccumulator(Params())
+    for price in [200.0, 100.0, 110.0, 99.0]:
+        acc.push(price)
+    assert acc.value() == pytest.approx(0.505, abs=1e-12)
+
+    acc.evict()
+    assert acc.value() == pytest.approx(0.11 / 1.1, abs=1e-12)
+
+
+def test_accumulator_rejects_invalid_prices_without_mutation():
+    acc = TotalReturnAccumulator(Params())
+    acc.push(100.0)
+    acc.push(110.0)
+    for bad in (0.0, -1.0, np.nan, np.inf):
+        with pytest.raises(ValueError):
+            acc.push(bad)
+    assert len(acc) == 2
+    assert acc.value() == pytest.approx(0.1, abs=1e-12)
+
+
+def test_accumulator_insufficient_data_raises():
+    with pytest.raises(ValueError):
+        TotalReturnAccumulator(Params()).value()
+    with pytest.raises(ValueError):
+        MaxDrawdownAccumulator(Params()).evict()
+
+    acc = RealizedVolatilityAccumulator(Params(window=3))
+    for price in [100.0, 101.0, 102.0]:
+        acc.push(price)
+    with pytest.raises(ValueError):
+        acc.value()
+
+
+def test_sharpe_ratio_accumulator_zero_vol_raises():
+    acc = SharpeRatioAccumulator(Params(window=3))
+    for price in [100, 110, 121, 133.1]:
+        acc.push(price)
+    with pytest.raises(ValueError):
+        acc.value()
+
+
+def test_accumulator_param_contract():
+    with pytest.raises(ValueError):
+        TotalReturnAccumulator(Params(window=3))
+    with pytest.raises(ValueError):
+        MaxDrawdownAccumulator(Params(window=3))
+    with pytest.raises(ValueError):
+        RealizedVolatilityAccumulator(Params(window=None))
+    with pytest.raises(ValueError):
+        SharpeRatioAccumulator(Params(window=1))
+    with pytest.raises(ValueError):
+        SharpeRatioAccumulator(Params(window=3, risk_free_rate=np.nan))
+    with pytest.raises(ValueError):
+        RealizedVolatilityAccumulator(Params(window=3), maxlen=3)
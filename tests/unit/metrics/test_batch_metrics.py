@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from quantcli.schemas.params import Params
+from quantcli.schemas.tool_name import ToolName
+from quantcli.tools.batch_metrics import (
+    max_drawdown_batch,
+    realized_volatility_batch,
+    sharpe_ratio_batch,
+    total_return_batch,
+)
+from quantcli.tools.registry import BATCH_TOOL_REGISTRY, TOOL_REGISTRY, get_metric
+
+ROWS = [
+    [100.0, 200.0, 300.0, 330.0, 300.0, 310.0],
+    [50.0, 49.0, 52.0, 48.0, 55.0, 53.0],
+    [10.0, 11.0, 12.1, 11.0, 10.0, 12.0],
+]
+
+
+def _params_for(tool: ToolName) -> Params:
+    if tool in (ToolName.realized_volatility, ToolName.sharpe_ratio):
+        return Params(window=3, risk_free_rate=0.0)
+    return Params()
+
+
+@pytest.mark.parametrize("tool", list(BATCH_TOOL_REGISTRY))
+def test_batch_matches_single_kernel_per_row(tool):
+    prices = np.array(ROWS, dtype=np.float64)
+    params = _params_for(tool)
+
+    out = BATCH_TOOL_REGISTRY[tool](prices, None, params)
+    expected = [get_metric(tool)(row, params) for row in prices]
+
+    assert out.shape == (len(ROWS),)
+    assert out == pytest.approx(expected, abs=1e-12)
+
+
+@pytest.mark.parametrize("tool", list(BATCH_TOOL_REGISTRY))
+def test_batch_ragged_rows_match_trimmed_single_kernel(tool):
+    prices = np.array(ROWS, dtype=np.float64)
+    prices[1, :2] = np.nan  # padding is ignored
+    lengths = np.array([6, 4, 5], dtype=np.int64)
+    params = _params_for(tool)
+
+    out = BATCH_TOOL_REGISTRY[tool](prices, lengths, params)
+    expected = [
+        get_metric(tool)(row[len(row) - n :], params)
+        for row, n in zip(prices, lengths, strict=True)
+    ]
+
+    assert out == pytest.approx(expected, abs=1e-12)
+
+
+def test_max_drawdown_batch_padding_does_not_set_peak():
+    prices = np.array([[1000.0, 0.5, 0.4, 0.5]], dtype=np.float64)
+    out = max_drawdown_batch(prices, np.array([3]), Params())
+    assert out[0] == pytest.approx(0.2, abs=1e-12)
+
+
+def test_batch_unusable_rows_are_nan():
+    prices = np.array(
+        [
+            [100.0, 101.0, 102.0, 103.0],
+            [100.0, np.nan, 102.0, 103.0],
+            [100.0, 0.0, 102.0, 103.0],
+            [100.0, 101.0, 102.0, 103.0],
+        ],
+        dtype=np.float64,
+    )
+    lengths = np.array([4, 4, 4, 1], dtype=np.int64)
+
+    out = total_return_batch(prices, lengths, Params())
+
+    assert out[0] == pytest.approx(0.03, abs=1e-12)
+    assert np.isnan(out[1:]).all()
+
+
+def test_batch_window_longer_than_history_is_nan():
+    prices = np.array(ROWS, dtype=np.float64)
+    lengths = np.array([6, 3, 4], dtype=np.int64)
+    out = realized_volatility_batch(prices, lengths, Params(window=3))
+
+    assert np.isfinite(out[0])
+    assert np.isnan(out[1])
+    assert np.isfinite(out[2])
+
+
+def test_sharpe_ratio_batch_zero_vol_row_is_nan():
+    prices = np.array(
+        [[100.0, 110.0, 121.0, 133.1], [100.0, 200.0, 300.0, 330.0]],
+        dtype=np.float64,
+    )
+    out = sharpe_ratio_batch(prices, None, Params(window=3))
+    assert np.isnan(out[0])
+    assert np.isfinite(out[1])
+
+
+def test_batch_type_and_shape_contract():
+    params = Params()
+    with pytest.raises(TypeError):
+        total_return_batch([[100.0, 110.0]], None, params)
+    with pytest.raises(ValueError):
+        total_return_batch(np.array([100.0, 110.0]), None, params)
+    with pytest.raises(TypeError):
+        total_return_batch(np.ones((2, 3)), [3, 3], params)
+    with pytest.raises(ValueError):
+        total_return_batch(np.ones((2, 3)), np.array([3]), params)
+    with pytest.raises(ValueError):
+        total_return_batch(np.ones((2, 3)), np.array([3, 4]), params)
+    with pytest.raises(ValueError):
+        total_return_batch(np.ones((2, 3)), np.array([3.0, 3.0]), params)
+
+
+def test_batch_param_contract():
+    prices = np.ones((2, 5))
+    with pytest.raises(ValueError):
+        total_return_batch(prices, None, Params(window=2))
+    with pytest.raises(ValueError):
+        max_drawdown_batch(prices, None, Params(window=2))
+    with pytest.raises(ValueError):
+        realized_volatility_batch(prices, None, Params(window=None))
+    with pytest.raises(ValueError):
+        sharpe_ratio_batch(prices, None, Params(window=1))
+    with pytest.raises(ValueError):
+        sharpe_ratio_batch(prices, None, Params(window=2, risk_free_rate=np.inf))
+
+
+def test_batch_registry_is_subset_of_tool_registry():
+    assert set(BATCH_TOOL_REGISTRY).issubset(set(TOOL_REGISTRY))
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from quantcli.schemas.params import Params
+from quantcli.tools.accumulators import SharpeRatioAccumulator
+from quantcli.tools.batch_metrics import sharpe_ratio_batch
+from quantcli.tools.metrics import realized_volatility, sharpe_ratio
+from quantcli.tools.rolling_metrics import rolling_sharpe_ratio, rolling_volatility
+
+
+def _random_walk(n: int, seed: int = 7, level: float = 100.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return level * np.exp(np.cumsum(rng.normal(0.0005, 0.01, size=n)))
+
+
+def test_rolling_volatility_matches_point_kernel_at_every_date():
+    prices = _random_walk(60)
+    window = 10
+    params = Params(window=window, annualization_factor=252)
+
+    series = rolling_volatility(prices, params)
+
+    assert series.shape == (prices.size - window,)
+    expected = [
+        realized_volatility(prices[: end + 1], params)
+        for end in range(window, prices.size)
+    ]
+    assert series == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_rolling_sharpe_ratio_matches_point_kernel_at_every_date():
+    prices = _random_walk(60, seed=11)
+    window = 15
+    params = Params(window=window, risk_free_rate=0.03)
+
+    series = rolling_sharpe_ratio(prices, params)
+
+    expected = [
+        sharpe_ratio(prices[: end + 1], params) for end in range(window, prices.size)
+    ]
+    assert series == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_rolling_volatility_stable_for_high_price_level():
+    # small returns on a large level stress the sum-of-squares formulation
+    prices = _random_walk(500, seed=3, level=1e8) + 1e9
+    params = Params(window=20)
+
+    series = rolling_volatility(prices, params)
+
+    assert series[-1] == pytest.approx(realized_volatility(prices, params), rel=1e-7)
+    assert (series >= 0).all()
+
+
+def test_rolling_volatility_constant_growth_is_zero():
+    prices = 100.0 * 1.1 ** np.arange(8)
+    series = rolling_volatility(prices, Params(window=3))
+    assert series == pytest.approx(np.zeros(5), abs=1e-12)
+
+
+def test_rolling_sharpe_ratio_zero_vol_window_is_nan():
+    prices = np.array([100.0, 101.0, 103.0, 103.0, 103.0, 103.0], dtype=np.float64)
+    params = Params(window=2)
+
+    series = rolling_sharpe_ratio(prices, params)
+
+    assert np.isnan(series[2:]).all()
+    for k in range(2):
+        assert series[k] == pytest.approx(sharpe_ratio(prices[: k + 3], params))
+
+
+def test_rolling_sharpe_ratio_constant_growth_is_nan():
+    prices = 100.0 * 1.1 ** np.arange(8)
+    assert np.isnan(rolling_sharpe_ratio(prices, Params(window=3))).all()
+    assert (rolling_volatility(prices, Params(window=3)) == 0.0).all()
+
+
+def test_rolling_sharpe_ratio_low_vol_series_is_defined():
+    rng = np.random.default_rng(5)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(1e-9, 1e-9, 60)))
+    params = Params(window=20)
+
+    series = rolling_sharpe_ratio(prices, params)
+
+    assert np.isfinite(series).all()
+    excess = np.diff(np.log(prices))[-20:]
+    expected = np.mean(excess) / np.std(excess, ddof=1) * np.sqrt(252)
+    assert series[-1] == pytest.approx(expected, rel=1e-4)
+
+
+def test_rolling_contracts():
+    prices = np.array([100.0, 101.0, 103.0, 102.0], dtype=np.float64)
+    for fn in (rolling_volatility, rolling_sharpe_ratio):
+        with pytest.raises(TypeError):
+            fn([100.0, 101.0, 102.0], Params(window=2))
+        with pytest.raises(ValueError):
+            fn(prices, Params(window=None))
+        with pytest.raises(ValueError):
+            fn(prices, Params(window=1))
+        with pytest.raises(ValueError):
+            fn(prices, Params(window=4))
+        with pytest.raises(ValueError):
+            fn(np.array([100.0, 0.0, 101.0, 102.0]), Params(window=2))
+        with pytest.raises(ValueError):
+            fn(np.array([100.0, np.nan, 101.0, 102.0]), Params(window=2))
+
+
+@pytest.mark.parametrize("tail_vol", [0.0, 1e-9])
+def test_sharpe_kernels_share_the_zero_vol_rule(tail_vol):
+    # noisy history, then a constant-growth (flat) or very low-vol tail
+    rng = np.random.default_rng(9)
+    returns = np.concatenate(
+        [rng.normal(0.0, 0.01, 30), 0.001 + rng.normal(0.0, 1.0, 25) * tail_vol]
+    )
+    prices = 100.0 * np.exp(np.concatenate(([0.0], np.cumsum(returns))))
+    params = Params(window=20)
+
+    rolling = rolling_sharpe_ratio(prices, params)[-1]
+    batch = sharpe_ratio_batch(prices[None, :], None, params)[0]
+    acc = SharpeRatioAccumulator(params)
+    for p in prices:
+        acc.push(float(p))
+
+    if tail_vol == 0.0:
+        assert np.isnan(rolling) and np.isnan(batch)
+        with pytest.raises(ValueError):
+            sharpe_ratio(prices, params)
+        with pytest.raises(ValueError):
+            acc.value()
+    else:
+        point = sharpe_ratio(prices, params)
+        assert np.isfinite(point)
+        assert rolling == pytest.approx(point, rel=1e-4)
+        assert batch == pytest.approx(point, rel=1e-9)
+        assert acc.value() == pytest.approx(point, rel=1e-4)
@@ -2,7 +2,12 @@ import numpy as np
 import pytest
 
 from quantcli.schemas.params import Params
-from quantcli.tools.metrics import total_return
+from quantcli.tools.metrics import (
+    PreparedPrices,
+    max_drawdown_prepared,
+    total_return,
+    total_return_prepared,
+)
 
 
 def test_total_return_basic():
@@ -63,3 +68,12 @@ def test_total_return_negative_or_zero():
     prices = np.array([100, -10, 120], dtype=np.float64)
     with pytest.raises(ValueError):
         total_return(prices, params)
+
+
+def test_prepared_prices_shares_intermediates_across_kernels():
+    prepared = PreparedPrices(np.array([100.0, 120.0, 90.0, 110.0], dtype=np.float64))
+
+    assert prepared.log_returns is prepared.log_returns
+    assert prepared.cumulative_max is prepared.cumulative_max
+    assert total_return_prepared(prepared, Params()) == pytest.approx(0.1)
+    assert max_drawdown_prepared(prepared, Params()) == pytest.approx(0.25)
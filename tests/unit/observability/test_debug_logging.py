@@ -44,3 +44,144 @@ def test_debug_logger_enabled_writes_jsonl_to_file(tmp_path, cid):
     assert rec["cid"] == cid
     assert rec["foo"] == 1
     assert "ts" in rec
+
+
+def _async_logger(path, **overrides):
+    config = DebugConfig(enabled=True, path=str(path), async_mode=True, **overrides)
+    return DebugLogger(config)
+
+
+def _read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_async_logger_writes_all_events_in_order(tmp_path, cid):
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path)
+
+    for i in range(100):
+        logger.log_event("tick", cid=cid, i=i)
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    events = _read_events(log_path)
+    assert [e["i"] for e in events] == list(range(100))
+    assert all(e["cid"] == cid for e in events)
+
+
+def test_async_logger_does_not_write_on_caller_thread(tmp_path, cid, monkeypatch):
+    import threading
+
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path)
+    writers = set()
+    sink = logger._sink()
+    real_write = sink.write
+
+    def recording_write(text):
+        writers.add(threading.current_thread().name)
+        return real_write(text)
+
+    monkeypatch.setattr(sink, "write", recording_write)
+    logger.log_event("tick", cid=cid)
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    assert writers == {"quantcli-debug-writer"}
+
+
+def test_async_drop_oldest_reports_dropped_count(tmp_path, cid):
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path, queue_size=10)
+    writer = logger._writer
+    assert writer is not None
+    # holding the writer's condition keeps it from draining, so the queue
+    # overflows deterministically
+    with writer._idle:
+        for i in range(25):
+            writer.put({"event": "tick", "cid": cid, "i": i})
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    events = _read_events(log_path)
+    ticks = [e["i"] for e in events if e["event"] == "tick"]
+    dropped = [e for e in events if e["event"] == "debug_events_dropped"]
+    assert ticks == list(range(15, 25))
+    assert [(e["dropped"], e["dropped_total"]) for e in dropped] == [(15, 15)]
+
+
+def test_async_drop_newest_keeps_first_events(tmp_path, cid):
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path, queue_size=10, overflow="drop_newest")
+    writer = logger._writer
+    assert writer is not None
+    with writer._idle:
+        for i in range(25):
+            writer.put({"event": "tick", "cid": cid, "i": i})
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    events = _read_events(log_path)
+    assert [e["i"] for e in events if e["event"] == "tick"] == list(range(10))
+    assert (
+        sum(e["dropped"] for e in events if e["event"] == "debug_events_dropped") == 15
+    )
+
+
+def test_async_logger_close_flushes_pending_events(tmp_path, cid):
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path)
+
+    for i in range(10):
+        logger.log_event("tick", cid=cid, i=i)
+    logger.close()
+
+    assert len(_read_events(log_path)) == 10
+
+
+def test_async_logger_stderr_never_stdout(capsys, cid):
+    logger = DebugLogger(DebugConfig(enabled=True, path=None, async_mode=True))
+
+    logger.log_event("test_event", cid=cid, foo=1)
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert json.loads(captured.err)["event"] == "test_event"
+
+
+def test_async_logger_unserializable_field_never_raises(tmp_path, cid):
+    log_path = tmp_path / "debug.log"
+    logger = _async_logger(log_path)
+
+    logger.log_event("odd", cid=cid, value=object())
+    assert logger.flush(timeout_s=5)
+    logger.close()
+
+    (event,) = _read_events(log_path)
+    assert event["value"].startswith("<object object")
+
+
+def test_async_mode_read_from_env(monkeypatch):
+    from quantcli.observability.debug import _read_config
+
+    monkeypatch.setenv("QUANTCLI_DEBUG", "1")
+    monkeypatch.setenv("QUANTCLI_DEBUG_ASYNC", "1")
+    monkeypatch.setenv("QUANTCLI_DEBUG_QUEUE_SIZE", "64")
+    monkeypatch.setenv("QUANTCLI_DEBUG_OVERFLOW", "drop_newest")
+
+    config = _read_config()
+
+    assert config.async_mode is True
+    assert config.queue_size == 64
+    assert config.overflow == "drop_newest"
+
+
+def test_bad_queue_size_env_falls_back(monkeypatch):
+    from quantcli.observability.debug import _read_config
+
+    monkeypatch.setenv("QUANTCLI_DEBUG_QUEUE_SIZE", "lots")
+
+    assert _read_config().queue_size == 4096
@@ -0,0 +1,64 @@
+from quantcli.observability.import_report import (
+    StageTiming,
+    best_of,
+    format_report,
+    parse_importtime,
+)
+
+STAGES = (("first", "pkg_a"), ("second", "pkg_b"))
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       900 |        900 | site
+#quantcli-stage first
+import time:       100 |        100 |   pkg_a.helpers
+import time:       300 |        400 | pkg_a
+#quantcli-stage second
+import time:        50 |         50 |   json.decoder
+import time:       200 |        250 |   json
+import time:       700 |        700 |   numpy._core
+import time:      1000 |       1950 | pkg_b
+import time:        10 |         10 | pkg_b.extra
+"""
+
+
+def test_parse_groups_lines_by_stage_marker():
+    first, second = parse_importtime(IMPORTTIME, STAGES)
+
+    assert first == StageTiming(
+        name="first",
+        module="pkg_a",
+        total_us=400,
+        top_packages=[("pkg_a", 400)],
+    )
+    # only top-level lines add to the total; children are in their cumulative
+    assert second.total_us == 1960
+    assert second.top_packages == [("pkg_b", 1010), ("numpy", 700), ("json", 250)]
+
+
+def test_interpreter_startup_is_not_attributed():
+    timings = parse_importtime(IMPORTTIME, STAGES)
+
+    assert all(pkg != "site" for t in timings for pkg, _ in t.top_packages)
+
+
+def test_missing_stage_reports_zero():
+    (timing,) = parse_importtime("", (("never", "nothing"),))
+
+    assert timing.total_us == 0
+    assert timing.top_packages == []
+
+
+def test_best_of_takes_fastest_run_per_stage():
+    slow = StageTiming("s", "m", 900, [])
+    fast = StageTiming("s", "m", 300, [])
+
+    assert best_of([[slow, fast], [fast, slow]]) == [fast, fast]
+
+
+def test_format_report_has_running_total():
+    report = format_report(parse_importtime(IMPORTTIME, STAGES))
+
+    lines = report.splitlines()
+    assert lines[1].split()[:3] == ["first", "0.4", "0.4"]
+    assert lines[2].split()[:3] == ["second", "2.0", "2.4"]
@@ -0,0 +1,272 @@
+import io
+import json
+import pstats
+import threading
+import tracemalloc
+
+from quantcli.cli import cli
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.observability.profiling import (
+    ProfileConfig,
+    profile_config_from_env,
+    profiled,
+)
+from quantcli.observability.spans import span
+from quantcli.schemas.result import Result
+from quantcli.schemas.tool_name import ToolName
+
+INTENT_RESPONSE = json.dumps(
+    {
+        "type": "intent",
+        "intent": {
+            "tickers": ["AAPL"],
+            "time_range": {"n_days": 10},
+            "tool": "total_return",
+        },
+    }
+)
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(20_000))
+
+
+def test_profile_config_off_by_default(monkeypatch):
+    monkeypatch.delenv("QUANTCLI_PROFILE", raising=False)
+    config = profile_config_from_env()
+    assert not config.enabled
+    assert not config.sampled("abc")
+
+
+def test_profile_config_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("QUANTCLI_PROFILE", "1")
+    monkeypatch.setenv("QUANTCLI_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("QUANTCLI_PROFILE_SAMPLE", "10")
+    monkeypatch.setenv("QUANTCLI_PROFILE_MEMORY", "1")
+    config = profile_config_from_env()
+    assert config == ProfileConfig(
+        enabled=True, directory=tmp_path, sample_every=10, memory=True
+    )
+
+    monkeypatch.setenv("QUANTCLI_PROFILE_SAMPLE", "often")
+    assert profile_config_from_env().sample_every == 1
+    monkeypatch.setenv("QUANTCLI_PROFILE_SAMPLE", "0")
+    assert profile_config_from_env().sample_every == 1
+
+
+def test_profile_dir_defaults_under_cache_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("QUANTCLI_PROFILE", "1")
+    monkeypatch.delenv("QUANTCLI_PROFILE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert profile_config_from_env().directory == tmp_path / "quantcli" / "profiles"
+
+
+def test_sampling_is_one_in_n_and_stable_per_cid():
+    config = ProfileConfig(enabled=True, sample_every=4)
+    cids = [f"{i:012x}" for i in range(4000)]
+    sampled = [cid for cid in cids if config.sampled(cid)]
+    assert 800 < len(sampled) < 1200
+    assert all(config.sampled(cid) for cid in sampled)
+    assert all(ProfileConfig(enabled=True).sampled(cid) for cid in cids[:50])
+
+
+def test_profiled_writes_pstats_and_summary(tmp_path):
+    config = ProfileConfig(enabled=True, directory=tmp_path)
+    with profiled("cid1", config):
+        _busy()
+
+    stats = pstats.Stats(str(tmp_path / "cid1.pstats"))
+    assert any(func[2] == "_busy" for func in stats.stats)
+    assert "_busy" in (tmp_path / "cid1.profile.txt").read_text(encoding="utf-8")
+    assert not (tmp_path / "cid1.alloc.txt").exists()
+
+
+def test_unsampled_invocation_writes_nothing(tmp_path):
+    config = ProfileConfig(enabled=True, directory=tmp_path, sample_every=4)
+    cid = next(f"{i:x}" for i in range(100) if not config.sampled(f"{i:x}"))
+    with profiled(cid, config):
+        _busy()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_memory_mode_reports_allocations_per_stage(tmp_path):
+    config = ProfileConfig(enabled=True, directory=tmp_path, memory=True)
+    kept = []
+    with profiled("cid2", config):
+        with span("fetch", "cid2"):
+            kept.append(bytearray(512 * 1024))
+        with span("fetch", "other-cid"):
+            pass
+        with span("compute", "cid2"):
+            _busy()
+
+    assert not tracemalloc.is_tracing()
+    report = (tmp_path / "cid2.alloc.txt").read_text(encoding="utf-8")
+    assert report.startswith("peak traced memory:")
+    stages = [line.split(":")[0] for line in report.splitlines() if line[:3] == "== "]
+    assert stages == ["== fetch", "== compute", "== end"]
+    assert "test_profiling.py" in report
+
+
+def test_memory_mode_leaves_existing_tracing_running(tmp_path):
+    tracemalloc.start()
+    try:
+        config = ProfileConfig(enabled=True, directory=tmp_path, memory=True)
+        with profiled("cid3", config):
+            _busy()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_unwritable_profile_dir_does_not_fail(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("", encoding="utf-8")
+    config = ProfileConfig(enabled=True, directory=blocker / "profiles")
+    with profiled("cid4", config):
+        _busy()
+
+
+def test_cli_writes_profile_keyed_by_cid(capsys, monkeypatch, tmp_path):
+    monkeypatch.setenv("QUANTCLI_PROFILE", "1")
+    monkeypatch.setenv("QUANTCLI_PROFILE_DIR", str(tmp_path))
+    monkeypatch.delenv("QUANTCLI_PROFILE_SAMPLE", raising=False)
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    seen_cids = []
+
+    def fake_run_query(user_query, llm_client, price_provider, cid):
+        seen_cids.append(cid)
+        _busy()
+        return Result(
+            tool=ToolName.total_return,
+            tickers=["AAPL"],
+            value=0.12,
+            metadata={"range_n_days": 10},
+        )
+
+    code = cli(
+        ["total", "return", "AAPL", "10", "days"],
+        llm_factory=lambda: FakeLLMClient("valid response"),
+        provider_factory=FakePriceProvider,
+        run_query_fn=fake_run_query,
+    )
+
+    captured = capsys.readouterr()
+    assert code == 0
+    assert json.loads(captured.out)["value"] == 0.12
+    assert captured.err == ""
+    (cid,) = seen_cids
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"{cid}.profile.txt",
+        f"{cid}.pstats",
+    ]
+
+
+def _profiled_functions(path) -> set[str]:
+    return {func[2] for func in pstats.Stats(str(path)).stats}
+
+
+def _busy_in_worker() -> int:
+    return _busy()
+
+
+def test_thread_profiling_covers_worker_threads(tmp_path):
+    def run_worker():
+        worker = threading.Thread(target=_busy_in_worker)
+        worker.start()
+        worker.join()
+
+    config = ProfileConfig(enabled=True, directory=tmp_path)
+    with profiled("calling", config):
+        run_worker()
+    with profiled("all", config, threads=True):
+        run_worker()
+
+    assert "_busy_in_worker" not in _profiled_functions(tmp_path / "calling.pstats")
+    assert "_busy_in_worker" in _profiled_functions(tmp_path / "all.pstats")
+    assert threading.getprofile() is None
+
+
+def test_cli_batch_profile_includes_pipeline_workers(capsys, monkeypatch, tmp_path):
+    monkeypatch.setenv("QUANTCLI_PROFILE", "1")
+    monkeypatch.setenv("QUANTCLI_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("QUANTCLI_PROFILE_MEMORY", "1")
+    monkeypatch.delenv("QUANTCLI_PROFILE_SAMPLE", raising=False)
+    monkeypatch.delenv("QUANTCLI_DEBUG", raising=False)
+    monkeypatch.setenv("QUANTCLI_INTENT_CACHE", "0")
+    monkeypatch.setenv("QUANTCLI_FAST_PATH", "0")
+    monkeypatch.setattr("sys.stdin", io.StringIO("total return AAPL\n" * 3))
+
+    code = cli(
+        ["--batch", "-"],
+        llm_factory=lambda: FakeLLMClient(INTENT_RESPONSE),
+        provider_factory=FakePriceProvider,
+    )
+
+    assert code == 0
+    assert len(capsys.readouterr().out.splitlines()) == 3
+    (stats_path,) = tmp_path.glob("*.pstats")
+    functions = _profiled_functions(stats_path)
+    assert {"route_query", "total_return", "get_adjusted_close"} <= functions
+    report = stats_path.with_name(stats_path.stem + ".alloc.txt").read_text("utf-8")
+    assert "== end" in report
+    assert not tracemalloc.is_tracing()
+
+
+class _BrokenProfile:
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+
+def test_profiler_start_failure_runs_block_unprofiled(monkeypatch, tmp_path):
+    import cProfile
+
+    from quantcli.observability import profiling
+
+    monkeypatch.setattr(cProfile, "Profile", _BrokenProfile)
+    monkeypatch.setattr(profiling, "_FAILURE_LOGGED", False)
+    events = []
+    monkeypatch.setattr(
+        profiling, "log_event", lambda event, cid, **f: events.append(event)
+    )
+    config = ProfileConfig(enabled=True, directory=tmp_path, memory=True)
+
+    ran = []
+    for cid in ("a", "b"):
+        with profiled(cid, config):
+            ran.append(cid)
+
+    assert ran == ["a", "b"]
+    assert events == ["profile_fail"]  # logged once
+    assert list(tmp_path.iterdir()) == []
+    assert not tracemalloc.is_tracing()
+
+
+def test_block_exceptions_propagate_and_tracing_is_released(tmp_path):
+    config = ProfileConfig(enabled=True, directory=tmp_path, memory=True)
+    try:
+        with profiled("boom", config):
+            raise KeyError("from the query")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("exception swallowed")
+    assert not tracemalloc.is_tracing()
+    assert (tmp_path / "boom.pstats").exists()
+
+
+def test_overlapping_memory_sessions_share_tracemalloc(tmp_path):
+    config = ProfileConfig(enabled=True, directory=tmp_path, memory=True)
+    outer = profiled("outer", config)
+    outer.__enter__()
+    with profiled("inner", config):
+        _busy()
+    assert tracemalloc.is_tracing()  # still needed by "outer"
+    with span("compute", "outer"):
+        _busy()
+    outer.__exit__(None, None, None)
+
+    assert not tracemalloc.is_tracing()
+    report = (tmp_path / "outer.alloc.txt").read_text(encoding="utf-8")
+    assert "== compute" in report
@@ -0,0 +1,173 @@
+import io
+import json
+
+import pytest
+
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.observability.debug import init_logging_from_env
+from quantcli.observability.spans import (
+    LatencyHistogram,
+    dump_latency_summary,
+    format_latency_summary,
+    latency_summary,
+    reset_latency,
+    span,
+    timed,
+)
+from quantcli.orchestrator import run_query
+
+
+@pytest.fixture(autouse=True)
+def fresh_histograms():
+    reset_latency()
+    yield
+    reset_latency()
+
+
+@pytest.fixture
+def debug_events(monkeypatch, capsys):
+    monkeypatch.setenv("QUANTCLI_DEBUG", "1")
+    monkeypatch.delenv("QUANTCLI_DEBUG_PATH", raising=False)
+    init_logging_from_env()
+    capsys.readouterr()
+
+    def events():
+        err = capsys.readouterr().err
+        return [json.loads(line) for line in err.splitlines() if line.strip()]
+
+    yield events
+    monkeypatch.delenv("QUANTCLI_DEBUG")
+    init_logging_from_env()
+
+
+def test_histogram_percentiles_within_precision():
+    hist = LatencyHistogram()
+    for value in range(1, 100_001):
+        hist.record(value)
+
+    for p, exact in ((50, 50_000), (90, 90_000), (99, 99_000)):
+        assert abs(hist.percentile(p) - exact) / exact < 0.04
+    assert hist.percentile(100) == 100_000
+    assert hist.count == 100_000
+    assert hist.min_us == 1
+
+
+def test_histogram_small_values_are_exact():
+    hist = LatencyHistogram()
+    for value in (3, 7, 7, 20):
+        hist.record(value)
+
+    assert hist.percentile(50) == 7
+    assert hist.percentile(0) == 3
+    assert hist.max_us == 20
+
+
+def test_histogram_memory_is_bounded():
+    hist = LatencyHistogram()
+    for value in range(0, 10**9, 9_973):
+        hist.record(value)
+
+    assert len(hist._counts) < 1000
+
+
+def test_histogram_rejects_bad_percentile():
+    with pytest.raises(ValueError):
+        LatencyHistogram().percentile(101)
+
+
+def test_empty_histogram_summary_is_zero():
+    summary = LatencyHistogram().summary()
+
+    assert summary["count"] == 0
+    assert summary["p99_ms"] == 0
+
+
+def test_span_records_histogram_and_event(debug_events, cid):
+    with span("fetch", cid, ticker="AAPL"):
+        pass
+
+    (event,) = debug_events()
+    assert event["event"] == "span"
+    assert event["cid"] == cid
+    assert event["stage"] == "fetch"
+    assert event["ok"] is True
+    assert event["ticker"] == "AAPL"
+    assert event["elapsed_ms"] >= 0
+    assert event["start_ts"] <= event["ts"]
+    assert latency_summary()["fetch"]["count"] == 1
+
+
+def test_span_marks_failures_and_reraises(debug_events, cid):
+    with pytest.raises(RuntimeError), span("compute", cid):
+        raise RuntimeError("boom")
+
+    (event,) = debug_events()
+    assert event["ok"] is False
+    assert latency_summary()["compute"]["count"] == 1
+
+
+def test_timed_decorator_uses_cid_keyword(debug_events):
+    @timed("work")
+    def work(x: int, *, cid: str) -> int:
+        return x * 2
+
+    assert work(21, cid="abc") == 42
+
+    (event,) = debug_events()
+    assert event["cid"] == "abc"
+    assert event["stage"] == "work"
+
+
+def test_run_query_records_every_stage(cid):
+    llm = FakeLLMClient(
+        '{"type": "intent", "intent": {"tickers": ["AAPL"], '
+        '"time_range": {"n_days": 10}, "tool": "total_return"}}'
+    )
+
+    run_query("total return AAPL 10 days", llm, FakePriceProvider(), cid)
+
+    assert set(latency_summary()) == {"route", "validate", "fetch", "compute"}
+
+
+def test_dump_writes_table_to_given_stream(cid):
+    for _ in range(3):
+        with span("route", cid):
+            pass
+    out = io.StringIO()
+
+    dump_latency_summary(out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0].split()[:2] == ["stage", "count"]
+    assert lines[1].split()[:2] == ["route", "3"]
+
+
+def test_dump_without_data_writes_nothing():
+    out = io.StringIO()
+    dump_latency_summary(out)
+    assert out.getvalue() == ""
+
+
+def test_format_summary_orders_columns():
+    table = format_latency_summary(
+        {
+            "fetch": {
+                "count": 2,
+                "mean_ms": 1.5,
+                "p50_ms": 1.0,
+                "p90_ms": 2.0,
+                "p99_ms": 2.0,
+                "max_ms": 2.0,
+            }
+        }
+    )
+
+    assert table.splitlines()[1].split() == [
+        "fetch",
+        "2",
+        "1.000",
+        "2.000",
+        "2.000",
+        "2.000",
+    ]
@@ -0,0 +1,75 @@
+import numpy as np
+
+from quantcli.fetch_planner import TickerFetch, plan_fetches, tail_view
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.time_range import TimeRange
+from quantcli.schemas.tool_name import ToolName
+
+
+def _intent(ticker: str, n_days: int) -> Intent:
+    return Intent(
+        tickers=[ticker],
+        time_range=TimeRange(n_days=n_days),
+        tool=ToolName.total_return,
+    )
+
+
+def test_plan_groups_by_ticker_at_longest_range():
+    intents = [
+        _intent("AAPL", 10),
+        _intent("MSFT", 60),
+        _intent("AAPL", 90),
+        _intent("AAPL", 30),
+    ]
+
+    plan = plan_fetches(intents)
+
+    assert plan.fetches == [
+        TickerFetch(ticker="AAPL", n_days=90, members=(0, 2, 3)),
+        TickerFetch(ticker="MSFT", n_days=60, members=(1,)),
+    ]
+    assert plan.intents == 4
+    assert plan.fetches_saved == 2
+    assert plan.bytes_avoided == (10 + 30) * 8
+
+
+def test_plan_without_merged_ranges_groups_identical_requests_only():
+    intents = [_intent("AAPL", 10), _intent("AAPL", 90), _intent("AAPL", 10)]
+
+    plan = plan_fetches(intents, merge_ranges=False)
+
+    assert plan.fetches == [
+        TickerFetch(ticker="AAPL", n_days=10, members=(0, 2)),
+        TickerFetch(ticker="AAPL", n_days=90, members=(1,)),
+    ]
+    assert plan.fetches_saved == 1
+    assert plan.bytes_avoided == 10 * 8
+
+
+def test_plan_of_distinct_tickers_saves_nothing():
+    plan = plan_fetches([_intent("AAPL", 10), _intent("MSFT", 10)])
+
+    assert plan.fetches_saved == 0
+    assert plan.bytes_avoided == 0
+
+
+def test_empty_plan():
+    plan = plan_fetches([])
+
+    assert plan.fetches == []
+    assert plan.intents == 0
+
+
+def test_tail_view_shares_memory():
+    prices = np.arange(10.0)
+
+    tail = tail_view(prices, 3)
+
+    assert tail.tolist() == [7.0, 8.0, 9.0]
+    assert np.shares_memory(tail, prices)
+
+
+def test_tail_view_longer_than_series_returns_everything():
+    prices = np.arange(4.0)
+
+    assert tail_view(prices, 10).tolist() == prices.tolist()
@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+import quantcli.orchestrator as orchestrator
+from quantcli.data.price_provider import PriceProvider
+from quantcli.orchestrator import run_intent
+from quantcli.result_cache import ResultCache, prices_fingerprint
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.params import Params
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+from quantcli.schemas.time_range import TimeRange
+from quantcli.schemas.tool_name import ToolName
+
+
+class RevisablePriceProvider(PriceProvider):
+    def __init__(self, prices):
+        self.prices = np.asarray(prices, dtype=np.float64)
+
+    def name(self) -> str:
+        return "revisable"
+
+    def get_adjusted_close(self, ticker, n_days):
+        return self.prices[-n_days:].copy()
+
+
+@pytest.fixture
+def kernel_calls(monkeypatch):
+    calls = []
+    real_get_metric = orchestrator.get_metric
+
+    def counting_get_metric(tool):
+        metric_fn = real_get_metric(tool)
+
+        def counted(prices, params):
+            calls.append(tool)
+            return metric_fn(prices, params)
+
+        return counted
+
+    monkeypatch.setattr(orchestrator, "get_metric", counting_get_metric)
+    return calls
+
+
+def _intent(tool=ToolName.total_return, **params):
+    return Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=5),
+        tool=tool,
+        params=Params(**params),
+    )
+
+
+def test_repeated_intent_skips_kernel(cid, kernel_calls):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 101, 102, 103, 104])
+
+    first = run_intent(_intent(), provider, cid, result_cache=cache)
+    second = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    assert isinstance(first, Result)
+    assert second == first
+    assert len(kernel_calls) == 1
+    assert len(cache) == 1
+
+
+def test_data_revision_is_never_served_stale(cid, kernel_calls):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 101, 102, 103, 104])
+    before = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    provider.prices = np.array([100, 101, 102, 103, 110], dtype=np.float64)
+    after = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    assert isinstance(before, Result) and isinstance(after, Result)
+    assert after.value != before.value
+    assert len(kernel_calls) == 2
+
+
+def test_params_and_tool_are_part_of_the_key(cid, kernel_calls):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 102, 101, 104, 103])
+
+    run_intent(
+        _intent(ToolName.sharpe_ratio, window=3), provider, cid, result_cache=cache
+    )
+    run_intent(
+        _intent(ToolName.sharpe_ratio, window=3, risk_free_rate=0.02),
+        provider,
+        cid,
+        result_cache=cache,
+    )
+    run_intent(_intent(ToolName.max_drawdown), provider, cid, result_cache=cache)
+
+    assert len(kernel_calls) == 3
+    assert len(cache) == 3
+
+
+def test_tool_version_bump_invalidates(cid, kernel_calls, monkeypatch):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 101, 102, 103, 104])
+    run_intent(_intent(), provider, cid, result_cache=cache)
+
+    monkeypatch.setattr(orchestrator, "TOOL_VERSION", "2.0.0")
+    out = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    assert isinstance(out, Result)
+    assert out.metadata["tool_version"] == "2.0.0"
+    assert len(kernel_calls) == 2
+
+
+def test_refusals_are_not_cached(cid):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 101, -1, 103, 104])
+
+    out = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    assert isinstance(out, Refusal)
+    assert len(cache) == 0
+
+
+def test_cached_result_is_a_copy(cid):
+    cache = ResultCache()
+    provider = RevisablePriceProvider([100, 101, 102, 103, 104])
+    first = run_intent(_intent(), provider, cid, result_cache=cache)
+    assert isinstance(first, Result)
+    first.metadata["price_source"] = "mutated"
+
+    second = run_intent(_intent(), provider, cid, result_cache=cache)
+
+    assert isinstance(second, Result)
+    assert second.metadata["price_source"] == "revisable"
+
+
+def test_lru_evicts_oldest():
+    cache = ResultCache(max_entries=2)
+    result = Result(tool=ToolName.total_return, tickers=["AAPL"], value=0.1)
+    for key in ("a", "b", "c"):
+        cache.put(key, result)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == result
+    assert len(cache) == 2
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=0)
+
+
+def test_fingerprint_covers_values_and_length():
+    base = np.array([1.0, 2.0, 3.0])
+
+    assert prices_fingerprint(base) == prices_fingerprint(base.copy())
+    assert prices_fingerprint(base) != prices_fingerprint(np.array([1.0, 2.0, 3.5]))
+    assert prices_fingerprint(base) != prices_fingerprint(base[:2])
@@ -0,0 +1,280 @@
+import json
+import random
+import threading
+import time
+from collections.abc import Sequence
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from quantcli import orchestrator
+from quantcli.data.fake_price_provider import FakePriceProvider
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.llm.llm_client import Message
+from quantcli.orchestrator import run_batch, run_query
+from quantcli.pipeline import Stage, run_pipeline
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.result import Result
+from quantcli.tools.registry import get_batch_metric
+
+
+class ScriptedLLMClient(FakeLLMClient):
+    """Answers with the response registered for the ticker named in the query."""
+
+    def __init__(self, responses: dict[str, str]) -> None:
+        super().__init__("")
+        self._responses = responses
+        self._lock = threading.Lock()
+
+    def complete(self, messages: Sequence[Message]) -> str:
+        with self._lock:
+            self.calls.append(messages)
+        user = messages[1]["content"]
+        time.sleep(random.uniform(0, 0.005))
+        for ticker, response in self._responses.items():
+            if ticker in user:
+                return response
+        return "not valid json"
+
+
+def _intent(ticker: str, n_days: int, tool: str = "total_return") -> str:
+    return json.dumps(
+        {
+            "type": "intent",
+            "intent": {
+                "tickers": [ticker],
+                "time_range": {"n_days": n_days},
+                "tool": tool,
+            },
+        }
+    )
+
+
+def test_run_pipeline_keeps_input_order():
+    def jitter(x: int) -> int:
+        time.sleep(random.uniform(0, 0.003))
+        return x
+
+    stages = [
+        Stage("a", jitter, workers=4),
+        Stage("b", lambda x: x * 2, workers=3),
+        Stage("c", jitter, workers=2),
+    ]
+    assert list(run_pipeline(range(50), stages, queue_size=2)) == [
+        2 * i for i in range(50)
+    ]
+
+
+def test_run_pipeline_bounds_items_in_flight():
+    release = threading.Event()
+    consumed: list[int] = []
+
+    def source():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    def block_first(x: int) -> int:
+        if x == 0:
+            release.wait(timeout=5)
+        return x
+
+    out = run_pipeline(source(), [Stage("s", block_first, workers=2)], queue_size=2)
+    result: list[int] = []
+    reader = threading.Thread(target=lambda: result.extend(out))
+    reader.start()
+    time.sleep(0.1)
+    assert len(consumed) < 100
+    release.set()
+    reader.join(timeout=5)
+    assert result == list(range(100))
+
+
+def test_run_pipeline_reraises_stage_errors():
+    def boom(x: int) -> int:
+        if x == 3:
+            raise RuntimeError("boom")
+        return x
+
+    with pytest.raises(RuntimeError):
+        list(run_pipeline(range(10), [Stage("s", boom, workers=2)]))
+    with pytest.raises(ValueError):
+        Stage("s", boom, workers=0)
+
+
+def test_run_batch_matches_run_query_in_order():
+    llm = ScriptedLLMClient(
+        {
+            "AAPL": _intent("AAPL", 10),
+            "MSFT": _intent("MSFT", 1),
+            "TSLA": _intent("TSLA", 30),
+        }
+    )
+    queries = [
+        "total return AAPL last 10 days",
+        "total return MSFT last 1 day",  # validation refusal
+        "gibberish",  # decoder refusal
+        "total return TSLA last 30 days",
+    ] * 5
+    provider = FakePriceProvider()
+
+    outcomes = list(run_batch(queries, llm, provider, route_workers=3, fetch_workers=2))
+
+    assert len(outcomes) == len(queries)
+    assert len({cid for cid, _ in outcomes}) == len(queries)
+    for query, (_, out) in zip(queries, outcomes, strict=True):
+        expected = run_query(query, llm, FakePriceProvider(), "cid")
+        assert type(out) is type(expected)
+        assert out.model_dump() == expected.model_dump()
+    assert isinstance(outcomes[0][1], Result)
+    assert isinstance(outcomes[1][1], Refusal)
+    assert isinstance(outcomes[2][1], Refusal)
+
+
+def test_run_batch_provider_failure_is_per_query_refusal():
+    llm = ScriptedLLMClient({"AAPL": _intent("AAPL", 10)})
+    outcomes = list(
+        run_batch(
+            ["total return AAPL last 10 days"] * 3, llm, FakePriceProvider(fail=True)
+        )
+    )
+
+    assert [o.reason for _, o in outcomes] == [
+        "Unable to retrieve valid price data."
+    ] * 3
+
+
+class HistoryPriceProvider(FakePriceProvider):
+    """The most recent n_days bars of one fixed history, so ranges nest."""
+
+    tail_consistent = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: list[tuple[str, int]] = []
+        self._history = 100.0 + np.cumsum(np.sin(np.arange(200.0)))
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        self.calls += 1
+        self.requests.append((ticker, n_days))
+        return self._history[-n_days:].copy()
+
+
+def test_run_batch_coalesced_fetches_once_per_ticker():
+    ranges = {"AAPL 10": 10, "AAPL 30": 30, "AAPL 90": 90, "MSFT 60": 60}
+    llm = ScriptedLLMClient({q: _intent(q.split()[0], n) for q, n in ranges.items()})
+    queries = [f"total return {q} days" for q in ranges] * 2 + ["gibberish"]
+
+    provider = HistoryPriceProvider()
+    coalesced = list(run_batch(queries, llm, provider, coalesce_fetches=True))
+    direct = list(run_batch(queries, llm, HistoryPriceProvider()))
+
+    assert sorted(provider.requests) == [("AAPL", 90), ("MSFT", 60)]
+    assert [o.model_dump() for _, o in coalesced] == [o.model_dump() for _, o in direct]
+    assert isinstance(coalesced[-1][1], Refusal)
+
+
+def test_run_batch_coalesced_keeps_ranges_apart_without_tail_consistency():
+    # the named fixtures rebuild each range, so a tail of the longest fetch
+    # would not be what run_query sees
+    llm = ScriptedLLMClient(
+        {"AAPL 10": _intent("AAPL", 10), "AAPL 30": _intent("AAPL", 30)}
+    )
+    queries = ["AAPL 10", "AAPL 30", "AAPL 10"]
+    provider = FakePriceProvider("drawdown")
+
+    coalesced = list(run_batch(queries, llm, provider, coalesce_fetches=True))
+    direct = list(run_batch(queries, llm, FakePriceProvider("drawdown")))
+
+    assert provider.calls == 2
+    assert [o.model_dump() for _, o in coalesced] == [o.model_dump() for _, o in direct]
+
+
+def test_run_batch_coalesced_metrics_share_prepared_prices(monkeypatch):
+    built = []
+
+    class CountingPreparedPrices(orchestrator.PreparedPrices):
+        def __init__(self, prices):
+            built.append(prices.size)
+            super().__init__(prices)
+
+    monkeypatch.setattr(orchestrator, "PreparedPrices", CountingPreparedPrices)
+    llm = ScriptedLLMClient(
+        {
+            "AAPL return": _intent("AAPL", 30),
+            "AAPL drawdown": _intent("AAPL", 30, "max_drawdown"),
+            "AAPL short": _intent("AAPL", 10, "max_drawdown"),
+        }
+    )
+    queries = ["AAPL return", "AAPL drawdown", "AAPL short"]
+
+    coalesced = list(
+        run_batch(queries, llm, HistoryPriceProvider(), coalesce_fetches=True)
+    )
+
+    assert sorted(built) == [10, 30]  # one per (ticker, range), not per metric
+    direct = list(run_batch(queries, llm, HistoryPriceProvider()))
+    assert [o.model_dump() for _, o in coalesced] == [o.model_dump() for _, o in direct]
+
+
+class ShortTickerProvider(FakePriceProvider):
+    """Synthetic prices, except TINY which has too little history."""
+
+    def __init__(self) -> None:
+        super().__init__("gbm", seed=3)
+
+    def get_adjusted_close(self, ticker: str, n_days: int) -> NDArray[np.float64]:
+        if ticker == "TINY":
+            return np.array([10.0, 11.0, 12.0])
+        return super().get_adjusted_close(ticker, n_days)
+
+
+def test_run_batch_coalesced_runs_batched_kernels(monkeypatch):
+    batched = []
+
+    def counting(tool):
+        fn = get_batch_metric(tool)
+
+        def run(prices, lengths, params):
+            batched.append((tool.value, prices.shape[0]))
+            return fn(prices, lengths, params)
+
+        return run if fn is not None else None
+
+    monkeypatch.setattr(orchestrator, "get_batch_metric", counting)
+    window = {"params": {"window": 20}}
+    responses = {}
+    for t in ("AAA", "BBB", "CCC", "TINY"):
+        sharpe = json.loads(_intent(t, 60, "sharpe_ratio"))
+        sharpe["intent"].update(window)
+        responses[f"sharpe {t}"] = json.dumps(sharpe)
+        responses[f"drawdown {t}"] = _intent(t, 60, "max_drawdown")
+    llm = ScriptedLLMClient(responses)
+    queries = list(responses)
+
+    coalesced = list(
+        run_batch(queries, llm, ShortTickerProvider(), coalesce_fetches=True)
+    )
+    direct = list(run_batch(queries, llm, ShortTickerProvider()))
+
+    assert sorted(batched) == [("max_drawdown", 4), ("sharpe_ratio", 4)]
+    assert [o.model_dump() for _, o in coalesced] == [o.model_dump() for _, o in direct]
+    assert isinstance(coalesced[queries.index("sharpe TINY")][1], Refusal)
+    assert isinstance(coalesced[queries.index("drawdown TINY")][1], Result)
+
+
+def test_run_batch_coalesced_provider_failure_refuses_every_member():
+    llm = ScriptedLLMClient({"AAPL": _intent("AAPL", 10)})
+    outcomes = list(
+        run_batch(
+            ["total return AAPL last 10 days"] * 3,
+            llm,
+            FakePriceProvider(fail=True),
+            coalesce_fetches=True,
+        )
+    )
+
+    assert [o.reason for _, o in outcomes] == [
+        "Unable to retrieve valid price data."
+    ] * 3
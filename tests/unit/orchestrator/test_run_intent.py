@@ -1,8 +1,15 @@
 import pytest
 
 from quantcli.data.fake_price_provider import FakePriceProvider
-from quantcli.orchestrator import run_intent
+from quantcli.orchestrator import (
+    MetricStream,
+    run_intent,
+    run_intents,
+    start_stream,
+)
+from quantcli.result_cache import ResultCache
 from quantcli.schemas.intent import Intent
+from quantcli.schemas.multi_result import MultiResult
 from quantcli.schemas.params import Params
 from quantcli.schemas.refusal import Refusal
 from quantcli.schemas.result import Result
@@ -48,7 +55,7 @@ def test_total_return_ok(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert provider.calls == 1
 
@@ -75,7 +82,7 @@ def test_max_drawdown_ok(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert provider.calls == 1
 
@@ -102,7 +109,7 @@ def test_realized_volatility_ok(cid):
     assert result.metadata["risk_free_rate"] is None
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert provider.calls == 1
 
@@ -164,7 +171,7 @@ def test_sharpe_ratio_ok(cid):
     assert result.metadata["risk_free_rate"] == 0.0
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert provider.calls == 1
 
@@ -189,7 +196,7 @@ def test_sharpe_ratio_with_risk_free_rate_ok(cid):
     assert result.metadata["risk_free_rate"] == 0.05
     assert result.metadata["data_points"] == 10
     assert result.metadata["price_source"] == "FakePriceProvider"
-    assert result.metadata["tool_version"] == "1.0.0"
+    assert result.metadata["tool_version"] == "1.1.0"
     assert result.metadata["interpretation_notes"] is None
     assert provider.calls == 1
 
@@ -204,7 +211,13 @@ def test_all_registry_defined_tools_wired(cid):
             tool=tool,
             params=(
                 Params(window=5, annualization_factor=252)
-                if tool in [ToolName.realized_volatility, ToolName.sharpe_ratio]
+                if tool
+                in [
+                    ToolName.realized_volatility,
+                    ToolName.sharpe_ratio,
+                    ToolName.rolling_volatility,
+                    ToolName.rolling_sharpe_ratio,
+                ]
                 else Params(window=None)
             ),
         )
@@ -213,3 +226,142 @@ def test_all_registry_defined_tools_wired(cid):
 
         assert isinstance(result, Result)
         assert result.tool == tool
+
+
+def test_rolling_volatility_returns_series(cid):
+    intent = Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=30),
+        tool=ToolName.rolling_volatility,
+        params=Params(window=10),
+    )
+    provider = FakePriceProvider("drawdown")
+    result = run_intent(intent, provider, cid)
+
+    assert isinstance(result, Result)
+    assert isinstance(result.value, list)
+    assert len(result.value) == 30 - 10
+    assert result.metadata["window"] == 10
+    assert result.metadata["annualization_factor"] == 252
+    assert result.metadata["risk_free_rate"] is None
+
+
+def test_stream_keeps_accumulator_alive_between_ticks(cid):
+    intent = Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=10),
+        tool=ToolName.total_return,
+        params=Params(window=None),
+    )
+    provider = FakePriceProvider()
+    stream = start_stream(intent, provider, cid)
+    assert isinstance(stream, MetricStream)
+
+    result = stream.push(110.0, cid)
+
+    assert isinstance(result, Result)
+    # history slides to 101..109, 110
+    assert result.value == pytest.approx((110.0 - 101.0) / 101.0, abs=1e-12)
+    assert result.metadata["data_points"] == 10
+    assert result.metadata["price_source"] == "FakePriceProvider"
+    assert provider.calls == 1
+
+
+def test_stream_rejects_unsupported_tool_and_bad_ticks(cid):
+    rolling = Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=10),
+        tool=ToolName.rolling_volatility,
+        params=Params(window=5),
+    )
+    assert isinstance(start_stream(rolling, FakePriceProvider(), cid), Refusal)
+
+    stream = start_stream(
+        rolling.model_copy(update={"tool": ToolName.realized_volatility}),
+        FakePriceProvider(),
+        cid,
+    )
+    assert isinstance(stream, MetricStream)
+    assert isinstance(stream.push(-1.0, cid), Refusal)
+    assert isinstance(stream.push(120.0, cid), Result)
+
+
+def _multi_intents(n_days: int = 30) -> list[Intent]:
+    return [
+        Intent(
+            tickers=["AAPL"],
+            time_range=TimeRange(n_days=n_days),
+            tool=ToolName.total_return,
+        ),
+        Intent(
+            tickers=["AAPL"],
+            time_range=TimeRange(n_days=n_days),
+            tool=ToolName.max_drawdown,
+        ),
+        Intent(
+            tickers=["AAPL"],
+            time_range=TimeRange(n_days=n_days),
+            tool=ToolName.realized_volatility,
+            params=Params(window=10),
+        ),
+        Intent(
+            tickers=["AAPL"],
+            time_range=TimeRange(n_days=n_days),
+            tool=ToolName.sharpe_ratio,
+            params=Params(window=10, risk_free_rate=0.01),
+        ),
+    ]
+
+
+def test_run_intents_fetches_once_and_matches_run_intent(cid):
+    intents = _multi_intents()
+    provider = FakePriceProvider("drawdown")
+
+    multi = run_intents(intents, provider, cid)
+
+    assert isinstance(multi, MultiResult)
+    assert provider.calls == 1
+    assert multi.tickers == ["AAPL"]
+    assert multi.metadata["price_source"] == "FakePriceProvider"
+    assert [r.tool for r in multi.results] == [i.tool for i in intents]
+    for intent, result in zip(intents, multi.results, strict=True):
+        single = run_intent(intent, FakePriceProvider("drawdown"), cid)
+        assert result == single
+
+
+def test_run_intents_uses_the_result_cache(cid):
+    cache = ResultCache()
+    first = run_intents(_multi_intents(), FakePriceProvider("drawdown"), cid, cache)
+    assert isinstance(first, MultiResult)
+    assert len(cache) == len(_multi_intents())
+
+    again = run_intents(_multi_intents(), FakePriceProvider("drawdown"), cid, cache)
+    assert again == first
+
+
+def test_run_intents_per_metric_refusal(cid):
+    intents = _multi_intents()
+    intents[2] = intents[2].model_copy(update={"params": Params()})
+    provider = FakePriceProvider("drawdown")
+
+    multi = run_intents(intents, provider, cid)
+
+    assert isinstance(multi, MultiResult)
+    assert isinstance(multi.results[2], Refusal)
+    assert "window parameter" in multi.results[2].reason
+    assert all(isinstance(multi.results[i], Result) for i in (0, 1, 3))
+    assert provider.calls == 1
+
+
+def test_run_intents_rejects_mixed_tickers_and_provider_failure(cid):
+    intents = _multi_intents()
+    intents[1] = intents[1].model_copy(update={"tickers": ["MSFT"]})
+    provider = FakePriceProvider()
+    assert isinstance(run_intents(intents, provider, cid), Refusal)
+    assert isinstance(run_intents([], provider, cid), Refusal)
+    assert provider.calls == 0
+
+    failing = FakePriceProvider(fail=True)
+    result = run_intents(_multi_intents(), failing, cid)
+    assert isinstance(result, Refusal)
+    assert failing.calls == 1
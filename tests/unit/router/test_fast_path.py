@@ -0,0 +1,164 @@
+import json
+
+import pytest
+
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.observability.debug import init_logging_from_env
+from quantcli.router.fast_path import parse_canonical, prescan_ticker_range
+from quantcli.router.router import route_query
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.tool_name import ToolName
+
+
+@pytest.mark.parametrize(
+    "query, tool, ticker, n_days, params",
+    [
+        (
+            "Compute the max drawdown for TSLA over the last 60 days.",
+            ToolName.max_drawdown,
+            "TSLA",
+            60,
+            {},
+        ),
+        (
+            "Compute realized volatility for MSFT over the last 90 days "
+            "with a 20 day window.",
+            ToolName.realized_volatility,
+            "MSFT",
+            90,
+            {"window": 20},
+        ),
+        (
+            "What was AAPL’s total return over the last 30 days?",
+            ToolName.total_return,
+            "AAPL",
+            30,
+            {},
+        ),
+        (
+            "Compute the Sharpe ratio for AAPL over the last 60 days with a 20 day "
+            "window and a risk free rate of 0.05.",
+            ToolName.sharpe_ratio,
+            "AAPL",
+            60,
+            {"window": 20, "risk_free_rate": 0.05},
+        ),
+        (
+            "rolling sharpe BRK.B last 100 trading days, window of 20, "
+            "risk-free rate 4.5%",
+            ToolName.rolling_sharpe_ratio,
+            "BRK.B",
+            100,
+            {"window": 20, "risk_free_rate": 0.045},
+        ),
+        (
+            "total return AAPL 10 days",
+            ToolName.total_return,
+            "AAPL",
+            10,
+            {},
+        ),
+        (
+            "WHAT IS THE TOTAL RETURN OF AAPL OVER THE LAST 30 DAYS",
+            ToolName.total_return,
+            "AAPL",
+            30,
+            {},
+        ),
+    ],
+)
+def test_parse_canonical_accepts_documented_shapes(query, tool, ticker, n_days, params):
+    intent = parse_canonical(query)
+
+    assert intent is not None
+    assert intent.tool == tool
+    assert intent.tickers == [ticker]
+    assert intent.time_range.n_days == n_days
+    assert intent.params.model_dump(exclude_unset=True) == params
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # window missing / not allowed: the LLM produces the refusal
+        "Compute realized volatility for MSFT over the last 90 days.",
+        "Compute the max drawdown for TSLA over the last 60 days with a 5 day window.",
+        "total return AAPL over the last 30 days with a risk free rate of 0.05",
+        # ambiguous or out of grammar
+        "total return AAPL vs MSFT last 10 days",
+        "total return AAPL MSFT last 10 days",
+        "total return AAPL last 10 days 20 days",
+        "will AAPL go up over the last 10 days",
+        "max drawdown for AAPL over some days",
+        "Sharpe ratio AAPL last 60 days 20 day window risk free rate of 5",
+        "total return AAPL last 10000 days",
+        "total return $AAPL last 10 days",
+        # all-caps words that are not tickers
+        "I want the total return AAPL last 10 days",
+        "total return AAPL vs SPY last 10 days",
+        "total return F last 10 days",
+        "",
+    ],
+)
+def test_parse_canonical_falls_through(query):
+    assert parse_canonical(query) is None
+
+
+def test_route_query_fast_path_skips_llm(cid):
+    llm = FakeLLMClient("not valid json")
+    out = route_query(
+        "Compute the max drawdown for TSLA over the last 60 days.",
+        llm,
+        cid,
+        fast_path=True,
+    )
+
+    assert isinstance(out, Intent)
+    assert out.tool == ToolName.max_drawdown
+    assert len(llm.calls) == 0
+
+
+def test_route_query_fast_path_off_by_default(cid):
+    llm = FakeLLMClient("not valid json")
+    route_query("Compute the max drawdown for TSLA over the last 60 days.", llm, cid)
+    assert len(llm.calls) == 1
+
+
+def test_fast_path_outcomes_are_logged(capsys, monkeypatch, cid):
+    monkeypatch.setenv("QUANTCLI_DEBUG", "1")
+    monkeypatch.delenv("QUANTCLI_DEBUG_PATH", raising=False)
+    init_logging_from_env()
+
+    llm = FakeLLMClient("not valid json")
+    route_query("max drawdown TSLA last 60 days", llm, cid, fast_path=True)
+    route_query("will TSLA go up", llm, cid, fast_path=True)
+
+    monkeypatch.delenv("QUANTCLI_DEBUG")
+    init_logging_from_env()
+
+    records = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    accept = [r for r in records if r["event"] == "fast_path_accept"]
+    fallthrough = [r for r in records if r["event"] == "fast_path_fallthrough"]
+    assert len(accept) == 1
+    assert len(fallthrough) == 1
+    assert fallthrough[0]["accepted_total"] >= 1
+    assert "elapsed_us" in accept[0]
+    assert len(llm.calls) == 1
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Compute the max drawdown for TSLA over the last 60 days.", ("TSLA", 60)),
+        ("realized vol MSFT past 90 trading days, 20 day window", ("MSFT", 90)),
+        ("MAX DRAWDOWN AAPL 30 DAYS", ("AAPL", 30)),
+        ("sharpe AAPL with a 20-day rolling window over 120 days", ("AAPL", 120)),
+        ("how did NVDA do lately", None),
+        ("compare AAPL and MSFT over 10 days", None),
+        ("Can I get A total return for AAPL over 30 days", ("AAPL", 30)),
+        ("total return AAPL over 0 days", None),
+        ("total return AAPL 0 days or 20 days", ("AAPL", 20)),
+    ],
+)
+def test_prescan_ticker_range(query, expected):
+    assert prescan_ticker_range(query) == expected
@@ -0,0 +1,177 @@
+import json
+import os
+
+import pytest
+
+from quantcli.llm.fake_llm_client import FakeLLMClient
+from quantcli.observability.debug import init_logging_from_env
+from quantcli.router import intent_cache as intent_cache_module
+from quantcli.router.intent_cache import IntentCache, normalize_query
+from quantcli.router.router import route_query
+from quantcli.schemas.intent import Intent
+from quantcli.schemas.refusal import Refusal
+from quantcli.schemas.tool_name import ToolName
+
+INTENT_RESPONSE = json.dumps(
+    {
+        "type": "intent",
+        "intent": {
+            "tickers": ["AAPL"],
+            "time_range": {"n_days": 10},
+            "tool": "max_drawdown",
+        },
+    }
+)
+REFUSAL_RESPONSE = json.dumps({"type": "refusal", "refusal": {"reason": "AMBIGUOUS"}})
+
+
+def test_normalize_query_collapses_whitespace_and_case():
+    assert normalize_query("  Max  Drawdown\tAAPL\nlast 10 days ") == (
+        "max drawdown aapl last 10 days"
+    )
+
+
+def test_cache_hit_skips_llm(tmp_path, cid):
+    cache = IntentCache(model="m", cache_dir=tmp_path)
+    llm = FakeLLMClient(INTENT_RESPONSE)
+
+    first = route_query("max drawdown AAPL last 10 days", llm, cid, cache)
+    second = route_query("  MAX drawdown aapl  last 10 days", llm, cid, cache)
+
+    assert isinstance(first, Intent)
+    assert second == first
+    assert second is not first
+    assert second.tool == ToolName.max_drawdown
+    assert len(llm.calls) == 1
+
+
+def test_llm_refusal_is_cached(cid):
+    cache = IntentCache(model="m")
+    llm = FakeLLMClient(REFUSAL_RESPONSE)
+
+    for _ in range(2):
+        out = route_query("drawdown AAPL some days", llm, cid, cache)
+        assert isinstance(out, Refusal)
+        assert out.reason == "AMBIGUOUS"
+    assert len(llm.calls) == 1
+
+
+def test_decoder_reject_is_not_cached(cid):
+    cache = IntentCache(model="m")
+    llm = FakeLLMClient("not valid json")
+
+    route_query("drawdown AAPL 10 days", llm, cid, cache)
+    route_query("drawdown AAPL 10 days", llm, cid, cache)
+
+    assert len(cache) == 0
+    assert len(llm.calls) == 2
+
+
+def test_disk_store_survives_new_instance(tmp_path, cid):
+    route_query(
+        "max drawdown AAPL last 10 days",
+        FakeLLMClient(INTENT_RESPONSE),
+        cid,
+        IntentCache(model="m", cache_dir=tmp_path),
+    )
+
+    llm = FakeLLMClient(INTENT_RESPONSE)
+    warm = IntentCache(model="m", cache_dir=tmp_path)
+    out = route_query("max drawdown AAPL last 10 days", llm, cid, warm)
+
+    assert isinstance(out, Intent)
+    assert len(llm.calls) == 0
+
+
+def test_llm_refusal_is_not_persisted_and_expires(tmp_path, cid):
+    now = [1000.0]
+    cache = IntentCache(model="m", cache_dir=tmp_path, clock=lambda: now[0])
+    llm = FakeLLMClient(REFUSAL_RESPONSE)
+    route_query("drawdown AAPL some days", llm, cid, cache)
+
+    assert list(tmp_path.iterdir()) == []
+    now[0] += cache.refusal_ttl_s + 1
+    route_query("drawdown AAPL some days", llm, cid, cache)
+    assert len(llm.calls) == 2
+
+
+def test_disk_entry_expires(tmp_path, cid):
+    query = "max drawdown AAPL last 10 days"
+    now = [1000.0]
+    route_query(
+        query,
+        FakeLLMClient(INTENT_RESPONSE),
+        cid,
+        IntentCache(model="m", cache_dir=tmp_path, ttl_s=60, clock=lambda: now[0]),
+    )
+
+    now[0] += 61
+    warm = IntentCache(model="m", cache_dir=tmp_path, ttl_s=60, clock=lambda: now[0])
+    assert warm.get(query) is None
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_disk_store_is_bounded(tmp_path):
+    routed = Intent.model_validate(json.loads(INTENT_RESPONSE)["intent"])
+    cache = IntentCache(model="m", cache_dir=tmp_path, max_disk_entries=2)
+    for i, q in enumerate(("a", "b", "c")):
+        cache.put(q, routed)
+        path = tmp_path / f"{cache.key(q)}.json"
+        os.utime(path, (i, i))  # distinct mtimes regardless of fs resolution
+
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == sorted(
+        f"{cache.key(q)}.json" for q in ("b", "c")
+    )
+    with pytest.raises(ValueError):
+        IntentCache(model="m", max_disk_entries=0)
+
+
+def test_model_and_prompt_are_part_of_the_key(tmp_path, monkeypatch):
+    query = "max drawdown AAPL last 10 days"
+    base = IntentCache(model="m", cache_dir=tmp_path)
+    assert base.key(query) != IntentCache(model="other", cache_dir=tmp_path).key(query)
+
+    monkeypatch.setattr(intent_cache_module, "SYSTEM_PROMPT", "changed prompt")
+    assert IntentCache(model="m", cache_dir=tmp_path).key(query) != base.key(query)
+
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    cache = IntentCache(model="m", cache_dir=tmp_path)
+    query = "max drawdown AAPL last 10 days"
+    (tmp_path / f"{cache.key(query)}.json").write_text("{not json", encoding="utf-8")
+
+    assert cache.get(query) is None
+
+
+def test_memory_lru_is_bounded():
+    cache = IntentCache(model="m", max_entries=2)
+    routed = Intent.model_validate(json.loads(INTENT_RESPONSE)["intent"])
+    for q in ("a", "b", "c"):
+        cache.put(q, routed)
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == routed
+
+    with pytest.raises(ValueError):
+        IntentCache(model="m", max_entries=0)
+
+
+def test_cache_hit_is_logged(capsys, monkeypatch, cid):
+    monkeypatch.setenv("QUANTCLI_DEBUG", "1")
+    monkeypatch.delenv("QUANTCLI_DEBUG_PATH", raising=False)
+    init_logging_from_env()
+
+    cache = IntentCache(model="m")
+    llm = FakeLLMClient(INTENT_RESPONSE)
+    route_query("max drawdown AAPL last 10 days", llm, cid, cache)
+    route_query("max drawdown AAPL last 10 days", llm, cid, cache)
+
+    monkeypatch.delenv("QUANTCLI_DEBUG")
+    init_logging_from_env()
+
+    err = capsys.readouterr().err
+    events = [json.loads(line)["event"] for line in err.splitlines()]
+    assert events.count("intent_cache_miss") == 1
+    assert events.count("intent_cache_hit") == 1
+    assert events.count("llm_call_start") == 1
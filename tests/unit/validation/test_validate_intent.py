@@ -1,9 +1,11 @@
+import pytest
+
 from quantcli.schemas.intent import Intent
 from quantcli.schemas.params import Params
 from quantcli.schemas.refusal import Refusal
 from quantcli.schemas.time_range import TimeRange
 from quantcli.schemas.tool_name import ToolName
-from quantcli.validate_intent import validate_intent
+from quantcli.validate_intent import requires_window, validate_intent
 
 
 def test_single_asset_only():
@@ -174,3 +176,41 @@ def test_risk_free_rate_not_allowed_for_non_sharpe_metrics():
         and "not applicable" in result.reason
         and "total_return" in result.reason
     )
+
+
+def test_rolling_metrics_require_window():
+    for tool in (ToolName.rolling_volatility, ToolName.rolling_sharpe_ratio):
+        intent = Intent(
+            tickers=["AAPL"],
+            time_range=TimeRange(n_days=30),
+            tool=tool,
+            params=Params(),
+        )
+        result = validate_intent(intent)
+        assert isinstance(result, Refusal)
+        assert "window parameter" in result.reason
+
+
+def test_risk_free_rate_allowed_for_rolling_sharpe_only():
+    sharpe = Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=30),
+        tool=ToolName.rolling_sharpe_ratio,
+        params=Params(window=10, risk_free_rate=0.05),
+    )
+    vol = sharpe.model_copy(update={"tool": ToolName.rolling_volatility})
+
+    assert validate_intent(sharpe) == sharpe
+    assert isinstance(validate_intent(vol), Refusal)
+
+
+@pytest.mark.parametrize("tool", list(ToolName))
+def test_requires_window_matches_validation(tool):
+    windowed = Intent(
+        tickers=["AAPL"],
+        time_range=TimeRange(n_days=30),
+        tool=tool,
+        params=Params(window=10),
+    )
+
+    assert requires_window(tool) == (validate_intent(windowed) == windowed)